@@ -8,6 +8,14 @@ using the Astral GraphQL endpoints and APIs.
 __version__ = "0.1.1"
 __author__ = "Seth Docherty"
 
-from .server import app
-
 __all__ = ["app"]
+
+
+def __getattr__(name: str) -> object:
+    # The server is imported on first use, so processes that only need the helpers (such as the
+    # verification pool's spawned workers) do not build its singletons or start its log listener
+    if name == "app":
+        from .server import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,6 +28,22 @@ def _load_mcp_json() -> Dict[str, Any]:
     return {}
 
 
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean environment flag ("1", "true", "yes" enable it)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in {"1", "true", "yes"}
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to `default` when unset or invalid."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
 def _determine_base_url() -> str:
     """Determine which Astral API base URL to use.
 
@@ -60,11 +76,103 @@ ASTRAL_BASE_URL = _determine_base_url()
 ASTRAL_HEALTH_ENDPOINT = f"{ASTRAL_BASE_URL}/health"
 ASTRAL_LOCATION_PROOFS_ENDPOINT = f"{ASTRAL_BASE_URL}/api/v0/location-proofs"
 ASTRAL_CONFIG_ENDPOINT = f"{ASTRAL_BASE_URL}/api/v0/config"
+ASTRAL_GRAPHQL_ENDPOINT = os.getenv("ASTRAL_GRAPHQL_ENDPOINT", f"{ASTRAL_BASE_URL}/graphql")
+
+# Upstream backend for location proof queries: "rest" (default) or "graphql", which batches
+# concurrent page queries and UID lookups into one aliased request
+ASTRAL_BACKENDS = ("rest", "graphql")
+ASTRAL_BACKEND = os.getenv("ASTRAL_BACKEND", "rest").lower()
+if ASTRAL_BACKEND not in ASTRAL_BACKENDS:
+    ASTRAL_BACKEND = "rest"
+# Maximum aliases (filter sets plus UID lookups) per GraphQL request
+GRAPHQL_MAX_BATCH = 32
 
 # HTTP Client Configuration
 DEFAULT_TIMEOUT = 30.0
 MAX_RETRIES = 3
 
+# Per-call deadlines (seconds). Clients can set their own through request `_meta`
+# (`timeoutMs` relative, or `deadline` as a unix epoch); bulk tools return partial results at the deadline.
+DEFAULT_DEADLINE_SECONDS = DEFAULT_TIMEOUT
+TOOL_DEADLINE_SECONDS: Dict[str, float] = {
+    "query_location_proofs_bulk": 120.0,
+    "query_location_proofs_within": 120.0,
+    "export_location_proofs": 600.0,
+}
+MAX_DEADLINE_SECONDS = 900.0
+# How long past the deadline a call may spend assembling partial results before it is cancelled
+DEADLINE_GRACE_SECONDS = 2.0
+
+# Bulk query planner configuration
+BULK_MAX_CONCURRENCY = 8
+BULK_MAX_RESULTS = 10000
+
+# Trajectory analysis: segments faster than this are flagged as impossible travel (commercial
+# flights cruise below ~950 km/h), unless they are shorter than TRAJECTORY_MIN_JUMP_KM
+TRAJECTORY_MAX_SPEED_KMH = 1000.0
+TRAJECTORY_MIN_JUMP_KM = 1.0
+TRAJECTORY_MAX_FLAGS = 100
+
+# Session-scoped spatial indexes for nearest-neighbour and clustering tools (KD-tree over
+# up to SPATIAL_INDEX_MAX_POINTS proofs per filter set; scipy is used when installed)
+SPATIAL_INDEX_MAX_ENTRIES = 32
+SPATIAL_INDEX_TTL_SECONDS = 600.0
+SPATIAL_INDEX_MAX_POINTS = BULK_MAX_RESULTS
+SPATIAL_INDEX_LEAF_SIZE = 32
+CLUSTER_MAX_UIDS = 20
+
+# EAS signature verification (verify_location_proofs; requires eth-account). Batches of at least
+# VERIFY_POOL_MIN_BATCH proofs run in a process pool; verdicts are cached by uid + content hash
+VERIFY_MAX_PROOFS = 500
+VERIFY_MAX_WORKERS = min(4, os.cpu_count() or 1)
+VERIFY_POOL_MIN_BATCH = 16
+VERIFY_CACHE_MAX_ENTRIES = 10000
+VERIFY_CACHE_TTL_SECONDS = 3600.0
+
+# Batched UID lookups (get_location_proofs_by_uids)
+UID_BATCH_MAX = 100
+
+# Tile-aligned bbox cache configuration
+TILE_CACHE_ZOOM = 10
+TILE_CACHE_MAX_TILES = 64
+TILE_CACHE_MAX_ENTRIES = 1024
+TILE_CACHE_TTL_SECONDS = 300.0
+
+# Resumable cursor session store configuration
+CURSOR_MAX_SESSIONS = 256
+CURSOR_TTL_SECONDS = 600.0
+
+# Fingerprints of returned result sets, for since_result diffs
+RESULT_FINGERPRINT_MAX_ENTRIES = 512
+RESULT_FINGERPRINT_TTL_SECONDS = 1800.0
+
+# Speculative next-page prefetch (opt-in via ASTRAL_PREFETCH=true)
+PREFETCH_ENABLED = _env_flag("ASTRAL_PREFETCH")
+PREFETCH_BUDGET = 16
+PREFETCH_MAX_CONCURRENCY = 2
+PREFETCH_UNUSED_TTL_SECONDS = 60.0
+
+# Location proof watches (subscribable resources)
+WATCH_POLL_INTERVAL_SECONDS = 30.0
+WATCH_MAX_WATCHES = 64
+WATCH_RECENT_LIMIT = 100
+
+# Lazily built GeoJSON resources (astral://geojson/{id})
+GEOJSON_RESOURCE_MAX_ENTRIES = 256
+GEOJSON_RESOURCE_TTL_SECONDS = 300.0
+
+# File exports (relative paths resolve against the server's working directory)
+EXPORT_DIR = Path(os.getenv("ASTRAL_EXPORT_DIR", "exports")).resolve()
+EXPORT_MAX_ROWS = 1_000_000
+
+# Logging: per-call INFO logs are kept at LOG_SAMPLE_RATE (0.0-1.0); warnings and errors always
+LOG_LEVEL = os.getenv("ASTRAL_LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = _env_float("ASTRAL_LOG_SAMPLE_RATE", 1.0)
+
+# Per-call phase timings: ASTRAL_TIMINGS=true adds them to every result; ASTRAL_TRACE_FILE appends spans as JSON lines
+TIMINGS_ENABLED = _env_flag("ASTRAL_TIMINGS")
+TRACE_FILE = os.getenv("ASTRAL_TRACE_FILE")
+
 # MCP Server Configuration
 SERVER_NAME = "astral-mcp-server"
 SERVER_VERSION = "0.1.0"
@@ -1,34 +1,189 @@
 # Helper subpackage for astral_mcp_server
 
+from .cache import TTLCache
+from .cursors import CursorState, CursorStore
+from .deadline import (
+    DeadlineGuard,
+    current_deadline,
+    deadline_from_meta,
+    deadline_scope,
+    remaining,
+    request_timeout,
+    until_deadline,
+)
+from .deltas import ResultFingerprintStore, fingerprint
+from .export import EXPORT_FORMATS, ExportWriter, MissingDependencyError, open_export_writer
 from .geojson import (
+    attestation_geometry,
     attestation_to_feature,
     feature_collection_from_attestations,
     find_point_geometry,
     geojson_blocks_for_single,
     parse_location_field,
     point_from_latlon,
+    single_attestation,
+)
+from .geojson_encoding import (
+    GEOJSON_ENCODINGS,
+    decode_geobuf,
+    dequantize_feature_collection,
+    encode_feature_collection,
+    encode_geobuf,
+    quantize_feature_collection,
+    round_feature_collection,
+    validate_encoding_options,
+)
+from .geojson_resources import GEOJSON_URI_PREFIX, GeoJSONResourceStore, geojson_uri
+from .graphql import LOCATION_PROOF_FIELDS, GraphQLBatcher, GraphQLError, build_batch_query
+from .logs import SAMPLED, SamplingFilter, configure_logging
+from .planner import (
+    PlanResult,
+    TimeShardedPlanner,
+    format_timestamp,
+    iter_offset_pages,
+    merge_attestations,
+    offset_walk,
+    parse_timestamp,
+)
+from .prefetch import Prefetcher
+from .prompts import PromptRegistry, parse_prompts
+from .spatial import (
+    coordinate_arrays,
+    filter_within_polygons,
+    filter_within_radius,
+    haversine_km,
+    parse_center,
+    parse_polygons,
+    points_in_polygons,
+    polygons_envelope,
+    radius_envelope,
+)
+from .spatial_index import NumpyKDTree, SpatialIndex, SpatialIndexStore
+from .subscriptions import WATCH_URI_PREFIX, Watch, WatchRegistry, watch_uri
+from .timing import (
+    TIMING_PHASES,
+    RequestTimer,
+    TraceWriter,
+    activate_timer,
+    current_timer,
+    http_trace_extensions,
+    timed_span,
+)
+from .tiles import TileCache, clip_to_bbox, tile_bounds, tiles_for_bbox
+from .trajectory import analyze_trajectory, segment_distances_km, timestamp_array
+from .utils import (
+    canonical_params_key,
+    extract_location_proofs_list,
+    extract_pagination,
+    has_more_results,
+    pagination_total,
 )
-from .utils import extract_location_proofs_list, extract_pagination
 from .validation import (
     ERROR_TEXT_TRUNCATE_LENGTH,
     MAX_QUERY_LIMIT,
     MIN_QUERY_LIMIT,
     build_query_params,
+    parse_bbox,
     validate_query_args,
 )
+from .verification import ProofVerifier, content_hash, verifier_available, verify_attestation
 
 __all__ = [
     "ERROR_TEXT_TRUNCATE_LENGTH",
+    "EXPORT_FORMATS",
+    "ExportWriter",
+    "GEOJSON_ENCODINGS",
+    "GEOJSON_URI_PREFIX",
+    "GeoJSONResourceStore",
+    "GraphQLBatcher",
+    "GraphQLError",
+    "LOCATION_PROOF_FIELDS",
+    "CursorState",
+    "CursorStore",
+    "DeadlineGuard",
     "MAX_QUERY_LIMIT",
     "MIN_QUERY_LIMIT",
+    "MissingDependencyError",
+    "NumpyKDTree",
+    "PlanResult",
+    "PromptRegistry",
+    "ProofVerifier",
+    "Prefetcher",
+    "SAMPLED",
+    "SamplingFilter",
+    "SpatialIndex",
+    "SpatialIndexStore",
+    "RequestTimer",
+    "ResultFingerprintStore",
+    "TIMING_PHASES",
+    "TTLCache",
+    "TileCache",
+    "TimeShardedPlanner",
+    "TraceWriter",
+    "WATCH_URI_PREFIX",
+    "Watch",
+    "WatchRegistry",
+    "activate_timer",
+    "analyze_trajectory",
+    "attestation_geometry",
     "attestation_to_feature",
+    "build_batch_query",
     "build_query_params",
+    "canonical_params_key",
+    "clip_to_bbox",
+    "configure_logging",
+    "content_hash",
+    "coordinate_arrays",
+    "current_deadline",
+    "deadline_from_meta",
+    "deadline_scope",
+    "decode_geobuf",
+    "dequantize_feature_collection",
+    "current_timer",
+    "encode_feature_collection",
+    "encode_geobuf",
     "extract_location_proofs_list",
     "extract_pagination",
     "feature_collection_from_attestations",
+    "filter_within_polygons",
+    "filter_within_radius",
     "find_point_geometry",
+    "fingerprint",
+    "format_timestamp",
     "geojson_blocks_for_single",
+    "geojson_uri",
+    "has_more_results",
+    "http_trace_extensions",
+    "iter_offset_pages",
+    "haversine_km",
+    "merge_attestations",
+    "offset_walk",
+    "open_export_writer",
+    "parse_bbox",
+    "parse_center",
+    "pagination_total",
     "parse_location_field",
+    "parse_polygons",
+    "parse_prompts",
+    "parse_timestamp",
     "point_from_latlon",
+    "points_in_polygons",
+    "polygons_envelope",
+    "quantize_feature_collection",
+    "radius_envelope",
+    "remaining",
+    "request_timeout",
+    "round_feature_collection",
+    "segment_distances_km",
+    "single_attestation",
+    "tile_bounds",
+    "timed_span",
+    "tiles_for_bbox",
+    "timestamp_array",
+    "until_deadline",
+    "validate_encoding_options",
     "validate_query_args",
+    "verifier_available",
+    "verify_attestation",
+    "watch_uri",
 ]
@@ -0,0 +1,87 @@
+"""Small in-memory caches shared by the server's tools."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU mapping whose entries also expire `ttl` seconds after they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, stored_at: float) -> bool:
+        return self._clock() - stored_at > self.ttl
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return the live value for `key` (refreshing its LRU position) or `default`."""
+        entry = self._data.get(key)
+        if entry is None or self._expired(entry[0]):
+            if entry is not None:
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """Store `value`, evicting the least recently used entry when full."""
+        self._data[key] = (self._clock(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove `key` and return its value if it was still live."""
+        entry = self._data.pop(key, None)
+        if entry is None or self._expired(entry[0]):
+            return default
+        return entry[1]
+
+    def purge(self) -> int:
+        """Drop expired entries and return how many were removed."""
+        stale = [k for k, (stored_at, _) in self._data.items() if self._expired(stored_at)]
+        for k in stale:
+            del self._data[k]
+        self.evictions += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def keys(self) -> Iterator[K]:
+        return iter(list(self._data.keys()))
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)  # type: ignore[arg-type]
+        return entry is not None and not self._expired(entry[0])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
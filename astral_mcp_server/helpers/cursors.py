@@ -0,0 +1,126 @@
+"""Server-held, resumable result sets addressed by opaque cursor tokens.
+
+A cursor remembers the filters, the position of the next row to hand out and a buffer of
+rows already read ahead from the API, so follow-up pages are often served from memory
+instead of a new deep-offset request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .cache import TTLCache
+from .utils import extract_location_proofs_list, extract_pagination, pagination_total
+from .validation import MAX_QUERY_LIMIT
+
+QueryParams = Dict[str, Union[str, int]]
+FetchPage = Callable[[QueryParams], Awaitable[object]]
+TakePrefetched = Callable[[QueryParams], Awaitable[Optional[object]]]
+
+
+@dataclass
+class CursorState:
+    """Position within a result set plus rows read ahead of it."""
+
+    params: QueryParams
+    limit: int
+    position: int
+    buffer: List[Dict[str, object]] = field(default_factory=list)
+    exhausted: bool = False
+    total: Optional[int] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+class CursorStore:
+    """Bounded, TTL-evicted store of cursor states keyed by opaque tokens."""
+
+    def __init__(self, maxsize: int, ttl: float, read_ahead: int = MAX_QUERY_LIMIT) -> None:
+        self._states: TTLCache[str, CursorState] = TTLCache(maxsize, ttl)
+        self._read_ahead = read_ahead
+
+    def create(
+        self,
+        params: QueryParams,
+        limit: int,
+        position: int,
+        *,
+        buffer: Optional[List[Dict[str, object]]] = None,
+        exhausted: bool = False,
+        total: Optional[int] = None,
+    ) -> str:
+        """Register a new cursor positioned at `position` and return its token."""
+        filters = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+        token = secrets.token_urlsafe(16)
+        self._states.set(
+            token,
+            CursorState(
+                params=filters, limit=limit, position=position, buffer=list(buffer or []), exhausted=exhausted, total=total
+            ),
+        )
+        return token
+
+    def get(self, token: str) -> Optional[CursorState]:
+        return self._states.get(token)
+
+    def drop(self, token: str) -> None:
+        self._states.pop(token)
+
+    async def next_page(
+        self, token: str, fetch_page: FetchPage, take_prefetched: Optional[TakePrefetched] = None
+    ) -> Tuple[List[Dict[str, object]], CursorState, bool, bool]:
+        """Return the next page for `token`.
+
+        When the buffer runs short, a page of exactly `limit` rows already prefetched by
+        `take_prefetched` is used before reading ahead from upstream.
+
+        Returns:
+            (rows, state, served_from_buffer, has_more). The cursor is dropped once exhausted.
+
+        Raises:
+            KeyError: If the cursor is unknown or has expired.
+        """
+        state = self._states.get(token)
+        if state is None:
+            raise KeyError(token)
+
+        async with state.lock:
+            from_buffer = True
+            if len(state.buffer) < state.limit and not state.exhausted:
+                page_params: QueryParams = dict(state.params)
+                page_params["offset"] = state.position + len(state.buffer)
+                data = None
+                if take_prefetched is not None:
+                    # The query tool prefetches the following offset page, `limit` rows long
+                    page_params["limit"] = read_ahead = state.limit
+                    data = await take_prefetched(page_params)
+                if data is None:
+                    # Read a full upstream page ahead so the following calls can be served from memory
+                    page_params["limit"] = read_ahead = max(self._read_ahead, state.limit)
+                    data = await fetch_page(page_params)
+                rows = extract_location_proofs_list(data)
+                state.buffer.extend(rows)
+                total = pagination_total(extract_pagination(data))
+                if total is not None:
+                    state.total = total
+                state.exhausted = len(rows) < read_ahead
+                from_buffer = False
+
+            page = state.buffer[: state.limit]
+            del state.buffer[: state.limit]
+            state.position += len(page)
+
+            has_more = bool(state.buffer) or not state.exhausted
+            if state.total is not None and state.position >= state.total:
+                has_more = False
+            if has_more:
+                # Refresh the TTL of an active cursor
+                self._states.set(token, state)
+            else:
+                self._states.pop(token)
+            return page, state, from_buffer, has_more
+
+    def stats(self) -> Dict[str, object]:
+        return self._states.stats()
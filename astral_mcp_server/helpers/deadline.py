@@ -0,0 +1,96 @@
+"""Per-call deadlines propagated to nested upstream work.
+
+A tool call binds an absolute deadline to the current context; everything it awaits,
+including concurrently spawned shard fetches, sees the same deadline through a context
+variable. Upstream requests size their timeouts from the time remaining, and bulk
+retrieval stops at the deadline and keeps whatever was collected so far.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Mapping, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("astral_deadline", default=None)
+
+
+def current_deadline() -> Optional[float]:
+    """Absolute deadline (time.monotonic() seconds) of the current call, if any."""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (negative once passed), or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float], *, inherit: bool = True) -> Iterator[Optional[float]]:
+    """Bind a deadline `seconds` from now for the duration of the block.
+
+    With `inherit`, an enclosing deadline that is sooner still wins, so nested calls can only
+    shorten it. Background work that outlives the call should pass `inherit=False`.
+    """
+    deadline = None if seconds is None else time.monotonic() + seconds
+    outer = _deadline.get() if inherit else None
+    if outer is not None and (deadline is None or outer < deadline):
+        deadline = outer
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def request_timeout(default: float) -> float:
+    """Timeout for one upstream request: `default`, capped by the time remaining."""
+    left = remaining()
+    return default if left is None else max(0.001, min(default, left))
+
+
+class DeadlineGuard:
+    """Result of an `until_deadline` block."""
+
+    def __init__(self) -> None:
+        self.expired = False
+
+
+@asynccontextmanager
+async def until_deadline() -> AsyncIterator[DeadlineGuard]:
+    """Run the block until the current deadline; on expiry it is cancelled and `guard.expired` is set.
+
+    Cancellation of the caller itself (e.g. the client cancelling the request) still propagates.
+    """
+    guard = DeadlineGuard()
+    left = remaining()
+    if left is None:
+        yield guard
+        return
+    try:
+        async with asyncio.timeout(max(0.0, left)):
+            yield guard
+    except TimeoutError:
+        guard.expired = True
+
+
+def deadline_from_meta(meta: Optional[Mapping[str, object]], now: Optional[float] = None) -> Optional[float]:
+    """Seconds until the deadline a client put in request `_meta`, if any.
+
+    Accepts `timeoutMs`/`timeout_ms` (relative milliseconds) or `deadline` (absolute unix epoch,
+    in seconds or milliseconds).
+    """
+    if not meta:
+        return None
+    for key in ("timeoutMs", "timeout_ms"):
+        value = meta.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return float(value) / 1000.0
+    value = meta.get("deadline")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        epoch = float(value) / 1000.0 if value > 1e11 else float(value)
+        return epoch - (time.time() if now is None else now)
+    return None
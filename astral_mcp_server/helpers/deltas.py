@@ -0,0 +1,97 @@
+"""Fingerprints of returned result sets, for answering repeated queries with a diff.
+
+A fingerprint keeps only what identifies a result set's membership and state: each proof's
+UID and its `revoked` flag. Tools register every set they return and hand out its token
+(`result_token`); re-running the same query with `since_result=<token>` then returns the
+proofs added, removed or revoked since, instead of the whole list.
+
+Tokens are derived from the query and the fingerprint, so re-running a query whose results
+have not changed yields the same token and stores nothing new.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+from .cache import TTLCache
+
+
+def fingerprint(atts: List[Dict[str, object]]) -> Dict[str, bool]:
+    """UID -> revoked flag for every attestation that has a UID."""
+    return {att["uid"]: att.get("revoked") is True for att in atts if isinstance(att.get("uid"), str)}  # type: ignore[misc]
+
+
+@dataclass
+class _Fingerprint:
+    query_key: Hashable
+    revoked: Dict[str, bool]
+
+
+class ResultFingerprintStore:
+    """TTL-evicted fingerprints of returned result sets, addressed by `result_token`."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[str, _Fingerprint] = TTLCache(maxsize, ttl)
+        self.registered = 0
+        self.diffs = 0
+
+    @staticmethod
+    def _token(query_key: Hashable, revoked: Dict[str, bool]) -> str:
+        digest = hashlib.blake2b(repr(query_key).encode("utf-8"), digest_size=16)
+        for uid in sorted(revoked):
+            digest.update(f"{uid}:{int(revoked[uid])};".encode("utf-8"))
+        return base64.urlsafe_b64encode(digest.digest()).decode("ascii").rstrip("=")
+
+    def register(self, query_key: Hashable, atts: List[Dict[str, object]]) -> str:
+        """Remember the fingerprint of `atts` returned for `query_key` and return its token."""
+        revoked = fingerprint(atts)
+        token = self._token(query_key, revoked)
+        if self._entries.get(token) is None:
+            self.registered += 1
+        self._entries.set(token, _Fingerprint(query_key, revoked))
+        return token
+
+    def diff(self, token: str, query_key: Hashable, atts: List[Dict[str, object]]) -> Optional[Dict[str, object]]:
+        """Changes in `atts` since the result set `token` refers to, or None if it expired.
+
+        Returns:
+            {"added": proofs not in the earlier set, "removed": UIDs no longer present,
+             "revoked": proofs revoked since, "unchanged": count of the rest}
+
+        Raises:
+            ValueError: If `token` was issued for a different query.
+        """
+        base = self._entries.get(token)
+        if base is None:
+            return None
+        if base.query_key != query_key:
+            raise ValueError("since_result was issued for a different query; re-run without it")
+        added: List[Dict[str, object]] = []
+        revoked: List[Dict[str, object]] = []
+        seen = set()
+        for att in atts:
+            uid = att.get("uid")
+            if not isinstance(uid, str):
+                continue
+            seen.add(uid)
+            was_revoked = base.revoked.get(uid)
+            if was_revoked is None:
+                added.append(att)
+            elif att.get("revoked") is True and not was_revoked:
+                revoked.append(att)
+        removed = [uid for uid in base.revoked if uid not in seen]
+        self.diffs += 1
+        return {
+            "added": added,
+            "removed": removed,
+            "revoked": revoked,
+            "unchanged": len(seen) - len(added) - len(revoked),
+        }
+
+    def stats(self) -> Dict[str, object]:
+        stats = self._entries.stats()
+        stats.update({"registered": self.registered, "diffs": self.diffs})
+        return stats
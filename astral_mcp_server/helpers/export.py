@@ -0,0 +1,220 @@
+"""Streaming file writers for exporting location proofs.
+
+Pages are appended to the output as they arrive, so memory use stays flat regardless of
+how many rows are exported. NDJSON and GeoJSONSeq need only the standard library;
+GeoParquet requires `pyarrow` and FlatGeobuf requires `fiona`.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+from .geojson import attestation_to_feature
+
+# Optional dependencies for binary formats
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:
+    pa = None
+    pq = None
+
+try:
+    import fiona  # type: ignore
+except Exception:
+    fiona = None
+
+EXPORT_FORMATS: Dict[str, str] = {
+    "ndjson": ".ndjson",
+    "geojsonseq": ".geojsonl",
+    "geoparquet": ".parquet",
+    "flatgeobuf": ".fgb",
+}
+
+# Scalar attestation fields promoted to typed columns in tabular formats
+EXPORT_COLUMNS = ("uid", "timestamp", "chain", "prover", "subject", "srs")
+
+# GeoJSON text sequence record separator (RFC 8142)
+_RS = "\x1e"
+
+
+class MissingDependencyError(RuntimeError):
+    """The optional dependency a format needs is not installed."""
+
+
+def _point_wkb(lon: float, lat: float) -> bytes:
+    """Little-endian WKB encoding of a 2D Point."""
+    return struct.pack("<BIdd", 1, 1, lon, lat)
+
+
+class ExportWriter(ABC):
+    """Base class for streaming writers; tracks row count and the running bbox."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rows = 0
+        self.skipped = 0
+        self._bbox = [math.inf, math.inf, -math.inf, -math.inf]
+
+    def _extend_bbox(self, lon: float, lat: float) -> None:
+        b = self._bbox
+        b[0], b[1] = min(b[0], lon), min(b[1], lat)
+        b[2], b[3] = max(b[2], lon), max(b[3], lat)
+
+    @property
+    def bbox(self) -> Optional[List[float]]:
+        return None if math.isinf(self._bbox[0]) else list(self._bbox)
+
+    def write_page(self, atts: List[Dict[str, object]]) -> None:
+        rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]] = []
+        for att in atts:
+            feature = attestation_to_feature(att)
+            if feature is not None:
+                lon, lat = feature["geometry"]["coordinates"]  # type: ignore[index]
+                self._extend_bbox(lon, lat)
+            rows.append((att, feature))
+        self._write_rows(rows)
+
+    @abstractmethod
+    def _write_rows(self, rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]]) -> None:
+        """Append one page of (attestation, feature) rows."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Finish the file."""
+
+
+class NDJSONWriter(ExportWriter):
+    """One raw attestation JSON object per line."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._fh = path.open("w", encoding="utf-8")
+
+    def _write_rows(self, rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]]) -> None:
+        self._fh.write("".join(json.dumps(att, separators=(",", ":")) + "\n" for att, _ in rows))
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class GeoJSONSeqWriter(ExportWriter):
+    """RFC 8142 GeoJSON text sequence of Features; attestations without geometry are skipped."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._fh = path.open("w", encoding="utf-8")
+
+    def _write_rows(self, rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]]) -> None:
+        lines = [_RS + json.dumps(f, separators=(",", ":")) + "\n" for _, f in rows if f is not None]
+        self._fh.write("".join(lines))
+        self.rows += len(lines)
+        self.skipped += len(rows) - len(lines)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class GeoParquetWriter(ExportWriter):
+    """GeoParquet 1.0 with a WKB point `geometry` column, flushed in bounded row groups."""
+
+    ROW_GROUP_SIZE = 5000
+
+    def __init__(self, path: Path) -> None:
+        if pa is None or pq is None:
+            raise MissingDependencyError("pyarrow is required to export GeoParquet; install pyarrow or choose another format")
+        super().__init__(path)
+        geo = {
+            "version": "1.0.0",
+            "primary_column": "geometry",
+            "columns": {"geometry": {"encoding": "WKB", "geometry_types": ["Point"]}},
+        }
+        fields = [pa.field(c, pa.string()) for c in EXPORT_COLUMNS]
+        fields += [pa.field("revoked", pa.bool_()), pa.field("attestation", pa.string()), pa.field("geometry", pa.binary())]
+        self._schema = pa.schema(fields, metadata={b"geo": json.dumps(geo).encode("utf-8")})
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+        self._pending: Dict[str, List[object]] = {f.name: [] for f in fields}
+
+    def _write_rows(self, rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]]) -> None:
+        cols = self._pending
+        for att, feature in rows:
+            for c in EXPORT_COLUMNS:
+                v = att.get(c)
+                cols[c].append(None if v is None else str(v))
+            revoked = att.get("revoked")
+            cols["revoked"].append(revoked if isinstance(revoked, bool) else None)
+            cols["attestation"].append(json.dumps(att, separators=(",", ":")))
+            if feature is not None:
+                lon, lat = feature["geometry"]["coordinates"]  # type: ignore[index]
+                cols["geometry"].append(_point_wkb(lon, lat))
+            else:
+                cols["geometry"].append(None)
+        self.rows += len(rows)
+        if len(cols["uid"]) >= self.ROW_GROUP_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending["uid"]:
+            return
+        self._writer.write_table(pa.table(self._pending, schema=self._schema))
+        for v in self._pending.values():
+            v.clear()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class FlatGeobufWriter(ExportWriter):
+    """FlatGeobuf points written without a spatial index so features stream straight to disk."""
+
+    def __init__(self, path: Path) -> None:
+        if fiona is None:
+            raise MissingDependencyError("fiona is required to export FlatGeobuf; install fiona or choose another format")
+        super().__init__(path)
+        schema = {"geometry": "Point", "properties": {**{c: "str" for c in EXPORT_COLUMNS}, "revoked": "bool"}}
+        self._collection = fiona.open(str(path), "w", driver="FlatGeobuf", schema=schema, crs="EPSG:4326", SPATIAL_INDEX="NO")
+
+    def _write_rows(self, rows: List[Tuple[Dict[str, object], Optional[Dict[str, object]]]]) -> None:
+        records = []
+        for att, feature in rows:
+            if feature is None:
+                self.skipped += 1
+                continue
+            props: Dict[str, object] = {c: (None if att.get(c) is None else str(att.get(c))) for c in EXPORT_COLUMNS}
+            revoked = att.get("revoked")
+            props["revoked"] = revoked if isinstance(revoked, bool) else None
+            records.append({"geometry": feature["geometry"], "properties": props})
+        if records:
+            self._collection.writerecords(records)
+        self.rows += len(records)
+
+    def close(self) -> None:
+        self._collection.close()
+
+
+_WRITERS: Dict[str, Type[ExportWriter]] = {
+    "ndjson": NDJSONWriter,
+    "geojsonseq": GeoJSONSeqWriter,
+    "geoparquet": GeoParquetWriter,
+    "flatgeobuf": FlatGeobufWriter,
+}
+
+
+def open_export_writer(fmt: str, path: Path) -> ExportWriter:
+    """Create the streaming writer for `fmt` at `path`.
+
+    Raises:
+        ValueError: If the format is unknown.
+        MissingDependencyError: If the optional dependency for the format is missing.
+    """
+    writer_cls = _WRITERS.get(fmt)
+    if writer_cls is None:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return writer_cls(path)
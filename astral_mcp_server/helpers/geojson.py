@@ -6,6 +6,8 @@ import json
 import re
 from typing import Dict, List, Optional
 
+from .timing import timed_span
+
 
 def find_point_geometry(obj: object) -> Optional[Dict[str, object]]:
     """Recursively find a GeoJSON Point geometry within an object."""
@@ -85,8 +87,8 @@ def parse_location_field(loc: str) -> Optional[Dict[str, object]]:
     return None
 
 
-def attestation_to_feature(att: Dict[str, object]) -> Optional[Dict[str, object]]:
-    """Map an attestation-like dict to a GeoJSON Feature if coords exist.
+def attestation_geometry(att: Dict[str, object]) -> Optional[Dict[str, object]]:
+    """Resolve the GeoJSON Point geometry of an attestation-like dict, if any.
 
     Resolution order for geometry (prefer explicit numeric fields):
     1) Build from explicit `latitude` and `longitude` fields.
@@ -106,6 +108,15 @@ def attestation_to_feature(att: Dict[str, object]) -> Optional[Dict[str, object]
         if isinstance(loc, str):
             geom = parse_location_field(loc)
 
+    return geom
+
+
+def attestation_to_feature(att: Dict[str, object]) -> Optional[Dict[str, object]]:
+    """Map an attestation-like dict to a GeoJSON Feature if coords exist.
+
+    Geometry is resolved with `attestation_geometry`.
+    """
+    geom = attestation_geometry(att)
     if geom is None:
         return None
 
@@ -120,12 +131,23 @@ def feature_collection_from_attestations(
     atts: List[Dict[str, object]]
 ) -> Dict[str, object]:
     """Build a FeatureCollection from a list of attestations."""
-    features: List[Dict[str, object]] = []
-    for att in atts:
-        f = attestation_to_feature(att)
-        if f is not None:
-            features.append(f)
-    return {"type": "FeatureCollection", "features": features}
+    with timed_span("feature_collection"):
+        features: List[Dict[str, object]] = []
+        for att in atts:
+            f = attestation_to_feature(att)
+            if f is not None:
+                features.append(f)
+        return {"type": "FeatureCollection", "features": features}
+
+
+def single_attestation(data: object) -> Optional[Dict[str, object]]:
+    """Return the attestation from a single-item response (may be wrapped in a location_proof key)."""
+    if not isinstance(data, dict):
+        return None
+    att_obj = data.get("location_proof")
+    if att_obj is None:
+        att_obj = data
+    return att_obj if isinstance(att_obj, dict) else None
 
 
 def geojson_blocks_for_single(
@@ -140,10 +162,8 @@ def geojson_blocks_for_single(
     Returns:
         List of two JSON content blocks: [result, FeatureCollection]
     """
-    att_obj = data.get("location_proof") if isinstance(data, dict) else None
-    if att_obj is None and isinstance(data, dict):
-        att_obj = data
-    feature = attestation_to_feature(att_obj) if isinstance(att_obj, dict) else None
+    att_obj = single_attestation(data)
+    feature = attestation_to_feature(att_obj) if att_obj is not None else None
     features: List[Dict[str, object]] = []
     if feature is not None:
         features.append(feature)
@@ -0,0 +1,74 @@
+"""Short-lived GeoJSON resources built on first read.
+
+Instead of inlining a FeatureCollection next to the result, a tool can register the
+attestations it returned and hand out an `astral://geojson/{id}` URI. The FeatureCollection
+is only built if a client reads that URI; the built collection is then cached until the
+entry expires.
+"""
+
+from __future__ import annotations
+
+import secrets
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .cache import TTLCache
+from .geojson import feature_collection_from_attestations
+from .geojson_encoding import encode_feature_collection
+
+GEOJSON_URI_PREFIX = "astral://geojson/"
+
+
+def geojson_uri(resource_id: str) -> str:
+    return f"{GEOJSON_URI_PREFIX}{resource_id}"
+
+
+@dataclass
+class _Entry:
+    attestations: Optional[List[Dict[str, object]]]
+    encoding: str = "geojson"
+    precision: Optional[int] = None
+    collection: Optional[Dict[str, object]] = None
+
+
+class GeoJSONResourceStore:
+    """TTL-evicted map of resource ids to attestations and their lazily built FeatureCollection."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[str, _Entry] = TTLCache(maxsize, ttl)
+        self.registered = 0
+        self.builds = 0
+
+    def register(self, atts: List[Dict[str, object]], encoding: str = "geojson", precision: Optional[int] = None) -> str:
+        """Remember `atts` and return the URI their FeatureCollection can be read from.
+
+        The collection is encoded with `encode_feature_collection(encoding, precision)` when built.
+        """
+        resource_id = secrets.token_urlsafe(12)
+        self._entries.set(resource_id, _Entry(attestations=atts, encoding=encoding, precision=precision))
+        self.registered += 1
+        return geojson_uri(resource_id)
+
+    def read(self, resource_id: str) -> Dict[str, object]:
+        """Return the FeatureCollection for `resource_id`, building it on the first read.
+
+        Raises:
+            KeyError: If the resource is unknown or has expired.
+        """
+        entry = self._entries.get(resource_id)
+        if entry is None:
+            raise KeyError(resource_id)
+        if entry.collection is None:
+            fc = feature_collection_from_attestations(entry.attestations or [])
+            entry.collection = encode_feature_collection(fc, entry.encoding, entry.precision)
+            # The source rows are no longer needed once the collection exists
+            entry.attestations = None
+            self.builds += 1
+        # Reads keep the resource alive for another TTL window
+        self._entries.set(resource_id, entry)
+        return entry.collection
+
+    def stats(self) -> Dict[str, object]:
+        stats = self._entries.stats()
+        stats.update({"registered": self.registered, "built": self.builds})
+        return stats
@@ -0,0 +1,218 @@
+"""Batched GraphQL backend for location proof queries.
+
+Page queries (one filter set each) and UID lookups issued concurrently within one event-loop
+tick are combined into a single aliased GraphQL request:
+
+    query AstralBatch($q0: LocationProofFilter!, $u0: String!) {
+      q0: locationProofs(filter: $q0) { data { ...ProofFields } pagination { total limit offset } }
+      u0: locationProof(uid: $u0) { ...ProofFields }
+    }
+
+Each `locationProofs` alias returns the same `{data, pagination}` shape as the REST list
+endpoint, so results go through the usual `extract_location_proofs_list` /
+`attestation_to_feature` pipeline unchanged. Callers such as the tile cache and the
+time-sharded planner already fan out with `asyncio.gather`, so their N page requests
+become one round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .deadline import remaining
+
+QueryParams = Mapping[str, Union[str, int]]
+PostQuery = Callable[[Dict[str, object]], Awaitable[object]]
+
+# Attestation fields selected for every proof; these cover what the tools and the GeoJSON pipeline read
+LOCATION_PROOF_FIELDS = (
+    "uid",
+    "chain",
+    "prover",
+    "subject",
+    "timestamp",
+    "srs",
+    "location",
+    "longitude",
+    "latitude",
+    "revoked",
+)
+
+_FRAGMENT = "fragment ProofFields on LocationProof { " + " ".join(LOCATION_PROOF_FIELDS) + " }"
+
+
+class GraphQLError(Exception):
+    """The GraphQL endpoint reported errors for a query (or for one alias of a batch)."""
+
+    def __init__(self, message: str, errors: Optional[List[object]] = None) -> None:
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def _filter_variables(params: QueryParams) -> Dict[str, object]:
+    """REST query params as a `LocationProofFilter` input object."""
+    variables: Dict[str, object] = {}
+    for key, value in params.items():
+        if key == "bbox" and isinstance(value, str):
+            variables[key] = [float(v) for v in value.split(",")]
+        elif key in ("limit", "offset"):
+            variables[key] = int(value)
+        else:
+            variables[key] = value
+    return variables
+
+
+def build_batch_query(filter_sets: Sequence[QueryParams], uids: Sequence[str]) -> Dict[str, object]:
+    """Build one aliased query for `filter_sets` (aliases q0..) and `uids` (aliases u0..).
+
+    Returns:
+        The request payload: {"query", "variables"}.
+    """
+    declarations: List[str] = []
+    fields: List[str] = []
+    variables: Dict[str, object] = {}
+    for i, params in enumerate(filter_sets):
+        alias = f"q{i}"
+        declarations.append(f"${alias}: LocationProofFilter!")
+        fields.append(
+            f"{alias}: locationProofs(filter: ${alias}) {{ data {{ ...ProofFields }} pagination {{ total limit offset }} }}"
+        )
+        variables[alias] = _filter_variables(params)
+    for i, uid in enumerate(uids):
+        alias = f"u{i}"
+        declarations.append(f"${alias}: String!")
+        fields.append(f"{alias}: locationProof(uid: ${alias}) {{ ...ProofFields }}")
+        variables[alias] = uid
+    query = f"query AstralBatch({', '.join(declarations)}) {{ {' '.join(fields)} }} {_FRAGMENT}"
+    return {"query": query, "variables": variables}
+
+
+def _alias_errors(body: Mapping[str, object]) -> Tuple[Dict[str, List[object]], List[object]]:
+    """Split a response's `errors` into per-alias errors and errors for the whole request."""
+    by_alias: Dict[str, List[object]] = {}
+    general: List[object] = []
+    errors = body.get("errors")
+    for error in errors if isinstance(errors, list) else []:
+        path = error.get("path") if isinstance(error, dict) else None
+        if isinstance(path, list) and path and isinstance(path[0], str):
+            by_alias.setdefault(path[0], []).append(error)
+        else:
+            general.append(error)
+    return by_alias, general
+
+
+def _error_message(errors: List[object]) -> str:
+    messages = [str(e.get("message")) if isinstance(e, dict) else str(e) for e in errors]
+    return "; ".join(messages) or "GraphQL request failed"
+
+
+class _Request:
+    __slots__ = ("kind", "arg", "future")
+
+    def __init__(self, kind: str, arg: object, future: "asyncio.Future[object]") -> None:
+        self.kind = kind
+        self.arg = arg
+        self.future = future
+
+
+class GraphQLBatcher:
+    """Coalesces page queries and UID lookups into aliased GraphQL requests.
+
+    Requests made before the next loop iteration (or within `window` seconds) are sent together,
+    at most `max_batch` aliases per request. A batch runs in a fresh context, so it carries none of
+    its callers' deadlines or timers; each caller instead waits for its own result only until its
+    own deadline, raising TimeoutError past it. A request whose callers have all been cancelled or
+    timed out is cancelled too.
+    """
+
+    def __init__(self, post: PostQuery, *, max_batch: int, window: float = 0.0) -> None:
+        self._post = post
+        self._max_batch = max(1, max_batch)
+        self._window = window
+        self._pending: List[_Request] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self.requests = 0
+        self.aliases = 0
+
+    async def page(self, params: QueryParams) -> object:
+        """One page for a filter set, shaped like the REST list response ({data, pagination})."""
+        return await self._wait(self._enqueue("page", dict(params)))
+
+    async def proof(self, uid: str) -> Optional[Dict[str, object]]:
+        """The attestation with `uid`, or None if it does not exist."""
+        return await self._wait(self._enqueue("proof", uid))  # type: ignore[return-value]
+
+    @staticmethod
+    async def _wait(future: "asyncio.Future[object]") -> object:
+        left = remaining()
+        if left is None:
+            return await future
+        return await asyncio.wait_for(future, max(0.0, left))
+
+    def _enqueue(self, kind: str, arg: object) -> "asyncio.Future[object]":
+        loop = asyncio.get_running_loop()
+        request = _Request(kind, arg, loop.create_future())
+        self._pending.append(request)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush, context=contextvars.Context())
+        return request.future
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self._max_batch):
+            batch = [r for r in pending[start : start + self._max_batch] if not r.future.done()]
+            if batch:
+                self._start(batch)
+
+    def _start(self, batch: List[_Request]) -> None:
+        task = asyncio.get_running_loop().create_task(self._send(batch), context=contextvars.Context())
+
+        def on_done(_: "asyncio.Future[object]") -> None:
+            if not task.done() and all(r.future.cancelled() for r in batch):
+                task.cancel()
+
+        for r in batch:
+            r.future.add_done_callback(on_done)
+
+    async def _send(self, batch: List[_Request]) -> None:
+        pages = [r for r in batch if r.kind == "page"]
+        proofs = [r for r in batch if r.kind == "proof"]
+        payload = build_batch_query([r.arg for r in pages], [r.arg for r in proofs])  # type: ignore[misc]
+        self.requests += 1
+        self.aliases += len(batch)
+        try:
+            body = await self._post(payload)
+            if not isinstance(body, dict):
+                raise GraphQLError("GraphQL response is not a JSON object")
+            by_alias, general = _alias_errors(body)
+            data = body.get("data")
+            if general or not isinstance(data, dict):
+                raise GraphQLError(_error_message(general), general)
+        except BaseException as e:
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_exception(e if isinstance(e, Exception) else asyncio.CancelledError())
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for prefix, requests in (("q", pages), ("u", proofs)):
+            for i, r in enumerate(requests):
+                if r.future.done():
+                    continue
+                alias = f"{prefix}{i}"
+                if alias in by_alias:
+                    r.future.set_exception(GraphQLError(_error_message(by_alias[alias]), by_alias[alias]))
+                elif r.kind == "proof":
+                    value = data.get(alias)
+                    r.future.set_result(value if isinstance(value, dict) else None)
+                elif alias not in data:
+                    r.future.set_exception(GraphQLError(f"GraphQL response is missing {alias}"))
+                else:
+                    r.future.set_result(data[alias])
+
+    def stats(self) -> Dict[str, object]:
+        return {"requests": self.requests, "aliases": self.aliases}
@@ -0,0 +1,105 @@
+"""Non-blocking, sampled logging for the server.
+
+Records are handed to a `QueueHandler` on the calling thread and written to stderr by a
+`QueueListener` thread, so the event loop never blocks on I/O. Messages use %-style
+arguments and are only formatted on the writer thread, after sampling has decided to keep
+them. Per-call INFO logs are tagged with `extra=SAMPLED` and kept at a configurable rate;
+warnings and errors are always kept.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from typing import Callable, Dict, Optional
+
+# Pass as `extra=` to mark a record as a per-call log eligible for sampling
+SAMPLED: Dict[str, object] = {"sampled": True}
+
+LOG_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop(listener: logging.handlers.QueueListener) -> None:
+    # QueueListener.stop() fails on a listener that is already stopped
+    if getattr(listener, "_thread", None) is not None:
+        listener.stop()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a `rate` fraction of records tagged as sampled at INFO level or below."""
+
+    def __init__(self, rate: float, rand: Callable[[], float] = random.random) -> None:
+        super().__init__()
+        self.rate = min(1.0, max(0.0, rate))
+        self._rand = rand
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not getattr(record, "sampled", False):
+            return True
+        if self.rate >= 1.0 or self._rand() < self.rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that defers message formatting to the listener thread.
+
+    The stock handler formats every record on the caller's thread before enqueueing it;
+    here the record is enqueued as-is so `msg % args` runs on the writer thread instead.
+    Records never leave the process, so arguments do not need to be made picklable.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: int = logging.INFO, sample_rate: float = 1.0) -> logging.handlers.QueueListener:
+    """Route root logging through a queue to a background stderr writer.
+
+    Safe to call more than once; the previous listener is stopped and its handler replaced.
+
+    Args:
+        level: Root logger level.
+        sample_rate: Fraction (0.0-1.0) of sampled per-call INFO records to keep.
+
+    Returns:
+        The running `QueueListener`.
+    """
+    global _listener
+    if _listener is not None:
+        _stop(_listener)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = LazyQueueHandler(log_queue)  # type: ignore[arg-type]
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    writer = logging.StreamHandler(sys.stderr)
+    writer.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(log_queue, writer, respect_handler_level=True)  # type: ignore[arg-type]
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, LazyQueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _stop(_listener)
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,352 @@
+"""Time-sharded query planner for bulk location proof retrieval.
+
+A wide ``fromTimestamp``/``toTimestamp`` window is split into sub-windows that are
+fetched concurrently instead of walking deep ``offset`` pages one after another.
+Sub-windows that come back full are split again, using the reported total (when the
+API provides one) to pick how many pieces the data density calls for.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .deadline import until_deadline
+from .utils import extract_location_proofs_list, extract_pagination, pagination_total
+from .validation import MAX_QUERY_LIMIT
+
+QueryParams = Dict[str, Union[str, int]]
+FetchPage = Callable[[QueryParams], Awaitable[object]]
+
+# Windows narrower than this are walked with offsets instead of being split again
+MIN_SHARD_SECONDS = 1.0
+# Target fill ratio of a page when sizing shards from a reported total
+SHARD_FILL_FACTOR = 0.5
+DEFAULT_MAX_FANOUT = 64
+
+
+def parse_timestamp(value: object) -> Optional[datetime]:
+    """Parse an ISO date string or unix epoch (seconds or milliseconds) into an aware UTC datetime."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        seconds = float(value) / 1000.0 if abs(value) > 1e11 else float(value)
+        try:
+            return datetime.fromtimestamp(seconds, tz=timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            return None
+    if isinstance(value, str):
+        s = value.strip()
+        if not s:
+            return None
+        if _is_numeric(s):
+            return parse_timestamp(float(s))
+        try:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+    return None
+
+
+def _is_numeric(s: str) -> bool:
+    """Return True if `s` looks like a plain (optionally signed/decimal) number."""
+    body = s[1:] if s[:1] in "+-" else s
+    return body.replace(".", "", 1).isdigit()
+
+
+def format_timestamp(dt: datetime) -> str:
+    """Format a datetime as an ISO UTC string with millisecond precision (e.g. 2025-01-01T00:00:00.000Z)."""
+    return dt.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def timestamp_sort_key(att: Dict[str, object]) -> Tuple[float, str]:
+    """Sort key ordering attestations by timestamp, then uid; undated items sort last."""
+    dt = parse_timestamp(att.get("timestamp"))
+    uid = att.get("uid")
+    return (dt.timestamp() if dt is not None else math.inf, uid if isinstance(uid, str) else "")
+
+
+def merge_attestations(batches: Iterable[List[Dict[str, object]]]) -> List[Dict[str, object]]:
+    """Merge attestation batches, deduplicating by `uid` and ordering by timestamp.
+
+    The first occurrence of a uid wins; items without a uid are all kept.
+    """
+    by_uid: Dict[str, Dict[str, object]] = {}
+    anonymous: List[Dict[str, object]] = []
+    for batch in batches:
+        for att in batch:
+            uid = att.get("uid")
+            if isinstance(uid, str):
+                by_uid.setdefault(uid, att)
+            else:
+                anonymous.append(att)
+    merged = list(by_uid.values()) + anonymous
+    merged.sort(key=timestamp_sort_key)
+    return merged
+
+
+def split_window(start: datetime, end: datetime, parts: int) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end] into `parts` contiguous sub-windows sharing their boundaries.
+
+    Boundaries are floored to milliseconds so adjacent windows format to identical strings.
+    """
+    span = end - start
+    bounds = [start]
+    for i in range(1, parts):
+        b = start + span * i / parts
+        bounds.append(b.replace(microsecond=(b.microsecond // 1000) * 1000))
+    bounds.append(end)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+@dataclass
+class PlanResult:
+    """Outcome of a bulk retrieval: merged proofs plus bookkeeping for diagnostics."""
+
+    proofs: List[Dict[str, object]]
+    requests: int = 0
+    shards: int = 0
+    truncated: bool = False
+    # Retrieval stopped at the call's deadline; `proofs` holds what arrived before it
+    deadline_exceeded: bool = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "strategy": "time_sharded" if self.shards else "offset_walk",
+            "upstream_requests": self.requests,
+            "shards": self.shards,
+            "truncated": self.truncated,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+
+async def iter_offset_pages(
+    fetch_page: FetchPage,
+    params: QueryParams,
+    *,
+    page_limit: int = MAX_QUERY_LIMIT,
+    max_results: Optional[int] = None,
+    start_offset: int = 0,
+) -> AsyncGenerator[List[Dict[str, object]], None]:
+    """Yield successive offset pages for `params` until a short page or `max_results` rows.
+
+    Only one page is held at a time, so callers can stream arbitrarily large result sets.
+    """
+    collected = 0
+    offset = start_offset
+    while True:
+        page_params = dict(params)
+        page_params["limit"] = page_limit
+        page_params["offset"] = offset
+        page = extract_location_proofs_list(await fetch_page(page_params))
+        collected += len(page)
+        yield page
+        if len(page) < page_limit:
+            return
+        if max_results is not None and collected >= max_results:
+            return
+        offset += page_limit
+
+
+async def offset_walk(
+    fetch_page: FetchPage,
+    params: QueryParams,
+    *,
+    page_limit: int = MAX_QUERY_LIMIT,
+    max_results: Optional[int] = None,
+    start_offset: int = 0,
+) -> PlanResult:
+    """Naive serial offset pagination over `params` until a short page is returned.
+
+    Stops at the current deadline, returning the pages fetched before it.
+    """
+    pages: List[List[Dict[str, object]]] = []
+    collected = 0
+    requests = 0
+    truncated = False
+    async with until_deadline() as guard:
+        async for page in iter_offset_pages(
+            fetch_page, params, page_limit=page_limit, max_results=max_results, start_offset=start_offset
+        ):
+            requests += 1
+            pages.append(page)
+            collected += len(page)
+    if guard.expired:
+        truncated = True
+    elif max_results is not None and collected >= max_results and len(pages[-1]) == page_limit:
+        truncated = True
+
+    proofs = merge_attestations(pages)
+    if max_results is not None and len(proofs) > max_results:
+        proofs = proofs[:max_results]
+        truncated = True
+    return PlanResult(proofs=proofs, requests=requests, truncated=truncated, deadline_exceeded=guard.expired)
+
+
+class TimeShardedPlanner:
+    """Fetch every proof matching `params` within a time window using concurrent sub-window queries.
+
+    The whole window is probed first; if that page is full, the window is split into as many
+    sub-windows as the reported total suggests (or halves when no total is reported) and each
+    piece is handled the same way. Pieces too narrow to split fall back to an offset walk.
+
+    With `max_results`, sub-windows are settled in time order and only as many run ahead as the
+    remaining budget needs, so a truncated result is the same chronological prefix an offset
+    walk would return.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        params: QueryParams,
+        *,
+        page_limit: int = MAX_QUERY_LIMIT,
+        max_concurrency: int = 8,
+        max_results: Optional[int] = None,
+        max_fanout: int = DEFAULT_MAX_FANOUT,
+    ) -> None:
+        self._fetch_page = fetch_page
+        # Time bounds and paging are owned by the planner
+        self._params = {k: v for k, v in params.items() if k not in ("fromTimestamp", "toTimestamp", "limit", "offset")}
+        self._page_limit = page_limit
+        self._max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._max_results = max_results
+        self._max_fanout = max(2, max_fanout)
+        # Every page fetched, so a call cut short by the deadline still returns what arrived
+        self._fetched: List[List[Dict[str, object]]] = []
+        self._requests = 0
+        self._shards = 0
+        self._truncated = False
+
+    async def _fetch(self, start: datetime, end: datetime, offset: int = 0) -> Tuple[List[Dict[str, object]], Optional[int]]:
+        page_params: QueryParams = dict(self._params)
+        page_params["fromTimestamp"] = format_timestamp(start)
+        page_params["toTimestamp"] = format_timestamp(end)
+        page_params["limit"] = self._page_limit
+        page_params["offset"] = offset
+        async with self._semaphore:
+            data = await self._fetch_page(page_params)
+        self._requests += 1
+        page = extract_location_proofs_list(data)
+        self._fetched.append(page)
+        return page, pagination_total(extract_pagination(data))
+
+    async def _walk(self, start: datetime, end: datetime, offset: int, budget: Optional[int]) -> List[Dict[str, object]]:
+        rows: List[Dict[str, object]] = []
+        while budget is None or len(rows) < budget:
+            page, _ = await self._fetch(start, end, offset)
+            rows.extend(page)
+            if len(page) < self._page_limit:
+                return rows
+            offset += self._page_limit
+        self._truncated = True
+        return rows
+
+    async def _offset_pages(self, start: datetime, end: datetime, budget: int, total: Optional[int]) -> List[Dict[str, object]]:
+        """The `budget` proofs after the first page of [start, end], fetched as concurrent offset pages."""
+        offsets = range(self._page_limit, self._page_limit + budget, self._page_limit)
+        pages = await asyncio.gather(*(self._fetch(start, end, offset) for offset in offsets))
+        rows: List[Dict[str, object]] = []
+        for page, _ in pages:
+            rows.extend(page)
+            if len(page) < self._page_limit:
+                return rows
+        if total is None or total > self._page_limit + len(rows):
+            self._truncated = True
+        return rows
+
+    async def _shard(self, start: datetime, end: datetime, budget: Optional[int]) -> List[Dict[str, object]]:
+        """The earliest proofs in [start, end]: all of them, or at least `budget` when a budget is set."""
+        self._shards += 1
+        page, total = await self._fetch(start, end)
+        if len(page) < self._page_limit or (total is not None and total <= self._page_limit):
+            return page
+        if budget is not None and len(page) >= budget:
+            self._truncated = True
+            return page
+        if budget is not None and budget - len(page) <= self._page_limit * self._max_concurrency:
+            # The rest of the budget is a few pages deep: fetch those offsets at once instead of splitting
+            return page + await self._offset_pages(start, end, budget - len(page), total)
+
+        span = (end - start).total_seconds()
+        if span < 2 * MIN_SHARD_SECONDS:
+            walk_budget = None if budget is None else budget - len(page)
+            return page + await self._walk(start, end, self._page_limit, walk_budget)
+
+        parts = 2 if total is None else math.ceil(total / (self._page_limit * SHARD_FILL_FACTOR))
+        parts = max(2, min(parts, self._max_fanout, int(span // MIN_SHARD_SECONDS)))
+        windows = split_window(start, end, parts)
+        if budget is None:
+            batches = await asyncio.gather(*(self._shard(a, b, None) for a, b in windows))
+            return page + [att for batch in batches for att in batch]
+        # Sub-windows repeat the probe page, so it is not counted against the budget
+        return page + await self._settle_in_order(windows, budget, None if total is None else total / len(windows))
+
+    async def _settle_in_order(
+        self, windows: List[Tuple[datetime, datetime]], budget: int, expected_per_window: Optional[float]
+    ) -> List[Dict[str, object]]:
+        """Fetch `windows` oldest first until `budget` proofs are in hand, cancelling any later ones.
+
+        Later windows start early only while the expected size of those already running is below
+        the remaining budget; without an expected size they run one at a time.
+        """
+        rows: List[Dict[str, object]] = []
+        seen: Set[object] = set()
+        running: Deque["asyncio.Task[List[Dict[str, object]]]"] = deque()
+        remaining = budget
+        upcoming = iter(windows)
+        try:
+            while True:
+                ahead = 1 if not expected_per_window else math.ceil(remaining / expected_per_window)
+                while len(running) < min(max(1, ahead), self._max_concurrency):
+                    window = next(upcoming, None)
+                    if window is None:
+                        break
+                    running.append(asyncio.create_task(self._shard(window[0], window[1], remaining)))
+                if not running:
+                    return rows
+                for att in await running.popleft():
+                    uid = att.get("uid")
+                    if not isinstance(uid, str) or uid not in seen:
+                        seen.add(uid)
+                        rows.append(att)
+                        remaining -= 1
+                if remaining <= 0:
+                    if running or next(upcoming, None) is not None:
+                        self._truncated = True
+                    return rows
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def run(self, start: datetime, end: datetime) -> PlanResult:
+        """Retrieve all proofs in [start, end], merged by timestamp and deduplicated by uid.
+
+        At the current deadline, in-flight shards are cancelled and the proofs collected so far
+        are returned with `deadline_exceeded` set.
+        """
+        if end <= start:
+            raise ValueError("from_timestamp must be earlier than to_timestamp")
+        rows: List[Dict[str, object]] = []
+        async with until_deadline() as guard:
+            rows = await self._shard(start, end, self._max_results)
+
+        proofs = merge_attestations(self._fetched if guard.expired else [rows])
+        truncated = self._truncated or guard.expired
+        if self._max_results is not None and len(proofs) > self._max_results:
+            proofs = proofs[: self._max_results]
+            truncated = True
+        return PlanResult(
+            proofs=proofs,
+            requests=self._requests,
+            shards=self._shards,
+            truncated=truncated,
+            deadline_exceeded=guard.expired,
+        )
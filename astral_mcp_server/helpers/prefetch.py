@@ -0,0 +1,153 @@
+"""Speculative prefetch of the next result page into the query cache.
+
+After a page is returned with more results available, the next offset page is fetched in
+the background so the follow-up call can be served from memory. Prefetching is bounded by
+a global budget of outstanding unused pages and a concurrency cap; prefetches that are not
+consumed within `unused_ttl` seconds are cancelled or evicted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple, Union
+
+from .cache import TTLCache
+from .utils import canonical_params_key
+
+QueryParams = Dict[str, Union[str, int]]
+FetchPage = Callable[[QueryParams], Awaitable[object]]
+ParamsKey = Tuple[Tuple[str, str], ...]
+
+
+class Prefetcher:
+    """Background fetcher that fills a query cache with pages agents are likely to request next."""
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        *,
+        enabled: bool,
+        budget: int,
+        max_concurrency: int,
+        unused_ttl: float,
+    ) -> None:
+        self.enabled = enabled
+        self._fetch_page = fetch_page
+        self._budget = max(1, budget)
+        self._max_concurrency = max(1, max_concurrency)
+        self._unused_ttl = unused_ttl
+        self._cache: TTLCache[ParamsKey, object] = TTLCache(self._budget, unused_ttl)
+        self._inflight: Dict[ParamsKey, "asyncio.Task[object]"] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._consumed: Set[ParamsKey] = set()
+        self.scheduled = 0
+        self.completed = 0
+        self.hits = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.skipped_budget = 0
+
+    def _outstanding(self) -> int:
+        self._cache.purge()
+        return len(self._inflight) + len(self._cache)
+
+    def schedule(self, params: QueryParams) -> bool:
+        """Start fetching `params` in the background; returns False when disabled, duplicate or over budget."""
+        if not self.enabled:
+            return False
+        key = canonical_params_key(params)
+        if key in self._inflight or key in self._cache:
+            return False
+        if self._outstanding() >= self._budget:
+            self.skipped_budget += 1
+            return False
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._loop = loop
+        self.scheduled += 1
+        # A fresh context: the prefetch must not report into the scheduling call's timer or deadline
+        task = loop.create_task(self._run(key, dict(params)), context=contextvars.Context())
+        self._inflight[key] = task
+        task.add_done_callback(functools.partial(self._done, key))
+        return True
+
+    def _done(self, key: ParamsKey, task: "asyncio.Task[object]") -> None:
+        self._inflight.pop(key, None)
+        # Retrieve the outcome so failed prefetches are not reported as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(self, key: ParamsKey, params: QueryParams) -> object:
+        assert self._semaphore is not None
+        try:
+            async with self._semaphore:
+                # A prefetch still running after the unused window is abandoned
+                data = await asyncio.wait_for(self._fetch_page(params), timeout=self._unused_ttl)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self.cancelled += 1
+            raise asyncio.CancelledError()
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        if key not in self._consumed:
+            self._cache.set(key, data)
+        self._consumed.discard(key)
+        return data
+
+    async def take(self, params: QueryParams) -> Optional[object]:
+        """Return the prefetched response for `params` (waiting on an in-flight prefetch), or None."""
+        if not self.enabled:
+            return None
+        key = canonical_params_key(params)
+        data = self._cache.pop(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        task = self._inflight.get(key)
+        if task is None:
+            return None
+        # The page is being prefetched right now; joining it beats issuing a duplicate request
+        self._consumed.add(key)
+        try:
+            data = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            self._consumed.discard(key)
+            if not task.cancelled():
+                # The caller itself was cancelled, not the prefetch
+                raise
+            return None
+        except Exception:
+            self._consumed.discard(key)
+            return None
+        self.hits += 1
+        return data
+
+    def cancel_all(self) -> None:
+        """Cancel in-flight prefetches and drop unused prefetched pages."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, object]:
+        live = self._outstanding() - len(self._inflight)
+        wasted = max(0, self.completed - self.hits - live)
+        return {
+            "enabled": self.enabled,
+            "budget": self._budget,
+            "max_concurrency": self._max_concurrency,
+            "unused_ttl_seconds": self._unused_ttl,
+            "scheduled": self.scheduled,
+            "in_flight": len(self._inflight),
+            "completed": self.completed,
+            "hits": self.hits,
+            "unused_evicted": wasted,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "skipped_budget": self.skipped_budget,
+            "hit_ratio": round(self.hits / self.completed, 4) if self.completed else None,
+        }
@@ -0,0 +1,170 @@
+"""File-backed MCP prompts, parsed once and reloaded when the file changes.
+
+The prompts file (YAML or JSON) is located and parsed on the first list/get, not at import,
+so prompts add nothing to server start-up. Prompts are then indexed by name; later calls
+only `stat` the file and re-parse it when its mtime or size has changed. If a changed file
+fails to parse, the last good version keeps being served.
+
+File shape: a list of prompts or {"prompts": [...]}, each prompt being
+{name, description?, arguments?: [{name, description?, required?}], meta?, template?}.
+`template` is the message text, with `{argument}` placeholders; without one, the message
+asks for the tool of the same name to be called with the given arguments.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import string
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import mcp.types as types
+
+try:
+    import yaml  # type: ignore
+except Exception:
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+FileSignature = Tuple[Path, int, int]
+
+
+@dataclass
+class _PromptEntry:
+    prompt: types.Prompt
+    template: Optional[str] = None
+
+
+def parse_prompts(path: Path) -> Dict[str, _PromptEntry]:
+    """Parse a prompts file into prompt entries keyed by name.
+
+    Raises:
+        RuntimeError: If the file is YAML and pyyaml is not installed.
+        ValueError: If the file is not a list of prompts or {prompts: [...]}.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        if yaml is None:
+            raise RuntimeError("pyyaml is required to read YAML prompt files; install pyyaml or use JSON prompt file")
+        parsed = yaml.safe_load(text)
+    else:
+        parsed = json.loads(text)
+
+    if isinstance(parsed, dict) and "prompts" in parsed:
+        items = parsed["prompts"]
+    elif isinstance(parsed, list):
+        items = parsed
+    else:
+        raise ValueError("Unexpected prompts file format; expected list or {prompts: [...]}")
+
+    entries: Dict[str, _PromptEntry] = {}
+    for item in items or []:
+        if not isinstance(item, dict) or "name" not in item:
+            continue
+        args = [
+            types.PromptArgument(name=a["name"], description=a.get("description"), required=a.get("required"))
+            for a in item.get("arguments") or []
+            if isinstance(a, dict) and "name" in a
+        ]
+        prompt = types.Prompt(
+            name=item["name"],
+            description=item.get("description"),
+            arguments=args or None,
+            _meta=item.get("meta"),
+        )
+        entries[prompt.name] = _PromptEntry(prompt, item.get("template"))
+    return entries
+
+
+class PromptRegistry:
+    """Prompts from the first existing candidate file, indexed by name and reloaded on change."""
+
+    def __init__(self, candidates: Sequence[Path]) -> None:
+        self.candidates = list(candidates)
+        self._entries: Dict[str, _PromptEntry] = {}
+        self._signature: Optional[FileSignature] = None
+        self._listed: List[types.Prompt] = []
+        self.loads = 0
+        self.error: Optional[str] = None
+
+    def _current_file(self) -> Optional[FileSignature]:
+        # Once a file is known only it is checked; the candidates are searched again if it disappears
+        paths = [self._signature[0]] if self._signature is not None else []
+        for path in paths + self.candidates:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            return path, st.st_mtime_ns, st.st_size
+        return None
+
+    def _refresh(self) -> None:
+        signature = self._current_file()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        if signature is None:
+            self._entries, self._listed, self.error = {}, [], None
+            return
+        try:
+            entries = parse_prompts(signature[0])
+        except Exception as e:
+            # Includes yaml.YAMLError, which is not a ValueError
+            self.error = f"{type(e).__name__}: {e}"
+            logger.warning("Could not load prompts from %s (%s); serving the previous prompts", signature[0], self.error)
+            return
+        self._entries = entries
+        self._listed = [entry.prompt for entry in entries.values()]
+        self.error = None
+        self.loads += 1
+
+    def list(self) -> List[types.Prompt]:
+        self._refresh()
+        return self._listed
+
+    def get(self, name: str) -> Optional[types.Prompt]:
+        self._refresh()
+        entry = self._entries.get(name)
+        return entry.prompt if entry is not None else None
+
+    def render(self, name: str, arguments: Optional[Dict[str, str]] = None) -> types.GetPromptResult:
+        """Build the `prompts/get` result for `name` with the given arguments.
+
+        Raises:
+            ValueError: If the prompt is unknown or a required argument is missing.
+        """
+        self._refresh()
+        entry = self._entries.get(name)
+        if entry is None:
+            raise ValueError(f"Unknown prompt: {name}")
+        arguments = arguments or {}
+        declared = entry.prompt.arguments or []
+        missing = [a.name for a in declared if a.required and a.name not in arguments]
+        if missing:
+            raise ValueError(f"Missing required arguments for prompt {name}: {', '.join(missing)}")
+
+        if entry.template is not None:
+            values = {a.name: "" for a in declared}
+            values.update(arguments)
+            try:
+                text = string.Formatter().vformat(entry.template, (), values)
+            except (IndexError, KeyError) as e:
+                raise ValueError(f"Prompt {name} template references an undeclared argument: {e}") from e
+        else:
+            given = ", ".join(f"{k}={v}" for k, v in arguments.items() if v not in (None, ""))
+            text = f"Use the `{name}` tool" + (f" with {given}." if given else ".")
+        return types.GetPromptResult(
+            description=entry.prompt.description,
+            messages=[types.PromptMessage(role="user", content=types.TextContent(type="text", text=text))],
+        )
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "path": str(self._signature[0]) if self._signature is not None else None,
+            "prompts": len(self._entries),
+            "loads": self.loads,
+            "error": self.error,
+        }
@@ -0,0 +1,176 @@
+"""Vectorized spatial filtering over fetched attestations.
+
+Coordinates are pulled into numpy arrays once, then point-in-polygon and great-circle
+distance tests run over whole arrays rather than point by point, which keeps filtering
+tens of thousands of proofs fast.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .geojson import attestation_geometry
+
+EARTH_RADIUS_KM = 6371.0088
+
+BBox = Tuple[float, float, float, float]
+# A polygon is a list of rings (exterior first, then holes), each an (N, 2) lon/lat array
+Polygon = List[np.ndarray]
+
+
+def coordinate_arrays(atts: Sequence[Dict[str, object]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (lon, lat) float arrays for `atts`; items without a point geometry are NaN."""
+    lon = np.full(len(atts), np.nan)
+    lat = np.full(len(atts), np.nan)
+    for i, att in enumerate(atts):
+        geom = attestation_geometry(att)
+        if geom is not None:
+            lon[i], lat[i] = geom["coordinates"]  # type: ignore[misc]
+    return lon, lat
+
+
+def _ring(coords: object) -> np.ndarray:
+    ring = np.asarray(coords, dtype=float)
+    if ring.ndim != 2 or ring.shape[0] < 4 or ring.shape[1] < 2:
+        raise ValueError("polygon rings must contain at least four [lng, lat] positions")
+    ring = ring[:, :2]
+    if not np.array_equal(ring[0], ring[-1]):
+        raise ValueError("polygon rings must be closed (first and last positions equal)")
+    if np.any(np.abs(ring[:, 0]) > 180.0) or np.any(np.abs(ring[:, 1]) > 90.0):
+        raise ValueError("polygon coordinates must be valid [lng, lat] positions")
+    return ring
+
+
+def parse_polygons(geometry: Union[str, Dict[str, object]]) -> List[Polygon]:
+    """Parse a GeoJSON Polygon/MultiPolygon (bare, as a Feature, or as a JSON string) into polygons.
+
+    Raises:
+        ValueError: If the geometry is not a valid Polygon or MultiPolygon.
+    """
+    if isinstance(geometry, str):
+        try:
+            geometry = json.loads(geometry)
+        except ValueError:
+            raise ValueError("geometry string must be valid GeoJSON")
+    if not isinstance(geometry, dict):
+        raise ValueError("geometry must be a GeoJSON Polygon or MultiPolygon object")
+    if geometry.get("type") == "Feature":
+        inner = geometry.get("geometry")
+        if not isinstance(inner, dict):
+            raise ValueError("geometry Feature must contain a geometry object")
+        geometry = inner
+
+    gtype = geometry.get("type")
+    coords = geometry.get("coordinates")
+    if not isinstance(coords, list) or not coords:
+        raise ValueError("geometry must contain coordinates")
+    if gtype == "Polygon":
+        return [[_ring(r) for r in coords]]
+    if gtype == "MultiPolygon":
+        return [[_ring(r) for r in poly] for poly in coords]
+    raise ValueError("geometry type must be Polygon or MultiPolygon")
+
+
+def polygons_envelope(polygons: List[Polygon]) -> BBox:
+    """Return the bbox enclosing every exterior ring."""
+    exteriors = np.vstack([poly[0] for poly in polygons])
+    return (
+        float(exteriors[:, 0].min()),
+        float(exteriors[:, 1].min()),
+        float(exteriors[:, 0].max()),
+        float(exteriors[:, 1].max()),
+    )
+
+
+def points_in_polygons(lon: np.ndarray, lat: np.ndarray, polygons: List[Polygon]) -> np.ndarray:
+    """Boolean mask of points inside any polygon (even-odd rule, so holes are excluded).
+
+    Loops over polygon edges while testing all points of each edge at once.
+    """
+    inside_any = np.zeros(lon.shape, dtype=bool)
+    for poly in polygons:
+        inside = np.zeros(lon.shape, dtype=bool)
+        for ring in poly:
+            x0, y0 = ring[:-1, 0], ring[:-1, 1]
+            x1, y1 = ring[1:, 0], ring[1:, 1]
+            for ax, ay, bx, by in zip(x0, y0, x1, y1):
+                if ay == by:
+                    continue
+                crosses = (ay > lat) != (by > lat)
+                x_cross = ax + (lat - ay) * (bx - ax) / (by - ay)
+                inside ^= crosses & (lon < x_cross)
+        inside_any |= inside
+    return inside_any
+
+
+def haversine_km(lon: np.ndarray, lat: np.ndarray, lon0: float, lat0: float) -> np.ndarray:
+    """Great-circle distance in km from (lon0, lat0) to each point."""
+    lon_r, lat_r = np.radians(lon), np.radians(lat)
+    lon0_r, lat0_r = math.radians(lon0), math.radians(lat0)
+    a = np.sin((lat_r - lat0_r) / 2.0) ** 2 + math.cos(lat0_r) * np.cos(lat_r) * np.sin((lon_r - lon0_r) / 2.0) ** 2
+    dist: np.ndarray = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return dist
+
+
+def radius_envelope(lon0: float, lat0: float, radius_km: float) -> BBox:
+    """Return a bbox enclosing the circle of `radius_km` around (lon0, lat0).
+
+    The envelope is clamped to valid coordinates; circles reaching a pole or crossing the
+    antimeridian widen to the full longitude range.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat0 - dlat, lat0 + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return (-180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0))
+    dlon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat0)))))
+    min_lng, max_lng = lon0 - dlon, lon0 + dlon
+    if min_lng < -180.0 or max_lng > 180.0:
+        min_lng, max_lng = -180.0, 180.0
+    return (min_lng, min_lat, max_lng, max_lat)
+
+
+def parse_center(center: Union[str, Sequence[object]]) -> Tuple[float, float]:
+    """Parse a `[lng, lat]` list or "lng,lat" string into floats.
+
+    Raises:
+        ValueError: If the value is not two valid coordinates.
+    """
+    parts: Sequence[object]
+    if isinstance(center, str):
+        parts = [p.strip() for p in center.split(",") if p.strip() != ""]
+    elif isinstance(center, (list, tuple)):
+        parts = center
+    else:
+        raise ValueError("center must be a [lng, lat] list or a 'lng,lat' string")
+    try:
+        coords = [float(p) for p in parts]  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        raise ValueError("center must contain two numeric values: [lng, lat]")
+    if len(coords) != 2:
+        raise ValueError("center must contain two numeric values: [lng, lat]")
+    lon0, lat0 = coords
+    if not (-180.0 <= lon0 <= 180.0 and -90.0 <= lat0 <= 90.0):
+        raise ValueError("center must be a valid [lng, lat] position")
+    return lon0, lat0
+
+
+def filter_within_polygons(atts: List[Dict[str, object]], polygons: List[Polygon]) -> List[Dict[str, object]]:
+    """Keep attestations whose point lies inside any of `polygons`."""
+    lon, lat = coordinate_arrays(atts)
+    valid = ~np.isnan(lon)
+    mask = np.zeros(len(atts), dtype=bool)
+    mask[valid] = points_in_polygons(lon[valid], lat[valid], polygons)
+    return [atts[i] for i in np.flatnonzero(mask)]
+
+
+def filter_within_radius(atts: List[Dict[str, object]], lon0: float, lat0: float, radius_km: float) -> List[Dict[str, object]]:
+    """Keep attestations within `radius_km` of (lon0, lat0), annotated with `distance_km`."""
+    lon, lat = coordinate_arrays(atts)
+    dist = haversine_km(lon, lat, lon0, lat0)
+    # NaN distances (no geometry) compare False and are dropped
+    idx = np.flatnonzero(dist <= radius_km)
+    return [dict(atts[i], distance_km=round(float(dist[i]), 6)) for i in idx]
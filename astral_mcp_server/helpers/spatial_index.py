@@ -0,0 +1,289 @@
+"""In-memory spatial index over a fetched result set.
+
+Positions are mapped to 3D points on the unit sphere, where straight-line (chord) distance
+grows monotonically with great-circle distance, so a plain KD-tree answers geographic
+k-nearest-neighbour and radius queries exactly. `scipy.spatial.cKDTree` is used when scipy
+is installed; otherwise a numpy KD-tree with vectorized leaf scans is built.
+
+DBSCAN runs on top of the index: neighbour counts for every point come from one batched
+pass, and neighbourhoods are only materialized for core points while clusters expand.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import TTLCache
+from .spatial import EARTH_RADIUS_KM, coordinate_arrays
+
+try:
+    from scipy.spatial import cKDTree  # type: ignore
+except Exception:
+    cKDTree = None
+
+NOISE = -1
+
+
+def unit_vectors(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """(N, 3) unit-sphere positions for lon/lat arrays in degrees."""
+    lon_r, lat_r = np.radians(lon), np.radians(lat)
+    cos_lat = np.cos(lat_r)
+    return np.column_stack([cos_lat * np.cos(lon_r), cos_lat * np.sin(lon_r), np.sin(lat_r)])
+
+
+def km_to_chord(km: float) -> float:
+    return 2.0 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2.0)
+
+
+def chord_to_km(chord: np.ndarray) -> np.ndarray:
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+
+class NumpyKDTree:
+    """Static KD-tree split at the median of the widest dimension.
+
+    Leaves hold up to `leaf_size` points stored contiguously, so every leaf is scanned with
+    one vectorized distance computation; internal nodes keep bounding boxes for pruning.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 32) -> None:
+        self.leaf_size = max(1, leaf_size)
+        self.index = np.arange(len(points))
+        self._points = points
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._lo: List[np.ndarray] = []
+        self._hi: List[np.ndarray] = []
+        if len(points):
+            self._build(0, len(points))
+        self.data = points[self.index]
+        self.lo = np.array(self._lo).reshape(-1, points.shape[1])
+        self.hi = np.array(self._hi).reshape(-1, points.shape[1])
+        self.leaves = [n for n, left in enumerate(self._left) if left < 0]
+
+    def _build(self, start: int, end: int) -> int:
+        node = len(self._start)
+        pts = self._points[self.index[start:end]]
+        self._start.append(start)
+        self._end.append(end)
+        self._lo.append(pts.min(axis=0))
+        self._hi.append(pts.max(axis=0))
+        self._left.append(-1)
+        self._right.append(-1)
+        if end - start > self.leaf_size:
+            dim = int(np.argmax(self._hi[node] - self._lo[node]))
+            mid = (start + end) // 2
+            order = np.argpartition(pts[:, dim], mid - start)
+            self.index[start:end] = self.index[start:end][order]
+            self._left[node] = self._build(start, mid)
+            self._right[node] = self._build(mid, end)
+        return node
+
+    def _min_dist(self, node: int, q: np.ndarray) -> float:
+        gap = np.maximum(0.0, np.maximum(self.lo[node] - q, q - self.hi[node]))
+        return float(math.sqrt(gap @ gap))
+
+    def query(self, q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances and indices of the `k` nearest points to `q`, nearest first."""
+        best_d = np.empty(0)
+        best_i = np.empty(0, dtype=np.int64)
+        if not self._start:
+            return best_d, best_i
+        kth = math.inf
+        heap = [(0.0, 0)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > kth:
+                break
+            if self._left[node] < 0:
+                s, e = self._start[node], self._end[node]
+                dist = np.sqrt(((self.data[s:e] - q) ** 2).sum(axis=1))
+                best_d = np.concatenate([best_d, dist])
+                best_i = np.concatenate([best_i, np.arange(s, e)])
+                if len(best_d) > k:
+                    keep = np.argpartition(best_d, k - 1)[:k]
+                    best_d, best_i = best_d[keep], best_i[keep]
+                if len(best_d) == k:
+                    kth = float(best_d.max())
+                continue
+            for child in (self._left[node], self._right[node]):
+                cd = self._min_dist(child, q)
+                if cd <= kth:
+                    heapq.heappush(heap, (cd, child))
+        order = np.argsort(best_d, kind="stable")
+        return best_d[order], self.index[best_i[order]]
+
+    def query_ball_point(self, q: np.ndarray, r: float) -> np.ndarray:
+        """Indices of all points within distance `r` of `q`."""
+        found: List[np.ndarray] = []
+        stack = [0] if self._start else []
+        while stack:
+            node = stack.pop()
+            if self._min_dist(node, q) > r:
+                continue
+            if self._left[node] < 0:
+                s, e = self._start[node], self._end[node]
+                dist = np.sqrt(((self.data[s:e] - q) ** 2).sum(axis=1))
+                found.append(np.flatnonzero(dist <= r) + s)
+            else:
+                stack.append(self._left[node])
+                stack.append(self._right[node])
+        return self.index[np.concatenate(found)] if found else np.empty(0, dtype=np.int64)
+
+    def count_neighbors_all(self, r: float) -> np.ndarray:
+        """For every point, the number of points (itself included) within distance `r`.
+
+        Works leaf by leaf: candidate leaves are found by box-to-box pruning, then the
+        leaf-by-candidates distance matrix is computed in one step.
+        """
+        counts = np.zeros(len(self.data), dtype=np.int64)
+        for leaf in self.leaves:
+            lo, hi = self.lo[leaf], self.hi[leaf]
+            candidates: List[np.ndarray] = []
+            stack = [0]
+            while stack:
+                node = stack.pop()
+                gap = np.maximum(0.0, np.maximum(self.lo[node] - hi, lo - self.hi[node]))
+                if gap @ gap > r * r:
+                    continue
+                if self._left[node] < 0:
+                    candidates.append(self.data[self._start[node] : self._end[node]])
+                else:
+                    stack.append(self._left[node])
+                    stack.append(self._right[node])
+            s, e = self._start[leaf], self._end[leaf]
+            others = np.concatenate(candidates)
+            d2 = ((self.data[s:e, None, :] - others[None, :, :]) ** 2).sum(axis=2)
+            counts[s:e] = (d2 <= r * r).sum(axis=1)
+        out = np.empty_like(counts)
+        out[self.index] = counts
+        return out
+
+
+class SpatialIndex:
+    """KD-tree over the positions of a list of attestations.
+
+    Attestations without a point geometry are left out; results refer to `self.atts`.
+    """
+
+    def __init__(self, atts: Sequence[Dict[str, object]], leaf_size: int = 32, plan: Optional[Dict[str, object]] = None) -> None:
+        lon, lat = coordinate_arrays(atts)
+        # Stats of the retrieval the result set came from, reported with every query
+        self.plan = plan
+        valid = np.flatnonzero(~np.isnan(lon))
+        self.atts: List[Dict[str, object]] = [atts[i] for i in valid.tolist()]
+        self.skipped = len(atts) - len(valid)
+        self.points = unit_vectors(lon[valid], lat[valid])
+        if cKDTree is not None:
+            self.backend = "scipy"
+            self._tree = cKDTree(self.points, leafsize=leaf_size)
+        else:
+            self.backend = "numpy"
+            self._tree = NumpyKDTree(self.points, leaf_size=leaf_size)
+
+    def __len__(self) -> int:
+        return len(self.atts)
+
+    def nearest(self, lon: float, lat: float, k: int, radius_km: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Up to `k` (index, distance_km) pairs nearest to (lon, lat), optionally within `radius_km`."""
+        k = min(k, len(self.atts))
+        if k <= 0:
+            return []
+        q = unit_vectors(np.array([lon]), np.array([lat]))[0]
+        if self.backend == "scipy":
+            dist, idx = self._tree.query(q, k=k)
+            dist, idx = np.atleast_1d(dist), np.atleast_1d(idx)
+        else:
+            dist, idx = self._tree.query(q, k)
+        km = chord_to_km(dist)
+        if radius_km is not None:
+            inside = km <= radius_km
+            km, idx = km[inside], idx[inside]
+        return list(zip(idx.tolist(), km.tolist()))
+
+    def within(self, lon: float, lat: float, radius_km: float) -> List[Tuple[int, float]]:
+        """All (index, distance_km) pairs within `radius_km` of (lon, lat), nearest first."""
+        q = unit_vectors(np.array([lon]), np.array([lat]))[0]
+        idx = np.asarray(self._tree.query_ball_point(q, km_to_chord(radius_km)), dtype=np.int64)
+        km = chord_to_km(np.sqrt(((self.points[idx] - q) ** 2).sum(axis=1)))
+        order = np.argsort(km, kind="stable")
+        return list(zip(idx[order].tolist(), km[order].tolist()))
+
+    def dbscan(self, eps_km: float, min_samples: int) -> np.ndarray:
+        """DBSCAN cluster label per point (NOISE for noise), with clusters numbered from 0."""
+        n = len(self.atts)
+        labels = np.full(n, NOISE, dtype=np.int64)
+        if n == 0:
+            return labels
+        r = km_to_chord(eps_km)
+        if self.backend == "scipy":
+            counts = np.asarray(self._tree.query_ball_point(self.points, r, return_length=True))
+        else:
+            counts = self._tree.count_neighbors_all(r)
+        core = counts >= min_samples
+
+        cluster = 0
+        for seed in np.flatnonzero(core).tolist():
+            if labels[seed] != NOISE:
+                continue
+            labels[seed] = cluster
+            queue = deque([seed])
+            while queue:
+                p = queue.popleft()
+                neighbours = np.asarray(self._tree.query_ball_point(self.points[p], r), dtype=np.int64)
+                fresh = neighbours[labels[neighbours] == NOISE]
+                labels[fresh] = cluster
+                # Only core points extend the cluster; border points just join it
+                queue.extend(fresh[core[fresh]].tolist())
+            cluster += 1
+        return labels
+
+    def cluster_summaries(self, labels: np.ndarray, max_uids: int) -> List[Dict[str, object]]:
+        """Per-cluster size, centroid, bbox and member UIDs (up to `max_uids`), largest first."""
+        summaries: List[Dict[str, object]] = []
+        for label in np.unique(labels[labels != NOISE]).tolist():
+            members = np.flatnonzero(labels == label)
+            centre = self.points[members].mean(axis=0)
+            lon = np.degrees(np.arctan2(self.points[members, 1], self.points[members, 0]))
+            lat = np.degrees(np.arcsin(np.clip(self.points[members, 2], -1.0, 1.0)))
+            summaries.append(
+                {
+                    "cluster": label,
+                    "size": int(members.size),
+                    "centroid": [
+                        round(math.degrees(math.atan2(centre[1], centre[0])), 6),
+                        round(math.degrees(math.atan2(centre[2], math.hypot(centre[0], centre[1]))), 6),
+                    ],
+                    "bbox": [float(lon.min()), float(lat.min()), float(lon.max()), float(lat.max())],
+                    "uids": [self.atts[i].get("uid") for i in members[:max_uids].tolist()],
+                }
+            )
+        summaries.sort(key=lambda c: -c["size"])  # type: ignore[operator]
+        return summaries
+
+
+class SpatialIndexStore:
+    """TTL-evicted spatial indexes keyed by (session, filter set)."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._indexes: TTLCache[Tuple[Hashable, Hashable], SpatialIndex] = TTLCache(maxsize, ttl)
+        self.builds = 0
+
+    def get(self, session_key: Hashable, filters_key: Hashable) -> Optional[SpatialIndex]:
+        return self._indexes.get((session_key, filters_key))
+
+    def put(self, session_key: Hashable, filters_key: Hashable, index: SpatialIndex) -> None:
+        self._indexes.set((session_key, filters_key), index)
+        self.builds += 1
+
+    def stats(self) -> Dict[str, object]:
+        stats = self._indexes.stats()
+        stats.update({"built": self.builds, "backend": "scipy" if cKDTree is not None else "numpy"})
+        return stats
@@ -0,0 +1,253 @@
+"""Saved filter sets exposed as subscribable resources.
+
+Each distinct filter set maps to one watch with one shared background poller. The poller
+tracks a timestamp watermark and notifies every subscriber only when new proofs arrive, so a
+single upstream poll serves any number of subscribed clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Union
+
+from .planner import format_timestamp, merge_attestations, offset_walk, parse_timestamp
+from .utils import canonical_params_key
+
+QueryParams = Dict[str, Union[str, int]]
+FetchPage = Callable[[QueryParams], Awaitable[object]]
+Notify = Callable[[object, str], Awaitable[None]]
+
+WATCH_URI_PREFIX = "astral://watch/"
+
+logger = logging.getLogger(__name__)
+
+
+def watch_uri(watch_id: str) -> str:
+    return f"{WATCH_URI_PREFIX}{watch_id}"
+
+
+@dataclass
+class Watch:
+    """A saved filter set with its watermark, recent arrivals and subscribers."""
+
+    watch_id: str
+    filters: QueryParams
+    started_from: datetime
+    watermark: datetime
+    # uids already seen at exactly the watermark timestamp (the upstream filter is inclusive)
+    seen_at_watermark: Set[str] = field(default_factory=set)
+    recent: Deque[Dict[str, object]] = field(default_factory=deque)
+    last_batch: List[Dict[str, object]] = field(default_factory=list)
+    subscribers: Set[Hashable] = field(default_factory=set)
+    polls: int = 0
+    updates: int = 0
+    last_polled_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    task: Optional["asyncio.Task[None]"] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class WatchRegistry:
+    """Registry of watches keyed by their filter set, each polled by at most one background task."""
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        notify: Notify,
+        *,
+        interval: float,
+        max_watches: int,
+        recent_limit: int = 100,
+        max_results_per_poll: int = 1000,
+        max_catch_up: int = 10000,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self._notify = notify
+        self._interval = interval
+        self._max_watches = max_watches
+        self._recent_limit = recent_limit
+        self._max_results_per_poll = max_results_per_poll
+        self._max_catch_up = max_catch_up
+        self._watches: Dict[str, Watch] = {}
+
+    @staticmethod
+    def watch_id_for(filters: QueryParams) -> str:
+        key = repr(canonical_params_key(filters, exclude=("fromTimestamp", "limit", "offset")))
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    def register(self, filters: QueryParams) -> Watch:
+        """Return the watch for `filters`, creating it if this filter set is new.
+
+        The watermark starts at `fromTimestamp` when given, otherwise at the current time. An
+        existing watch keeps its own watermark, so it only accepts the `fromTimestamp` it was
+        created with.
+
+        Raises:
+            ValueError: If the registry is full, or `fromTimestamp` differs from an existing watch's.
+        """
+        watch_id = self.watch_id_for(filters)
+        start = parse_timestamp(filters.get("fromTimestamp"))
+        existing = self._watches.get(watch_id)
+        if existing is not None:
+            if start is not None and start != existing.started_from:
+                raise ValueError(
+                    f"a watch for these filters already exists from {format_timestamp(existing.started_from)}; "
+                    "omit from_timestamp to share it"
+                )
+            return existing
+        if len(self._watches) >= self._max_watches:
+            # Reclaim watches nobody is subscribed to before refusing; a watch created within the last
+            # poll interval has probably just been handed to a client that has not subscribed yet
+            cutoff = time.monotonic() - self._interval
+            for wid in [w.watch_id for w in self._watches.values() if not w.subscribers and w.created_at < cutoff]:
+                del self._watches[wid]
+            if len(self._watches) >= self._max_watches:
+                raise ValueError(f"too many active watches (max {self._max_watches})")
+        base = {k: v for k, v in filters.items() if k not in ("fromTimestamp", "limit", "offset")}
+        start = start or datetime.now(timezone.utc)
+        watch = Watch(
+            watch_id=watch_id, filters=base, started_from=start, watermark=start, recent=deque(maxlen=self._recent_limit)
+        )
+        self._watches[watch_id] = watch
+        return watch
+
+    def get(self, watch_id: str) -> Optional[Watch]:
+        return self._watches.get(watch_id)
+
+    def subscribe(self, watch_id: str, subscriber: Hashable) -> Watch:
+        """Add `subscriber` to a watch and start its poller if needed.
+
+        Raises:
+            KeyError: If the watch does not exist.
+        """
+        watch = self._watches[watch_id]
+        watch.subscribers.add(subscriber)
+        if watch.task is None or watch.task.done():
+            # A fresh context: the poller outlives the call that started it, including its timer
+            watch.task = asyncio.get_running_loop().create_task(self._poll_loop(watch), context=contextvars.Context())
+        return watch
+
+    def unsubscribe(self, watch_id: str, subscriber: Hashable) -> None:
+        """Remove `subscriber`; the poller stops once a watch has no subscribers."""
+        watch = self._watches.get(watch_id)
+        if watch is None:
+            return
+        watch.subscribers.discard(subscriber)
+        if not watch.subscribers and watch.task is not None:
+            watch.task.cancel()
+            watch.task = None
+
+    def unsubscribe_all(self, subscriber: Hashable) -> None:
+        for watch_id in list(self._watches):
+            self.unsubscribe(watch_id, subscriber)
+
+    async def _poll_loop(self, watch: Watch) -> None:
+        while watch.subscribers:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.poll_once(watch.watch_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                watch.last_error = f"{type(exc).__name__}: {exc!s}"
+                logger.warning("Watch %s poll failed: %s", watch.watch_id, watch.last_error)
+
+    @staticmethod
+    def _advance(watch: Watch, proofs: List[Dict[str, object]]) -> List[Dict[str, object]]:
+        """Move the watermark past `proofs`, returning those not seen before in timestamp order."""
+        new: List[Dict[str, object]] = []
+        for att in merge_attestations([proofs]):
+            ts = parse_timestamp(att.get("timestamp"))
+            uid = att.get("uid")
+            if ts is None or ts < watch.watermark:
+                continue
+            if ts == watch.watermark and uid in watch.seen_at_watermark:
+                continue
+            new.append(att)
+            if ts > watch.watermark:
+                watch.watermark = ts
+                watch.seen_at_watermark = set()
+            if isinstance(uid, str):
+                watch.seen_at_watermark.add(uid)
+        return new
+
+    async def poll_once(self, watch_id: str) -> List[Dict[str, object]]:
+        """Poll upstream once for proofs at or after the watermark and notify subscribers of new ones.
+
+        Reads in chunks of `max_results_per_poll`, moving the watermark past each chunk, until
+        caught up or `max_catch_up` proofs have been read; the next poll resumes from there.
+        """
+        watch = self._watches[watch_id]
+        new: List[Dict[str, object]] = []
+        read = 0
+        deadline_exceeded = False
+        while read < self._max_catch_up:
+            params: QueryParams = dict(watch.filters)
+            params["fromTimestamp"] = format_timestamp(watch.watermark)
+            chunk = min(self._max_results_per_poll, self._max_catch_up - read)
+            plan = await offset_walk(self._fetch_page, params, max_results=chunk)
+            deadline_exceeded = plan.deadline_exceeded
+            read += len(plan.proofs)
+            # Upstream returns proofs oldest first, so a chunk is everything up to its newest timestamp
+            # apart from ties at that timestamp, which the inclusive filter returns again next chunk
+            fresh = self._advance(watch, plan.proofs)
+            new.extend(fresh)
+            if not plan.truncated or deadline_exceeded or not fresh:
+                break
+        watch.polls += 1
+        watch.last_polled_at = datetime.now(timezone.utc)
+        watch.last_error = "poll stopped at its deadline; resuming from the watermark" if deadline_exceeded else None
+        if read >= self._max_catch_up:
+            logger.info("Watch %s read %s proofs this poll; catching up from the watermark next poll", watch_id, read)
+        if not new:
+            return new
+
+        watch.recent.extend(new)
+        watch.last_batch = new
+        watch.updates += 1
+
+        uri = watch_uri(watch_id)
+        for subscriber in list(watch.subscribers):
+            try:
+                await self._notify(subscriber, uri)
+            except Exception as exc:
+                # A subscriber that can no longer be reached is dropped
+                logger.info("Dropping unreachable subscriber of %s: %s", uri, exc)
+                watch.subscribers.discard(subscriber)
+        return new
+
+    def snapshot(self, watch_id: str) -> Dict[str, object]:
+        """Resource contents for a watch: its filters, watermark and newly arrived proofs.
+
+        Raises:
+            KeyError: If the watch does not exist.
+        """
+        watch = self._watches[watch_id]
+        return {
+            "watch_id": watch.watch_id,
+            "resource_uri": watch_uri(watch.watch_id),
+            "filters": watch.filters,
+            "watermark": format_timestamp(watch.watermark),
+            "subscribers": len(watch.subscribers),
+            "polls": watch.polls,
+            "updates": watch.updates,
+            "last_polled_at": format_timestamp(watch.last_polled_at) if watch.last_polled_at else None,
+            "last_error": watch.last_error,
+            "new_proofs": watch.last_batch,
+            "recent_proofs": list(watch.recent),
+        }
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "watches": len(self._watches),
+            "active_pollers": sum(1 for w in self._watches.values() if w.task is not None and not w.task.done()),
+            "subscribers": sum(len(w.subscribers) for w in self._watches.values()),
+            "poll_interval_seconds": self._interval,
+        }
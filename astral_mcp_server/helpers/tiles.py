@@ -0,0 +1,159 @@
+"""Tile-aligned bbox result cache.
+
+Requested bboxes are covered by fixed-zoom web-mercator (slippy map) tiles. Each tile is
+fetched and cached once per filter combination, then the tiles are assembled and clipped
+back to the exact bbox locally, so panning and zooming mostly hits memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import Awaitable, Callable, Dict, Hashable, List, Tuple
+
+from .cache import TTLCache
+from .geojson import attestation_to_feature
+from .planner import merge_attestations
+
+BBox = Tuple[float, float, float, float]
+TileKey = Tuple[int, int, int]
+TileEntryKey = Tuple[Hashable, TileKey]
+# (proofs, complete): every proof in the tile, or only its first rows when not complete
+TileEntry = Tuple[List[Dict[str, object]], bool]
+# Fetches the proofs inside a tile bbox, at least the given number of rows or all of them
+FetchTile = Callable[[BBox, int], Awaitable[TileEntry]]
+
+# Latitude limit of the web-mercator projection
+MAX_MERCATOR_LAT = 85.0511287798066
+
+
+def lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    """Return the (x, y) slippy-map tile containing lon/lat at `zoom`."""
+    n = 1 << zoom
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x: int, y: int, zoom: int) -> BBox:
+    """Return the (minLng, minLat, maxLng, maxLat) bounds of a tile.
+
+    Edge rows are stretched to the poles so points beyond the mercator limit are not lost.
+    """
+    n = 1 << zoom
+
+    def lat_of(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1.0 - 2.0 * row / n))))
+
+    min_lng = x / n * 360.0 - 180.0
+    max_lng = (x + 1) / n * 360.0 - 180.0
+    max_lat = 90.0 if y == 0 else lat_of(y)
+    min_lat = -90.0 if y == n - 1 else lat_of(y + 1)
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def tiles_for_bbox(bbox: BBox, zoom: int) -> List[Tuple[int, int]]:
+    """Return every tile at `zoom` intersecting `bbox`."""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    x0, y0 = lonlat_to_tile(min_lng, max_lat, zoom)
+    x1, y1 = lonlat_to_tile(max_lng, min_lat, zoom)
+    return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+
+def _retrieve_exception(task: "asyncio.Task[TileEntry]") -> None:
+    # A fetch whose callers all went away must not be reported as an unretrieved exception
+    if not task.cancelled():
+        task.exception()
+
+
+def clip_to_bbox(atts: List[Dict[str, object]], bbox: BBox) -> List[Dict[str, object]]:
+    """Keep attestations whose point geometry lies inside `bbox` (edges inclusive)."""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    kept: List[Dict[str, object]] = []
+    for att in atts:
+        feature = attestation_to_feature(att)
+        if feature is None:
+            continue
+        lon, lat = feature["geometry"]["coordinates"]  # type: ignore[index]
+        if min_lng <= lon <= max_lng and min_lat <= lat <= max_lat:
+            kept.append(att)
+    return kept
+
+
+class TileCache:
+    """Cache of per-tile result sets keyed by (filter combination, zoom, x, y).
+
+    A tile fetched for a small page holds only its first `rows` proofs and is marked incomplete;
+    it serves later queries needing no more rows than it holds, and is refetched for larger ones.
+    """
+
+    def __init__(self, zoom: int, maxsize: int, ttl: float) -> None:
+        self.zoom = zoom
+        self._entries: TTLCache[TileEntryKey, TileEntry] = TTLCache(maxsize, ttl)
+        # Fetches in progress, with the row count each was asked for
+        self._inflight: Dict[TileEntryKey, Tuple["asyncio.Task[TileEntry]", int]] = {}
+
+    def tile_count(self, bbox: BBox) -> int:
+        return len(tiles_for_bbox(bbox, self.zoom))
+
+    async def _fill(self, key: TileEntryKey, rows: int, fetch_tile: FetchTile) -> TileEntry:
+        tile = key[1]
+        try:
+            proofs, complete = await fetch_tile(tile_bounds(tile[1], tile[2], tile[0]), rows)
+            # A tile cut short of `rows` (by the deadline) is served once but not cached
+            if complete or len(proofs) >= rows:
+                self._entries.set(key, (proofs, complete))
+            return proofs, complete
+        finally:
+            current = self._inflight.get(key)
+            if current is not None and current[0] is asyncio.current_task():
+                del self._inflight[key]
+
+    async def _tile(
+        self, filters_key: Hashable, tile: TileKey, fetch_tile: FetchTile, rows: int
+    ) -> Tuple[List[Dict[str, object]], bool, bool]:
+        key = (filters_key, tile)
+        cached = self._entries.get(key)
+        if cached is not None and (cached[1] or len(cached[0]) >= rows):
+            return cached[0], cached[1], True
+
+        # Share a fetch already running for the same tile (and enough rows) instead of issuing a duplicate
+        pending = self._inflight.get(key)
+        if pending is not None and pending[1] >= rows:
+            proofs, complete = await asyncio.shield(pending[0])
+            return proofs, complete, True
+
+        # The fetch is owned by the cache, so a caller that goes away does not cancel it for the others
+        task = asyncio.ensure_future(self._fill(key, rows, fetch_tile))
+        task.add_done_callback(_retrieve_exception)
+        self._inflight[key] = (task, rows)
+        proofs, complete = await asyncio.shield(task)
+        return proofs, complete, False
+
+    async def query(
+        self, filters_key: Hashable, bbox: BBox, fetch_tile: FetchTile, rows: int
+    ) -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+        """Assemble the proofs inside `bbox` from cached or freshly fetched tiles.
+
+        Each tile contributes all its proofs, or at least its first `rows`.
+
+        Returns:
+            (proofs clipped to bbox and ordered by timestamp, tile statistics)
+        """
+        tiles = [(self.zoom, x, y) for x, y in tiles_for_bbox(bbox, self.zoom)]
+        outcomes = await asyncio.gather(*(self._tile(filters_key, t, fetch_tile, rows) for t in tiles))
+        hits = sum(1 for _, _, hit in outcomes if hit)
+        proofs = clip_to_bbox(merge_attestations(p for p, _, _ in outcomes), bbox)
+        stats: Dict[str, object] = {
+            "zoom": self.zoom,
+            "tiles": len(tiles),
+            "tile_hits": hits,
+            "tile_misses": len(tiles) - hits,
+            "complete": all(complete for _, complete, _ in outcomes),
+        }
+        return proofs, stats
+
+    def stats(self) -> Dict[str, object]:
+        return dict(self._entries.stats(), zoom=self.zoom)
@@ -0,0 +1,192 @@
+"""Per-call phase timing for tool invocations.
+
+A `RequestTimer` is bound to the running tool call through a context variable, so code deep
+in the call (page fetches, extraction, GeoJSON building, concurrent shard tasks) records
+spans without threading the timer through every signature. HTTP phases come from httpx's
+`trace` request extension: queue wait before a connection is available, TCP connect, TLS,
+time to first byte and body download.
+
+When several upstream requests run in one call, their phase durations are summed, so phase
+totals can exceed the wall-clock `total_ms`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import queue
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Phases reported in the `timings` section, in pipeline order
+TIMING_PHASES = (
+    "queue_wait",
+    "connect",
+    "tls",
+    "ttfb",
+    "download",
+    "decode",
+    "extract",
+    "feature_collection",
+)
+
+# httpcore trace event (without the http11./http2. prefix) -> (phase, is_start)
+_TRACE_EVENTS: Dict[str, Tuple[str, bool]] = {
+    "connect_tcp.started": ("connect", True),
+    "connect_tcp.complete": ("connect", False),
+    "start_tls.started": ("tls", True),
+    "start_tls.complete": ("tls", False),
+    "send_request_headers.started": ("ttfb", True),
+    "receive_response_headers.complete": ("ttfb", False),
+    "receive_response_body.started": ("download", True),
+    "receive_response_body.complete": ("download", False),
+}
+
+_current: ContextVar[Optional["RequestTimer"]] = ContextVar("astral_request_timer", default=None)
+
+
+class RequestTimer:
+    """Collects named spans for a single tool call."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.name = name
+        self._clock = clock
+        self.started = clock()
+        self.started_at = datetime.now(timezone.utc)
+        self.finished: Optional[float] = None
+        self.http_requests = 0
+        # (name, start offset seconds, duration seconds)
+        self.spans: List[Tuple[str, float, float]] = []
+
+    def add(self, name: str, start: float, end: float) -> None:
+        self.spans.append((name, start - self.started, max(0.0, end - start)))
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add(name, start, self._clock())
+
+    def http_trace(self) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """Return an httpx `trace` extension callback for one request."""
+        self.http_requests += 1
+        requested = self._clock()
+        opened: Dict[str, float] = {}
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            now = self._clock()
+            name = event.split(".", 1)[1] if "." in event else event
+            if "queue_wait" not in opened:
+                # The first transport event marks the end of waiting for a pooled connection
+                opened["queue_wait"] = requested
+                self.add("queue_wait", requested, now)
+            phase = _TRACE_EVENTS.get(name)
+            if phase is None:
+                return
+            phase_name, is_start = phase
+            if is_start:
+                opened[phase_name] = now
+            elif phase_name in opened:
+                self.add(phase_name, opened.pop(phase_name), now)
+
+        return trace
+
+    def finish(self) -> None:
+        if self.finished is None:
+            self.finished = self._clock()
+
+    def summary(self) -> Dict[str, object]:
+        """Phase totals in milliseconds plus the call's wall-clock total."""
+        self.finish()
+        totals = {phase: 0.0 for phase in TIMING_PHASES}
+        for name, _, duration in self.spans:
+            if name in totals:
+                totals[name] += duration
+        result: Dict[str, object] = {f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in totals.items()}
+        result["total_ms"] = round((self.finished - self.started) * 1000, 3)  # type: ignore[operator]
+        result["http_requests"] = self.http_requests
+        return result
+
+    def trace_record(self) -> Dict[str, object]:
+        """All spans of the call, relative to its start, for the trace file."""
+        self.finish()
+        return {
+            "tool": self.name,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round((self.finished - self.started) * 1000, 3),  # type: ignore[operator]
+            "spans": [
+                {"name": name, "start_ms": round(offset * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, offset, duration in self.spans
+            ],
+        }
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+@contextmanager
+def activate_timer(timer: Optional[RequestTimer]) -> Iterator[Optional[RequestTimer]]:
+    """Bind `timer` to the current context for the duration of the block."""
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed_span(name: str) -> Iterator[None]:
+    """Record a span on the active timer; a no-op when the call is not being timed."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
+
+
+def http_trace_extensions() -> Dict[str, object]:
+    """httpx request `extensions` that report HTTP phases to the active timer, if any."""
+    timer = _current.get()
+    return {} if timer is None else {"trace": timer.http_trace()}
+
+
+class _JSONLine:
+    """Defers JSON serialization to the trace writer thread."""
+
+    def __init__(self, payload: Dict[str, object]) -> None:
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return json.dumps(self.payload, separators=(",", ":"))
+
+
+class TraceWriter:
+    """Appends one JSON line per timed call to a local file from a background thread."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        handler = logging.FileHandler(path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._listener = logging.handlers.QueueListener(self._queue, handler)  # type: ignore[arg-type]
+        self._listener.start()
+
+    def write(self, timer: RequestTimer) -> None:
+        self._queue.put_nowait(logging.makeLogRecord({"msg": "%s", "args": (_JSONLine(timer.trace_record()),)}))
+
+    def close(self) -> None:
+        """Flush pending lines and stop the writer thread."""
+        if getattr(self._listener, "_thread", None) is not None:
+            self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
@@ -0,0 +1,137 @@
+"""Movement analysis over one subject's location proofs.
+
+Proofs are ordered by timestamp and consecutive positions form segments. Per-segment
+distance (haversine), elapsed time and implied speed are computed over whole numpy arrays,
+so tens of thousands of points cost a handful of vector operations. Segments whose implied
+speed is physically implausible are flagged as impossible travel.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .planner import parse_timestamp
+from .spatial import EARTH_RADIUS_KM, coordinate_arrays
+
+
+def timestamp_array(atts: Sequence[Dict[str, object]]) -> np.ndarray:
+    """Unix epoch seconds for each attestation's `timestamp`; unparseable values are NaN."""
+    out = np.full(len(atts), np.nan)
+    for i, att in enumerate(atts):
+        dt = parse_timestamp(att.get("timestamp"))
+        if dt is not None:
+            out[i] = dt.timestamp()
+    return out
+
+
+def segment_distances_km(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km between each pair of consecutive points (length N-1)."""
+    lon_r, lat_r = np.radians(lon), np.radians(lat)
+    dlat = np.diff(lat_r)
+    dlon = np.diff(lon_r)
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat_r[:-1]) * np.cos(lat_r[1:]) * np.sin(dlon / 2.0) ** 2
+    dist: np.ndarray = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return dist
+
+
+def _speed(value: Optional[float]) -> object:
+    """A speed for JSON output: rounded, "inf" for zero elapsed time, None when undefined."""
+    if value is None:
+        return None
+    return round(value, 3) if np.isfinite(value) else "inf"
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def analyze_trajectory(
+    atts: Sequence[Dict[str, object]],
+    *,
+    max_speed_kmh: float,
+    min_jump_km: float = 0.0,
+    precision: Optional[int] = 6,
+    max_flags: int = 100,
+) -> Dict[str, object]:
+    """Order `atts` by time and summarize the movement they describe.
+
+    Args:
+        atts: Attestations of one subject (any order).
+        max_speed_kmh: Segments faster than this are flagged as impossible travel.
+        min_jump_km: Segments shorter than this are never flagged, so position jitter between
+            near-simultaneous proofs does not count as travel.
+        precision: Decimal places kept in the LineString coordinates (None keeps full precision).
+        max_flags: Maximum flagged segments listed; `stats.impossible_jumps` counts them all.
+
+    Returns:
+        {"geometry": GeoJSON LineString (or Point/None for fewer than two positions),
+         "stats": summary statistics, "impossible_travel": flagged segments}
+    """
+    lon, lat = coordinate_arrays(atts)
+    ts = timestamp_array(atts)
+    valid = np.flatnonzero(~(np.isnan(lon) | np.isnan(ts)))
+    order = valid[np.argsort(ts[valid], kind="stable")]
+    lon, lat, ts = lon[order], lat[order], ts[order]
+    n = len(order)
+
+    stats: Dict[str, object] = {"points": n, "skipped": len(atts) - n}
+    if n == 0:
+        stats.update({"segments": 0, "impossible_jumps": 0})
+        return {"geometry": None, "stats": stats, "impossible_travel": []}
+
+    dist = segment_distances_km(lon, lat)
+    elapsed = np.diff(ts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Movement with no elapsed time is infinitely fast; standing still is not movement
+        speed = np.where(elapsed > 0, dist / (elapsed / 3600.0), np.where(dist > 0, np.inf, 0.0))
+    flagged = np.flatnonzero((speed > max_speed_kmh) & (dist >= min_jump_km))
+
+    duration = float(ts[-1] - ts[0])
+    total = float(dist.sum())
+    moving = speed[np.isfinite(speed)]
+    stats.update(
+        {
+            "segments": n - 1,
+            "start": _iso(ts[0]),
+            "end": _iso(ts[-1]),
+            "duration_s": round(duration, 3),
+            "total_distance_km": round(total, 6),
+            "displacement_km": round(float(segment_distances_km(lon[[0, -1]], lat[[0, -1]])[0]), 6),
+            "mean_speed_kmh": _speed(total / (duration / 3600.0) if duration > 0 else None),
+            "median_segment_speed_kmh": _speed(float(np.median(moving)) if moving.size else None),
+            "max_segment_speed_kmh": _speed(float(speed.max()) if speed.size else None),
+            "bbox": [float(lon.min()), float(lat.min()), float(lon.max()), float(lat.max())],
+            "impossible_jumps": int(flagged.size),
+        }
+    )
+
+    coords = np.column_stack([lon, lat])
+    if precision is not None:
+        coords = np.round(coords, precision)
+    # Consecutive repeats of the same position add nothing to the line
+    keep = np.ones(n, dtype=bool)
+    keep[1:] = np.any(coords[1:] != coords[:-1], axis=1)
+    coords = coords[keep]
+    if len(coords) == 1:
+        geometry: Dict[str, object] = {"type": "Point", "coordinates": coords[0].tolist()}
+    else:
+        geometry = {"type": "LineString", "coordinates": coords.tolist()}
+
+    flags: List[Dict[str, object]] = []
+    for i in flagged[:max_flags].tolist():
+        a, b = atts[order[i]], atts[order[i + 1]]
+        flags.append(
+            {
+                "from_uid": a.get("uid"),
+                "to_uid": b.get("uid"),
+                "from_timestamp": _iso(ts[i]),
+                "to_timestamp": _iso(ts[i + 1]),
+                "distance_km": round(float(dist[i]), 6),
+                "elapsed_s": round(float(elapsed[i]), 3),
+                "speed_kmh": _speed(float(speed[i])),
+            }
+        )
+    return {"geometry": geometry, "stats": stats, "impossible_travel": flags}
@@ -5,7 +5,9 @@ Handles various response shapes and extracts relevant data.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .timing import timed_span
 
 
 def extract_location_proofs_list(data: object) -> List[Dict[str, object]]:
@@ -17,6 +19,11 @@ def extract_location_proofs_list(data: object) -> List[Dict[str, object]]:
     - { "data": { "data": [ ... ], ... } }
     - Fallback to other common keys ("results", "items") if present.
     """
+    with timed_span("extract"):
+        return _extract_location_proofs_list(data)
+
+
+def _extract_location_proofs_list(data: object) -> List[Dict[str, object]]:
     atts: List[Dict[str, object]] = []
     if not isinstance(data, dict):
         return atts
@@ -51,3 +58,36 @@ def extract_pagination(data: object) -> Optional[Dict[str, object]]:
         if isinstance(pag2, dict):
             return pag2
     return None
+
+
+def pagination_total(pagination: Optional[Dict[str, object]]) -> Optional[int]:
+    """Return the total result count reported by a pagination object, if any."""
+    if not isinstance(pagination, dict):
+        return None
+    for key in ("total", "totalCount", "total_count"):
+        v = pagination.get(key)
+        if isinstance(v, int) and not isinstance(v, bool):
+            return v
+    return None
+
+
+def has_more_results(pagination: Optional[Dict[str, object]], count: int, limit: Optional[int], offset: Optional[int]) -> bool:
+    """Return True if more results exist beyond the page just returned.
+
+    Prefers an explicit flag (``hasMore``/``has_more``/``hasNextPage``), then the reported total,
+    and finally assumes more results when the page came back full.
+    """
+    if isinstance(pagination, dict):
+        for key in ("hasMore", "has_more", "hasNextPage"):
+            flag = pagination.get(key)
+            if isinstance(flag, bool):
+                return flag
+        total = pagination_total(pagination)
+        if total is not None:
+            return (offset or 0) + count < total
+    return limit is not None and count >= limit
+
+
+def canonical_params_key(params: Mapping[str, object], exclude: Tuple[str, ...] = ()) -> Tuple[Tuple[str, str], ...]:
+    """Return a hashable, order-independent key for a query params dict."""
+    return tuple(sorted((k, str(v)) for k, v in params.items() if k not in exclude and v is not None))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 # Shared constants
 ERROR_TEXT_TRUNCATE_LENGTH = 500
@@ -41,33 +41,42 @@ def validate_query_args(
     if to_timestamp is not None and not isinstance(to_timestamp, str):
         raise ValueError("to_timestamp must be an ISO date string")
 
-    # bbox may be provided as a comma-separated string or a list/tuple of 4 numbers
     if bbox is not None:
-        coords = None
-        if isinstance(bbox, str):
-            parts = [p.strip() for p in bbox.split(",") if p.strip() != ""]
-            try:
-                coords = [float(p) for p in parts]
-            except ValueError:
-                raise ValueError("bbox string must contain four numeric values separated by commas")
-        elif isinstance(bbox, (list, tuple)):
-            try:
-                coords = [float(p) for p in bbox]
-            except (TypeError, ValueError):
-                raise ValueError("bbox list must contain four numeric values")
-        else:
-            raise ValueError("bbox must be a comma-separated string or a list of four numbers")
+        parse_bbox(bbox)
+
+
+def parse_bbox(bbox: Union[str, list, tuple]) -> Tuple[float, float, float, float]:
+    """Parse and validate a bbox given as a comma-separated string or a list/tuple of 4 numbers.
+
+    Returns:
+        Tuple of floats (minLng, minLat, maxLng, maxLat).
+    """
+    coords = None
+    if isinstance(bbox, str):
+        parts = [p.strip() for p in bbox.split(",") if p.strip() != ""]
+        try:
+            coords = [float(p) for p in parts]
+        except ValueError:
+            raise ValueError("bbox string must contain four numeric values separated by commas")
+    elif isinstance(bbox, (list, tuple)):
+        try:
+            coords = [float(p) for p in bbox]
+        except (TypeError, ValueError):
+            raise ValueError("bbox list must contain four numeric values")
+    else:
+        raise ValueError("bbox must be a comma-separated string or a list of four numbers")
 
-        if coords is None or len(coords) != 4:
-            raise ValueError("bbox must contain exactly four numeric values: [minLng,minLat,maxLng,maxLat]")
+    if coords is None or len(coords) != 4:
+        raise ValueError("bbox must contain exactly four numeric values: [minLng,minLat,maxLng,maxLat]")
 
-        min_lng, min_lat, max_lng, max_lat = coords
-        if not (-180.0 <= min_lng <= 180.0 and -180.0 <= max_lng <= 180.0):
-            raise ValueError("bbox longitude values must be between -180 and 180")
-        if not (-90.0 <= min_lat <= 90.0 and -90.0 <= max_lat <= 90.0):
-            raise ValueError("bbox latitude values must be between -90 and 90")
-        if not (min_lng < max_lng and min_lat < max_lat):
-            raise ValueError("bbox values must satisfy minLng < maxLng and minLat < maxLat")
+    min_lng, min_lat, max_lng, max_lat = coords
+    if not (-180.0 <= min_lng <= 180.0 and -180.0 <= max_lng <= 180.0):
+        raise ValueError("bbox longitude values must be between -180 and 180")
+    if not (-90.0 <= min_lat <= 90.0 and -90.0 <= max_lat <= 90.0):
+        raise ValueError("bbox latitude values must be between -90 and 90")
+    if not (min_lng < max_lng and min_lat < max_lat):
+        raise ValueError("bbox values must satisfy minLng < maxLng and minLat < maxLat")
+    return min_lng, min_lat, max_lng, max_lat
 
 
 def build_query_params(
@@ -0,0 +1,338 @@
+"""EAS signature verification for location proofs.
+
+A proof carrying a signed EAS offchain attestation (`sig`: domain, types, message, signature
+and uid) is checked by recovering the EIP-712 signer and comparing it, the signing domain
+and the signed message against the proof's decoded fields:
+
+- `domain_matches`: the domain's `chainId` and `verifyingContract` are the EAS deployment on
+  the proof's `chain`, so a signature made for another chain or contract is not accepted.
+- `signer_matches`: the recovered signer is the proof's own attester (`attester`/`prover`).
+- `uid_matches`: the offchain UID recomputed from the message equals the proof's UID.
+- `location_matches`: the signed `data`, decoded with the location proof schema, carries the
+  proof's `srs`, `location` and coordinates.
+- `recipient_matches`, `time_matches`, `schema_matches`: signed values equal the decoded ones.
+
+A proof naming no attester, or on a chain without a known EAS deployment, is unverifiable.
+The optional checks run only when both sides are present. A proof passing every check that ran
+is `valid` only if the UID and location checks were among them; otherwise it is `unverified`.
+Recovery is CPU-bound, so batches run in a
+process pool, and verdicts are cached by UID plus a hash of the proof's content, so an
+unchanged proof is never verified twice. Requires the optional `eth-account` package.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .cache import TTLCache
+from .geojson import attestation_geometry, parse_location_field
+from .planner import parse_timestamp
+
+try:
+    from eth_abi import decode as abi_decode  # type: ignore
+    from eth_account import Account  # type: ignore
+    from eth_account.messages import encode_typed_data  # type: ignore
+    from eth_utils import keccak, to_bytes  # type: ignore
+except Exception:
+    Account = None  # type: ignore[assignment,misc]
+
+ZERO_ADDRESS = "0x" + "00" * 20
+_SIGNED_KEYS = ("sig", "signature", "offchain_attestation", "offchainAttestation", "signed_attestation")
+_UINT_TYPES = {"uint8", "uint16", "uint32", "uint64", "uint256"}
+# Checks a proof must pass, not merely skip, to be reported valid
+_REQUIRED_CHECKS = ("uid_matches", "location_matches")
+# Decoded and signed coordinates further apart than this (in degrees) do not match
+_COORDINATE_TOLERANCE = 1e-6
+
+# Location proof schema (Location Protocol v0.1) the signed `data` is ABI-encoded with
+LOCATION_SCHEMA: Tuple[Tuple[str, str], ...] = (
+    ("uint256", "eventTimestamp"),
+    ("string", "srs"),
+    ("string", "locationType"),
+    ("string", "location"),
+    ("string[]", "recipeType"),
+    ("bytes[]", "recipePayload"),
+    ("string[]", "mediaType"),
+    ("string[]", "mediaData"),
+    ("string", "memo"),
+)
+
+# Chain name -> (chainId, EAS contract) that offchain attestations on that chain are signed for
+EAS_DOMAINS: Dict[str, Tuple[int, str]] = {
+    "arbitrum": (42161, "0xbD75f629A22Dc1ceD33dDA0b68c546A1c035c458"),
+    "base": (8453, "0x4200000000000000000000000000000000000021"),
+    "celo": (42220, "0x72E1d8ccf5299fb36fEfD8CC4394B8ef7e98Af92"),
+    "sepolia": (11155111, "0xC2679fBD37d54388Ce493F1DB75320D236e1815e"),
+}
+
+
+def verifier_available() -> bool:
+    return Account is not None
+
+
+def content_hash(att: Dict[str, object]) -> str:
+    """Stable hash of a proof's full content; any changed field yields a new hash."""
+    encoded = json.dumps(att, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def signed_attestation(att: Dict[str, object]) -> Optional[Dict[str, object]]:
+    """The signed EAS offchain attestation embedded in a proof, if any (may be a JSON string)."""
+    for key in _SIGNED_KEYS:
+        value = att.get(key)
+        if isinstance(value, str) and value.lstrip().startswith("{"):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                continue
+        if isinstance(value, dict):
+            # Shareable packages wrap the attestation as {"sig": {...}, "signer": ...}
+            inner = value.get("sig")
+            if isinstance(inner, dict) and "message" in inner:
+                return dict(inner, signer=value.get("signer"))
+            if "message" in value and "signature" in value:
+                return value
+    return None
+
+
+def _typed_message(signed: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    types = {k: v for k, v in signed["types"].items() if k != "EIP712Domain"}
+    primary = signed.get("primaryType") or next(iter(types))
+    fields = {f["name"]: f["type"] for f in types[primary]}
+    message = dict(signed["message"])
+    for name, value in message.items():
+        # Share packages often carry uint fields as decimal strings
+        if fields.get(name) in _UINT_TYPES and isinstance(value, str):
+            message[name] = int(value, 0)
+    return dict(signed["domain"]), types, message
+
+
+def _int(value: Any) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def _domain_matches(domain: Dict[str, Any], expected: Tuple[int, str]) -> bool:
+    chain_id: Any = domain.get("chainId")
+    try:
+        chain_id = int(chain_id, 0) if isinstance(chain_id, str) else int(chain_id)
+    except (TypeError, ValueError):
+        return False
+    return chain_id == expected[0] and _same_address(domain.get("verifyingContract"), expected[1])
+
+
+def _vrs(signature: object) -> Tuple[int, int, int]:
+    if isinstance(signature, dict):
+        return int(signature["v"]), _int(signature["r"]), _int(signature["s"])
+    raw = to_bytes(hexstr=str(signature))
+    if len(raw) != 65:
+        raise ValueError("signature must be 65 bytes")
+    v = raw[64]
+    return (v + 27 if v < 27 else v), int.from_bytes(raw[:32], "big"), int.from_bytes(raw[32:64], "big")
+
+
+def _uint(value: int, bits: int) -> bytes:
+    return int(value).to_bytes(bits // 8, "big")
+
+
+def offchain_uid(message: Dict[str, Any]) -> Optional[str]:
+    """EAS offchain UID of a signed message (versions 0-2), or None for an unknown version."""
+    version = int(message.get("version", 0))
+    parts = [
+        to_bytes(hexstr=message["schema"]),
+        to_bytes(hexstr=message["recipient"]),
+        to_bytes(hexstr=ZERO_ADDRESS),
+        _uint(message["time"], 64),
+        _uint(message["expirationTime"], 64),
+        b"\x01" if message["revocable"] else b"\x00",
+        to_bytes(hexstr=message["refUID"]),
+        to_bytes(hexstr=message["data"]),
+    ]
+    if version == 0:
+        packed = b"".join(parts)
+    elif version == 1:
+        packed = _uint(version, 16) + b"".join(parts)
+    elif version == 2:
+        packed = _uint(version, 16) + b"".join(parts) + to_bytes(hexstr=message["salt"])
+    else:
+        return None
+    return "0x" + keccak(packed + _uint(0, 32)).hex()
+
+
+def decode_location_payload(data: object) -> Optional[Dict[str, Any]]:
+    """The signed `data` decoded with LOCATION_SCHEMA, or None if it is not a location payload."""
+    if not isinstance(data, str):
+        return None
+    try:
+        values = abi_decode([t for t, _ in LOCATION_SCHEMA], to_bytes(hexstr=data))
+    except Exception:
+        return None
+    return {name: value for (_, name), value in zip(LOCATION_SCHEMA, values)}
+
+
+def _payload_point(payload: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """(lon, lat) of a decoded payload's location: GeoJSON, or a coordinate pair in `locationType` order."""
+    geom = parse_location_field(str(payload.get("location") or ""))
+    if geom is None:
+        return None
+    # A bare pair parses as "lat, lon"; Location Protocol pairs declare their order in locationType
+    a, b = (float(c) for c in geom["coordinates"])  # type: ignore[attr-defined]
+    bare_pair = not str(payload.get("location")).lstrip().startswith("{")
+    if bare_pair and "lon-lat" in str(payload.get("locationType") or "").lower():
+        return b, a
+    return a, b
+
+
+def _location_matches(att: Dict[str, object], payload: Dict[str, Any]) -> bool:
+    for key in ("srs", "location"):
+        if isinstance(att.get(key), str) and att[key] != payload.get(key):
+            return False
+    claimed = attestation_geometry({k: v for k, v in att.items() if k not in _SIGNED_KEYS})
+    if claimed is None:
+        return True
+    signed = _payload_point(payload)
+    if signed is None:
+        return False
+    lon, lat = (float(c) for c in claimed["coordinates"])  # type: ignore[attr-defined]
+    return abs(lon - signed[0]) <= _COORDINATE_TOLERANCE and abs(lat - signed[1]) <= _COORDINATE_TOLERANCE
+
+
+def _same_address(a: object, b: object) -> bool:
+    return isinstance(a, str) and isinstance(b, str) and a.lower() == b.lower()
+
+
+def verify_attestation(att: Dict[str, object]) -> Dict[str, object]:
+    """Verdict for one proof: {"uid", "verdict", "signer", "checks", "reasons"}."""
+    verdict: Dict[str, object] = {"uid": att.get("uid"), "verdict": "unverifiable", "signer": None, "checks": {}, "reasons": []}
+    reasons: List[str] = verdict["reasons"]  # type: ignore[assignment]
+    checks: Dict[str, bool] = verdict["checks"]  # type: ignore[assignment]
+    signed = signed_attestation(att)
+    if signed is None:
+        reasons.append("no signed attestation in proof")
+        return verdict
+    # Only the proof's own fields are trusted; the signer a package claims is attacker-controlled
+    attester = next((att[k] for k in ("attester", "prover") if isinstance(att.get(k), str)), None)
+    if attester is None:
+        reasons.append("proof names no attester to check the signer against")
+        return verdict
+    expected_domain = EAS_DOMAINS.get(str(att.get("chain") or "").lower())
+    if expected_domain is None:
+        reasons.append(f"no known EAS contract for chain {att.get('chain')!r} to check the signing domain against")
+        return verdict
+
+    try:
+        domain, types, message = _typed_message(signed)
+        signable = encode_typed_data(domain_data=domain, message_types=types, message_data=message)
+        signer = Account.recover_message(signable, vrs=_vrs(signed["signature"]))
+    except Exception as e:
+        verdict["verdict"] = "invalid"
+        reasons.append(f"signature recovery failed: {type(e).__name__}: {e}")
+        return verdict
+    verdict["signer"] = signer
+    checks["domain_matches"] = _domain_matches(domain, expected_domain)
+    checks["signer_matches"] = _same_address(signer, attester)
+
+    uid = att.get("uid") or signed.get("uid")
+    if isinstance(uid, str):
+        try:
+            expected = offchain_uid(message)
+        except (KeyError, TypeError, ValueError):
+            expected = None
+        if expected is not None:
+            checks["uid_matches"] = expected.lower() == uid.lower()
+
+    recipient = next((att[k] for k in ("recipient", "subject") if isinstance(att.get(k), str)), None)
+    if recipient is not None and "recipient" in message:
+        checks["recipient_matches"] = _same_address(message["recipient"], recipient)
+    ts = parse_timestamp(att.get("timestamp"))
+    if ts is not None and "time" in message:
+        checks["time_matches"] = int(ts.timestamp()) == int(message["time"])
+    schema = att.get("schema")
+    if isinstance(schema, str) and "schema" in message:
+        checks["schema_matches"] = schema.lower() == str(message["schema"]).lower()
+    payload = decode_location_payload(message.get("data"))
+    if payload is not None:
+        checks["location_matches"] = _location_matches(att, payload)
+    else:
+        reasons.append("signed data does not decode as a location proof")
+
+    failed = [name for name, ok in checks.items() if not ok]
+    skipped = [name for name in _REQUIRED_CHECKS if name not in checks]
+    reasons.extend(f"{name} check failed" for name in failed)
+    reasons.extend(f"{name} check could not run" for name in skipped)
+    verdict["verdict"] = "invalid" if failed else ("unverified" if skipped else "valid")
+    return verdict
+
+
+def verify_batch(atts: Sequence[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Process-pool entry point: verify a chunk of proofs."""
+    return [verify_attestation(att) for att in atts]
+
+
+class ProofVerifier:
+    """Verifies proofs in a lazily started process pool, caching verdicts by (uid, content hash).
+
+    Batches smaller than `pool_min_batch` are verified on a worker thread instead, since
+    starting or feeding the pool costs more than the work itself.
+    """
+
+    def __init__(self, *, max_workers: int, pool_min_batch: int, cache_size: int, cache_ttl: float) -> None:
+        self.max_workers = max(1, max_workers)
+        self.pool_min_batch = pool_min_batch
+        self._cache: TTLCache[Tuple[object, str], Dict[str, object]] = TTLCache(cache_size, cache_ttl)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.verified = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that runs logging and event-loop threads is unsafe
+            self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(self.close)
+        return self._pool
+
+    async def verify(self, atts: Sequence[Dict[str, object]]) -> Tuple[List[Dict[str, object]], Dict[str, object]]:
+        """Verdicts for `atts` in order, plus {"cached", "computed", "mode"}.
+
+        Raises:
+            RuntimeError: If eth-account is not installed.
+        """
+        if not verifier_available():
+            raise RuntimeError("signature verification requires the 'eth-account' package (poetry install --extras verify)")
+        keys = [(att.get("uid"), content_hash(att)) for att in atts]
+        verdicts: List[Optional[Dict[str, object]]] = [self._cache.get(key) for key in keys]
+        todo = [i for i, v in enumerate(verdicts) if v is None]
+
+        mode = "cache"
+        if todo:
+            pending = [atts[i] for i in todo]
+            if len(pending) < self.pool_min_batch:
+                mode = "thread"
+                results = await asyncio.to_thread(verify_batch, pending)
+            else:
+                mode = "process"
+                loop = asyncio.get_running_loop()
+                size = max(8, -(-len(pending) // (self.max_workers * 4)))
+                chunks = [pending[i : i + size] for i in range(0, len(pending), size)]
+                parts = await asyncio.gather(*(loop.run_in_executor(self._executor(), verify_batch, c) for c in chunks))
+                results = [v for part in parts for v in part]
+            for i, verdict in zip(todo, results):
+                verdicts[i] = verdict
+                self._cache.set(keys[i], verdict)
+            self.verified += len(todo)
+        stats: Dict[str, object] = {"cached": len(atts) - len(todo), "computed": len(todo), "mode": mode}
+        return verdicts, stats  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, object]:
+        stats = self._cache.stats()
+        stats.update({"verified": self.verified, "workers": self.max_workers, "available": verifier_available()})
+        return stats
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -4,65 +4,661 @@ Astral MCP Server
 A FastMCP-based server that provides tools for querying location attestations through the Astral API.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
 import re
-from typing import Dict, Optional, Union
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, Union, cast
 
 import httpx
 from mcp.server.fastmcp import FastMCP
+from pydantic import AnyUrl
 
 import json
 from pathlib import Path
 import mcp.types as types
 
-# Optional YAML support
-try:
-    import yaml  # type: ignore
-except Exception:
-    yaml = None
-
 from astral_mcp_server.helpers import (
     ERROR_TEXT_TRUNCATE_LENGTH,
+    EXPORT_FORMATS,
+    ExportWriter,
+    GEOJSON_URI_PREFIX,
+    GeoJSONResourceStore,
+    GraphQLBatcher,
+    GraphQLError,
+    CursorStore,
+    MAX_QUERY_LIMIT,
+    MissingDependencyError,
+    PlanResult,
+    Prefetcher,
+    PromptRegistry,
+    ProofVerifier,
+    RequestTimer,
+    ResultFingerprintStore,
+    SAMPLED,
+    SpatialIndex,
+    SpatialIndexStore,
+    TileCache,
+    TimeShardedPlanner,
+    TraceWriter,
+    WATCH_URI_PREFIX,
+    WatchRegistry,
+    activate_timer,
+    analyze_trajectory,
     build_query_params,
+    canonical_params_key,
+    configure_logging,
+    deadline_from_meta,
+    deadline_scope,
+    encode_feature_collection,
     extract_location_proofs_list,
     extract_pagination,
     feature_collection_from_attestations,
+    filter_within_polygons,
+    filter_within_radius,
     geojson_blocks_for_single,
+    has_more_results,
+    http_trace_extensions,
+    iter_offset_pages,
+    offset_walk,
+    open_export_writer,
+    pagination_total,
+    parse_bbox,
+    parse_center,
+    parse_polygons,
+    parse_timestamp,
+    format_timestamp,
+    polygons_envelope,
+    radius_envelope,
+    request_timeout,
+    single_attestation,
+    timed_span,
+    until_deadline,
+    validate_encoding_options,
     validate_query_args,
+    watch_uri,
 )
 
 # Import from absolute paths when running as script
 try:
     from .config import (
+        ASTRAL_BACKEND,
         ASTRAL_CONFIG_ENDPOINT,
+        ASTRAL_GRAPHQL_ENDPOINT,
         ASTRAL_HEALTH_ENDPOINT,
         ASTRAL_LOCATION_PROOFS_ENDPOINT,
+        BULK_MAX_CONCURRENCY,
+        BULK_MAX_RESULTS,
+        CLUSTER_MAX_UIDS,
+        CURSOR_MAX_SESSIONS,
+        CURSOR_TTL_SECONDS,
+        DEADLINE_GRACE_SECONDS,
+        DEFAULT_DEADLINE_SECONDS,
         DEFAULT_TIMEOUT,
+        EXPORT_DIR,
+        EXPORT_MAX_ROWS,
+        GEOJSON_RESOURCE_MAX_ENTRIES,
+        GEOJSON_RESOURCE_TTL_SECONDS,
+        GRAPHQL_MAX_BATCH,
+        LOG_LEVEL,
+        LOG_SAMPLE_RATE,
+        MAX_DEADLINE_SECONDS,
+        PREFETCH_BUDGET,
+        PREFETCH_ENABLED,
+        PREFETCH_MAX_CONCURRENCY,
+        PREFETCH_UNUSED_TTL_SECONDS,
+        RESULT_FINGERPRINT_MAX_ENTRIES,
+        RESULT_FINGERPRINT_TTL_SECONDS,
         SERVER_NAME,
+        SPATIAL_INDEX_LEAF_SIZE,
+        SPATIAL_INDEX_MAX_ENTRIES,
+        SPATIAL_INDEX_MAX_POINTS,
+        SPATIAL_INDEX_TTL_SECONDS,
         SERVER_VERSION,
+        TILE_CACHE_MAX_ENTRIES,
+        TILE_CACHE_MAX_TILES,
+        TILE_CACHE_TTL_SECONDS,
+        TILE_CACHE_ZOOM,
+        TIMINGS_ENABLED,
+        TOOL_DEADLINE_SECONDS,
+        TRACE_FILE,
+        TRAJECTORY_MAX_FLAGS,
+        TRAJECTORY_MAX_SPEED_KMH,
+        TRAJECTORY_MIN_JUMP_KM,
+        UID_BATCH_MAX,
+        VERIFY_CACHE_MAX_ENTRIES,
+        VERIFY_CACHE_TTL_SECONDS,
+        VERIFY_MAX_PROOFS,
+        VERIFY_MAX_WORKERS,
+        VERIFY_POOL_MIN_BATCH,
+        WATCH_MAX_WATCHES,
+        WATCH_POLL_INTERVAL_SECONDS,
+        WATCH_RECENT_LIMIT,
         get_api_key,
     )
 except ImportError:  # pragma: no cover
     # Fallback for when running as script
     from config import (  # type: ignore
+        ASTRAL_BACKEND,
         ASTRAL_CONFIG_ENDPOINT,
+        ASTRAL_GRAPHQL_ENDPOINT,
         ASTRAL_HEALTH_ENDPOINT,
         ASTRAL_LOCATION_PROOFS_ENDPOINT,
+        BULK_MAX_CONCURRENCY,
+        BULK_MAX_RESULTS,
+        CLUSTER_MAX_UIDS,
+        CURSOR_MAX_SESSIONS,
+        CURSOR_TTL_SECONDS,
+        DEADLINE_GRACE_SECONDS,
+        DEFAULT_DEADLINE_SECONDS,
         DEFAULT_TIMEOUT,
+        EXPORT_DIR,
+        EXPORT_MAX_ROWS,
+        GEOJSON_RESOURCE_MAX_ENTRIES,
+        GEOJSON_RESOURCE_TTL_SECONDS,
+        GRAPHQL_MAX_BATCH,
+        LOG_LEVEL,
+        LOG_SAMPLE_RATE,
+        MAX_DEADLINE_SECONDS,
+        PREFETCH_BUDGET,
+        PREFETCH_ENABLED,
+        PREFETCH_MAX_CONCURRENCY,
+        PREFETCH_UNUSED_TTL_SECONDS,
+        RESULT_FINGERPRINT_MAX_ENTRIES,
+        RESULT_FINGERPRINT_TTL_SECONDS,
         SERVER_NAME,
+        SPATIAL_INDEX_LEAF_SIZE,
+        SPATIAL_INDEX_MAX_ENTRIES,
+        SPATIAL_INDEX_MAX_POINTS,
+        SPATIAL_INDEX_TTL_SECONDS,
         SERVER_VERSION,
+        TILE_CACHE_MAX_ENTRIES,
+        TILE_CACHE_MAX_TILES,
+        TILE_CACHE_TTL_SECONDS,
+        TILE_CACHE_ZOOM,
+        TIMINGS_ENABLED,
+        TOOL_DEADLINE_SECONDS,
+        TRACE_FILE,
+        TRAJECTORY_MAX_FLAGS,
+        TRAJECTORY_MAX_SPEED_KMH,
+        TRAJECTORY_MIN_JUMP_KM,
+        UID_BATCH_MAX,
+        VERIFY_CACHE_MAX_ENTRIES,
+        VERIFY_CACHE_TTL_SECONDS,
+        VERIFY_MAX_PROOFS,
+        VERIFY_MAX_WORKERS,
+        VERIFY_POOL_MIN_BATCH,
+        WATCH_MAX_WATCHES,
+        WATCH_POLL_INTERVAL_SECONDS,
+        WATCH_RECENT_LIMIT,
         get_api_key,
     )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued to a background writer, per-call INFO logs sampled)
+configure_logging(getattr(logging, LOG_LEVEL, logging.INFO), LOG_SAMPLE_RATE)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Initialize FastMCP app
 app = FastMCP(SERVER_NAME)
 
+# Optional local trace file receiving the phase spans of every tool call
+_trace_writer = TraceWriter(Path(TRACE_FILE)) if TRACE_FILE else None
+
+
+def _attach_timings(result: object, timings: Dict[str, object]) -> None:
+    """Add a `timings` section to a tool result (the first block when GeoJSON blocks are returned)."""
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        result = result[0].get("data")
+    if isinstance(result, dict):
+        result["timings"] = timings
+
+
+def _timed(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Give a tool an opt-in `timings` argument that adds a per-phase timing breakdown to its result.
+
+    Calls are also timed whenever ASTRAL_TIMINGS is set (timings always included) or a trace
+    file is configured (spans appended to the file).
+    """
+    signature = inspect.signature(fn)
+    timings_param = inspect.Parameter("timings", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, timings: bool = False, **kwargs: Any) -> Any:
+        include = timings or TIMINGS_ENABLED
+        if not include and _trace_writer is None:
+            return await fn(*args, **kwargs)
+        timer = RequestTimer(fn.__name__)
+        with activate_timer(timer):
+            result = await fn(*args, **kwargs)
+        timer.finish()
+        if _trace_writer is not None:
+            _trace_writer.write(timer)
+        if include:
+            _attach_timings(result, timer.summary())
+        return result
+
+    parameters = [*signature.parameters.values(), timings_param]
+    wrapper.__signature__ = signature.replace(parameters=parameters)  # type: ignore[attr-defined]
+    doc = wrapper.__doc__ or ""
+    if "\n\n    Returns:" in doc:
+        entry = "        timings (bool): Include a `timings` section with per-phase durations in milliseconds."
+        section = f"\n{entry}" if "    Args:" in doc else f"\n\n    Args:\n{entry}"
+        wrapper.__doc__ = doc.replace("\n\n    Returns:", f"{section}\n\n    Returns:", 1)
+    return wrapper
+
+
+# FeatureCollections handed out as resource URIs and built only when read
+_geojson_resources = GeoJSONResourceStore(GEOJSON_RESOURCE_MAX_ENTRIES, GEOJSON_RESOURCE_TTL_SECONDS)
+
+
+def _with_geojson(
+    result: Dict[str, object],
+    atts: List[Dict[str, object]],
+    geojson_block: bool,
+    geojson_resource: bool,
+    encoding: str = "geojson",
+    precision: Optional[int] = None,
+) -> object:
+    """Attach GeoJSON to a tool result as a lazily built resource URI or an inline FeatureCollection block."""
+    if geojson_resource:
+        result["geojson_resource"] = _geojson_resources.register(atts, encoding, precision)
+        return result
+    if geojson_block:
+        fc = encode_feature_collection(feature_collection_from_attestations(atts), encoding, precision)
+        return [
+            {"type": "json", "data": result},
+            {"type": "json", "data": fc},
+        ]
+    return result
+
+
+def _tool_deadline_seconds(tool_name: str) -> float:
+    """Deadline for a tool call: from the client's request `_meta` if given, else the tool's default."""
+    seconds: Optional[float] = None
+    try:
+        meta = app._mcp_server.request_context.meta
+    except LookupError:
+        meta = None
+    if meta is not None:
+        seconds = deadline_from_meta(meta.model_dump())
+    if seconds is None:
+        seconds = TOOL_DEADLINE_SECONDS.get(tool_name, DEFAULT_DEADLINE_SECONDS)
+    return min(seconds, MAX_DEADLINE_SECONDS)
+
+
+def _with_deadline(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Run a tool under its deadline, propagated to every nested upstream request.
+
+    Bulk retrieval stops at the deadline and returns partial results; anything still running
+    a short grace period later is cancelled and reported as `deadline_exceeded`.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        seconds = _tool_deadline_seconds(fn.__name__)
+        with deadline_scope(seconds):
+            try:
+                async with asyncio.timeout(max(0.0, seconds) + DEADLINE_GRACE_SECONDS):
+                    return await fn(*args, **kwargs)
+            except TimeoutError:
+                error_msg = f"Tool call exceeded its deadline of {seconds:g} seconds"
+                logger.error(error_msg)
+                return {
+                    "success": False,
+                    "error": "deadline_exceeded",
+                    "message": error_msg,
+                    "details": {"deadline_seconds": seconds},
+                }
+
+    return wrapper
+
+
+# Per-tile result sets for bbox queries, shared across tool calls
+_tile_cache = TileCache(TILE_CACHE_ZOOM, TILE_CACHE_MAX_ENTRIES, TILE_CACHE_TTL_SECONDS)
+
+# Resumable result sets handed out as opaque cursors
+_cursor_store = CursorStore(CURSOR_MAX_SESSIONS, CURSOR_TTL_SECONDS)
+
+# Fingerprints (UIDs + revoked flags) of returned result sets, for since_result diffs
+_result_fingerprints = ResultFingerprintStore(RESULT_FINGERPRINT_MAX_ENTRIES, RESULT_FINGERPRINT_TTL_SECONDS)
+
+
+def _with_delta(
+    result: Dict[str, object],
+    atts: List[Dict[str, object]],
+    query_key: Hashable,
+    since_result: Optional[str],
+    truncated: bool = False,
+) -> List[Dict[str, object]]:
+    """Fingerprint a returned result set and, given `since_result`, replace its `data` with the changes since.
+
+    When the result set is `truncated`, the delta says so: proofs past the cut show up as removed.
+    Returns the proofs the response still carries, for GeoJSON output.
+
+    Raises:
+        ValueError: If `since_result` belongs to a different query.
+    """
+    result["result_token"] = _result_fingerprints.register(query_key, atts)
+    if since_result is None:
+        return atts
+    changes = _result_fingerprints.diff(since_result, query_key, atts)
+    if changes is None:
+        # Expired or unknown: the full result doubles as a fresh baseline
+        result["delta"] = {"since_result": since_result, "expired": True}
+        return atts
+    added = cast(List[Dict[str, object]], changes["added"])
+    revoked = cast(List[Dict[str, object]], changes["revoked"])
+    del result["data"]
+    result["changes"] = changes
+    delta: Dict[str, object] = {
+        "since_result": since_result,
+        "added": len(added),
+        "removed": len(cast(List[str], changes["removed"])),
+        "revoked": len(revoked),
+        "unchanged": changes["unchanged"],
+    }
+    if truncated:
+        delta["truncated"] = True
+    result["delta"] = delta
+    return added + revoked
+
+
+# KD-tree indexes over fetched result sets, reused within a client session
+_spatial_indexes = SpatialIndexStore(SPATIAL_INDEX_MAX_ENTRIES, SPATIAL_INDEX_TTL_SECONDS)
+
+
+# EAS signature verifier (process pool started on first large batch) with a verdict cache
+_verifier = ProofVerifier(
+    max_workers=VERIFY_MAX_WORKERS,
+    pool_min_batch=VERIFY_POOL_MIN_BATCH,
+    cache_size=VERIFY_CACHE_MAX_ENTRIES,
+    cache_ttl=VERIFY_CACHE_TTL_SECONDS,
+)
+
+
+def _session_key() -> Hashable:
+    """Identity of the calling client session (None outside a request)."""
+    try:
+        return id(app._mcp_server.request_context.session)
+    except LookupError:
+        return None
+
+
+async def _spatial_index_for(params: Dict[str, Union[str, int]], refresh: bool) -> Tuple[SpatialIndex, bool]:
+    """Return the session's spatial index for `params`, fetching and building it if needed.
+
+    Returns:
+        (index, whether it was reused from an earlier call)
+    """
+    session_key = _session_key()
+    filters_key = canonical_params_key(params)
+    index = None if refresh else _spatial_indexes.get(session_key, filters_key)
+    if index is not None:
+        return index, True
+    async with _new_client() as client:
+        logger.info("Building spatial index for params: %s", params, extra=SAMPLED)
+        plan = await _collect_location_proofs(client, params, SPATIAL_INDEX_MAX_POINTS)
+    index = await asyncio.to_thread(SpatialIndex, plan.proofs, SPATIAL_INDEX_LEAF_SIZE, plan.stats())
+    # An index cut short by the deadline would give wrong answers to later calls
+    if not plan.deadline_exceeded:
+        _spatial_indexes.put(session_key, filters_key, index)
+    return index, False
+
+
+def _spatial_index_info(index: SpatialIndex, cached: bool) -> Dict[str, object]:
+    return {"points": len(index), "skipped": index.skipped, "backend": index.backend, "cached": cached, "plan": index.plan}
+
+
+async def _prefetch_page(params: Dict[str, Union[str, int]]) -> object:
+    # Prefetches outlive the call that scheduled them, so they do not inherit its deadline
+    with deadline_scope(PREFETCH_UNUSED_TTL_SECONDS, inherit=False):
+        async with _new_client() as client:
+            logger.info("Prefetching location proofs with params: %s", params, extra=SAMPLED)
+            return await _fetch_location_proofs_page(client, params)
+
+
+# Opt-in speculative prefetch of the next offset page
+_prefetcher = Prefetcher(
+    _prefetch_page,
+    enabled=PREFETCH_ENABLED,
+    budget=PREFETCH_BUDGET,
+    max_concurrency=PREFETCH_MAX_CONCURRENCY,
+    unused_ttl=PREFETCH_UNUSED_TTL_SECONDS,
+)
+
+
+async def _poll_watch_page(params: Dict[str, Union[str, int]]) -> object:
+    with deadline_scope(None, inherit=False):
+        return await _fetch_watch_page(params)
+
+
+async def _fetch_watch_page(params: Dict[str, Union[str, int]]) -> object:
+    async with _new_client() as client:
+        logger.info("Polling location proofs for watch with params: %s", params, extra=SAMPLED)
+        return await _fetch_location_proofs_page(client, params)
+
+
+async def _notify_resource_updated(session: object, uri: str) -> None:
+    await session.send_resource_updated(AnyUrl(uri))  # type: ignore[attr-defined]
+
+
+# Saved filter sets polled once upstream and pushed to subscribed clients
+_watch_registry = WatchRegistry(
+    _poll_watch_page,
+    _notify_resource_updated,
+    interval=WATCH_POLL_INTERVAL_SECONDS,
+    max_watches=WATCH_MAX_WATCHES,
+    recent_limit=WATCH_RECENT_LIMIT,
+    max_catch_up=BULK_MAX_RESULTS,
+)
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Create the HTTP client used for upstream Astral API requests."""
+    return httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+
+
+# Per-client GraphQL batchers, so concurrent requests made through one client share round trips
+_graphql_batchers: "weakref.WeakKeyDictionary[httpx.AsyncClient, GraphQLBatcher]" = weakref.WeakKeyDictionary()
+
+
+def _graphql_batcher(client: httpx.AsyncClient) -> GraphQLBatcher:
+    batcher = _graphql_batchers.get(client)
+    if batcher is None:
+
+        async def post(payload: Dict[str, object]) -> object:
+            response = await client.post(
+                ASTRAL_GRAPHQL_ENDPOINT,
+                json=payload,
+                timeout=request_timeout(DEFAULT_TIMEOUT),
+                extensions=http_trace_extensions(),
+            )
+            response.raise_for_status()
+            return _decode_json(response)
+
+        batcher = _graphql_batchers[client] = GraphQLBatcher(post, max_batch=GRAPHQL_MAX_BATCH)
+    return batcher
+
+
+async def _graphql_call(call: Awaitable[T]) -> T:
+    """Await a batched GraphQL call; passing the caller's deadline surfaces as a request timeout, as with REST."""
+    try:
+        return await call
+    except TimeoutError as e:
+        raise httpx.TimeoutException("GraphQL request did not complete before the call's deadline") from e
+
+
+async def _fetch_location_proofs_page(client: httpx.AsyncClient, params: Dict[str, Union[str, int]]) -> object:
+    """Fetch one page of location proofs and return the decoded JSON body."""
+    if ASTRAL_BACKEND == "graphql":
+        return await _graphql_call(_graphql_batcher(client).page(params))
+    response = await client.get(
+        ASTRAL_LOCATION_PROOFS_ENDPOINT,
+        params=params,
+        timeout=request_timeout(DEFAULT_TIMEOUT),
+        extensions=http_trace_extensions(),
+    )
+    response.raise_for_status()
+    return _decode_json(response)
+
+
+async def _fetch_location_proof(
+    client: httpx.AsyncClient, uid: str, backend: Optional[str] = None
+) -> Optional[Dict[str, object]]:
+    """Fetch one location proof by UID (from `backend`, default ASTRAL_BACKEND); returns None if it does not exist."""
+    if (backend or ASTRAL_BACKEND) == "graphql":
+        return await _graphql_call(_graphql_batcher(client).proof(uid))
+    response = await client.get(
+        f"{ASTRAL_LOCATION_PROOFS_ENDPOINT}/{uid}",
+        timeout=request_timeout(DEFAULT_TIMEOUT),
+        extensions=http_trace_extensions(),
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return single_attestation(_decode_json(response))
+
+
+async def _fetch_location_proofs_by_uid(uids: List[str], backend: Optional[str] = None) -> List[Optional[Dict[str, object]]]:
+    """Fetch proofs for `uids` (None where missing): one batched request with GraphQL, concurrent GETs with REST."""
+    backend = backend or ASTRAL_BACKEND
+    async with _new_client() as client:
+        semaphore = asyncio.Semaphore(BULK_MAX_CONCURRENCY)
+
+        async def fetch(uid: str) -> Optional[Dict[str, object]]:
+            if backend == "graphql":
+                return await _fetch_location_proof(client, uid, backend)
+            async with semaphore:
+                return await _fetch_location_proof(client, uid, backend)
+
+        return await asyncio.gather(*(fetch(uid) for uid in uids))
+
+
+def _decode_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, timed as the `decode` phase."""
+    with timed_span("decode"):
+        return response.json()
+
+
+async def _collect_location_proofs(
+    client: httpx.AsyncClient,
+    params: Dict[str, Union[str, int]],
+    max_results: int,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> PlanResult:
+    """Retrieve every proof matching `params` (up to `max_results`).
+
+    Uses the time-sharded planner when both timestamps bound the query, otherwise walks offsets.
+    `semaphore`, when given, bounds upstream requests shared with other concurrent retrievals.
+    """
+
+    async def fetch_page(page_params: Dict[str, Union[str, int]]) -> object:
+        if semaphore is None:
+            return await _fetch_location_proofs_page(client, page_params)
+        async with semaphore:
+            return await _fetch_location_proofs_page(client, page_params)
+
+    from_raw = params.get("fromTimestamp")
+    to_raw = params.get("toTimestamp")
+    if from_raw is not None and to_raw is not None:
+        start = parse_timestamp(from_raw)
+        end = parse_timestamp(to_raw)
+        if start is None or end is None:
+            raise ValueError("from_timestamp and to_timestamp must be ISO date strings")
+        planner = TimeShardedPlanner(
+            fetch_page,
+            params,
+            page_limit=MAX_QUERY_LIMIT,
+            max_concurrency=BULK_MAX_CONCURRENCY,
+            max_results=max_results,
+        )
+        return await planner.run(start, end)
+    return await offset_walk(fetch_page, params, page_limit=MAX_QUERY_LIMIT, max_results=max_results)
+
+
+async def _query_via_tile_cache(
+    params: Dict[str, Union[str, int]],
+    bbox: tuple,
+    limit: Optional[int],
+    offset: Optional[int],
+) -> Dict[str, object]:
+    """Serve a bbox query from tile-aligned cached result sets, clipped and paginated locally."""
+    filters = {k: v for k, v in params.items() if k not in ("bbox", "limit", "offset")}
+    filters_key = canonical_params_key(filters)
+    started = time.perf_counter()
+    # No tile can contribute more than the page needs, rounded up to whole upstream pages; tiles cut
+    # short are cached as incomplete
+    needed = BULK_MAX_RESULTS if limit is None else (offset or 0) + limit
+    tile_rows = min(BULK_MAX_RESULTS, -(-needed // MAX_QUERY_LIMIT) * MAX_QUERY_LIMIT)
+    # One request budget for all cold tiles of this query, however many there are; GraphQL already
+    # sends their concurrent pages as one batched request
+    semaphore = None if ASTRAL_BACKEND == "graphql" else asyncio.Semaphore(BULK_MAX_CONCURRENCY)
+    deadline_exceeded = False
+
+    # Tile fetches outlive this call when it is cancelled while other callers share them, so the
+    # client is closed by whichever of this call and its fetches finishes last
+    client = _new_client()
+    users = 1
+
+    async def release_client() -> None:
+        nonlocal users
+        users -= 1
+        if users == 0:
+            await client.aclose()
+
+    async def fetch_tile(tile_bbox: tuple, rows: int) -> Tuple[List[Dict[str, object]], bool]:
+        nonlocal deadline_exceeded, users
+        users += 1
+        try:
+            tile_params = dict(filters)
+            tile_params["bbox"] = ",".join(str(v) for v in tile_bbox)
+            plan = await _collect_location_proofs(client, tile_params, rows, semaphore)
+        finally:
+            await release_client()
+        deadline_exceeded = deadline_exceeded or plan.deadline_exceeded
+        return plan.proofs, not plan.truncated
+
+    try:
+        proofs, tile_stats = await _tile_cache.query(filters_key, bbox, fetch_tile, tile_rows)
+    finally:
+        await release_client()
+
+    start = offset or 0
+    page = proofs[start : start + limit] if limit is not None else proofs[start:]
+    logger.info(
+        "Served %s location proofs from tile cache (%s/%s tile hits)",
+        len(page),
+        tile_stats["tile_hits"],
+        tile_stats["tiles"],
+        extra=SAMPLED,
+    )
+    result: Dict[str, object] = {
+        "success": True,
+        "data": page,
+        "query_params": params,
+        "pagination": {"total": len(proofs), "limit": limit, "offset": start},
+        "tile_cache": tile_stats,
+        "truncated": not tile_stats["complete"],
+        "deadline_exceeded": deadline_exceeded,
+        "response_time_ms": int((time.perf_counter() - started) * 1000),
+    }
+    remaining = proofs[start + len(page) :]
+    if remaining and limit is not None:
+        # The rest of the assembled set is already local; the cursor simply buffers it
+        result["cursor"] = _cursor_store.create(
+            params, limit, start + len(page), buffer=remaining, exhausted=True, total=len(proofs)
+        )
+    return result
+
 
 @app.tool()
+@_timed
+@_with_deadline
 async def check_astral_api_health() -> Dict[str, object]:
     """
     Check the health status of the Astral API.
@@ -76,12 +672,16 @@ async def check_astral_api_health() -> Dict[str, object]:
         Exception: If the health check fails or times out
     """
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            logger.info(f"Checking Astral API health at: {ASTRAL_HEALTH_ENDPOINT}")
-            response = await client.get(ASTRAL_HEALTH_ENDPOINT)
+        async with _new_client() as client:
+            logger.info("Checking Astral API health at: %s", ASTRAL_HEALTH_ENDPOINT, extra=SAMPLED)
+            response = await client.get(
+                ASTRAL_HEALTH_ENDPOINT,
+                timeout=request_timeout(DEFAULT_TIMEOUT),
+                extensions=http_trace_extensions(),
+            )
             response.raise_for_status()
 
-            health_data = response.json()
+            health_data = _decode_json(response)
 
             result = {
                 "status": "healthy",
@@ -95,7 +695,7 @@ async def check_astral_api_health() -> Dict[str, object]:
                 "api_data": health_data,
             }
 
-            logger.info(f"Health check successful: {result['status']}")
+            logger.info("Health check successful: %s", result["status"], extra=SAMPLED)
             return result
 
     except httpx.TimeoutException as exc:
@@ -106,7 +706,7 @@ async def check_astral_api_health() -> Dict[str, object]:
     except httpx.HTTPStatusError as exc:
         error_msg = (
             "Health check failed with status "
-            f"{exc.response.status_code}: {exc.response.text}"
+            f"{exc.response.status_code}: {exc.response.text[:ERROR_TEXT_TRUNCATE_LENGTH]}"
         )
         logger.error(error_msg)
         raise Exception(error_msg) from exc
@@ -118,6 +718,8 @@ async def check_astral_api_health() -> Dict[str, object]:
 
 
 @app.tool()
+@_timed
+@_with_deadline
 async def get_server_info() -> Dict[str, object]:
     """
     Get information about this MCP server.
@@ -136,17 +738,58 @@ async def get_server_info() -> Dict[str, object]:
         "description": "MCP server for querying Astral location attestations",
         "api_key_configured": api_key_configured,
         "astral_health_endpoint": ASTRAL_HEALTH_ENDPOINT,
+        "backend": ASTRAL_BACKEND,
         "capabilities": [
             "health_check",
             "server_info",
             "query_location_proofs",
+            "query_location_proofs_bulk",
+            "query_location_proofs_within",
+            "subject_trajectory",
+            "nearest_location_proofs",
+            "cluster_location_proofs",
+            "fetch_next",
+            "server_metrics",
+            "watch_location_proofs",
+            "export_location_proofs",
             "get_location_proof_by_uid",
+            "get_location_proofs_by_uids",
+            "verify_location_proofs",
             "get_astral_config",
         ],
     }
 
 
 @app.tool()
+@_timed
+@_with_deadline
+async def get_server_metrics() -> Dict[str, object]:
+    """
+    Get runtime metrics for the server's caches and background work.
+
+    Reports prefetch effectiveness (hit ratio, unused and cancelled prefetches), tile cache usage
+    and cursor session counts, to judge whether extra upstream traffic is paying off.
+
+    Returns:
+        Dict[str, Any]: Metrics grouped by component
+    """
+    return {
+        "success": True,
+        "prefetch": _prefetcher.stats(),
+        "tile_cache": _tile_cache.stats(),
+        "cursors": _cursor_store.stats(),
+        "watches": _watch_registry.stats(),
+        "geojson_resources": _geojson_resources.stats(),
+        "spatial_indexes": _spatial_indexes.stats(),
+        "result_fingerprints": _result_fingerprints.stats(),
+        "verification": _verifier.stats(),
+        "prompts": _prompt_registry.stats(),
+    }
+
+
+@app.tool()
+@_timed
+@_with_deadline
 async def query_location_proofs(
     chain: Optional[str] = None,
     prover: Optional[str] = None,
@@ -157,6 +800,11 @@ async def query_location_proofs(
     limit: Optional[int] = 10,
     offset: Optional[int] = 0,
     geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+    use_tile_cache: bool = False,
+    since_result: Optional[str] = None,
 ) -> object:
     """
     Query location proofs (attestations) from the Astral API with filtering capabilities.
@@ -174,9 +822,20 @@ async def query_location_proofs(
         limit (Optional[int]): Max results to return (default: 10, max: 100).
         offset (Optional[int]): Results to skip for pagination (default: 0).
         geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+        use_tile_cache (bool): When True and `bbox` is set, serve the query from cached fixed-zoom tiles
+            clipped to the bbox; results are then ordered by timestamp and paginated locally.
+        since_result (Optional[str]): `result_token` from an earlier run of the same query. The result then
+            carries `changes` (added, removed and revoked proofs since that run) instead of `data`.
 
     Returns:
         object: The standard result dict, or when geojson_block=True, a list of two JSON content blocks.
+            When more results exist, the result carries a `cursor` to pass to `fetch_next`.
 
     Raises:
         Exception: If the API request fails or parameters are invalid.
@@ -184,47 +843,89 @@ async def query_location_proofs(
     try:
         # validate all query args
         validate_query_args(limit, offset, prover, subject, from_timestamp, to_timestamp, bbox)
+        validate_encoding_options(geojson_encoding, geojson_precision)
         params = build_query_params(
             chain, prover, limit, offset, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
         )
 
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            logger.info(f"Querying location proofs with params: {params}")
-
-            response = await client.get(ASTRAL_LOCATION_PROOFS_ENDPOINT, params=params)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Extract and flatten location proofs into a list of dicts
-            location_proofs = extract_location_proofs_list(data)
-            pagination = extract_pagination(data)
-
-            count = len(location_proofs)
-            logger.info(f"Successfully retrieved {count} location proofs")
-
-            result: Dict[str, object] = {
-                "success": True,
-                "data": location_proofs,
-                "query_params": params,
-                "response_code": response.status_code,
-                "response_time_ms": (
-                    int(response.elapsed.total_seconds() * 1000)
-                    if response.elapsed is not None
-                    else None
-                ),
-            }
-            if pagination is not None:
-                result["pagination"] = pagination
-
-            if geojson_block:
-                fc = feature_collection_from_attestations(location_proofs)
-                return [
-                    {"type": "json", "data": result},
-                    {"type": "json", "data": fc},
-                ]
+        if use_tile_cache and bbox is not None:
+            bbox_coords = parse_bbox(bbox)
+            if _tile_cache.tile_count(bbox_coords) <= TILE_CACHE_MAX_TILES:
+                cached_result = await _query_via_tile_cache(params, bbox_coords, limit, offset)
+                shown = _with_delta(
+                    cached_result,
+                    cached_result["data"],  # type: ignore[arg-type]
+                    ("query_location_proofs", canonical_params_key(params)),
+                    since_result,
+                    cached_result["truncated"] is True,
+                )
+                return _with_geojson(
+                    cached_result,
+                    shown,
+                    geojson_block,
+                    geojson_resource,
+                    geojson_encoding,
+                    geojson_precision,
+                )
+            logger.info("bbox spans too many tiles for the tile cache; querying the API directly", extra=SAMPLED)
+
+        started = time.perf_counter()
+        data = await _prefetcher.take(params)
+        prefetched = data is not None
+        response_code: Optional[int] = 200
+        response_time_ms: Optional[int] = None
+        if data is None:
+            async with _new_client() as client:
+                logger.info("Querying location proofs with params: %s", params, extra=SAMPLED)
+                if ASTRAL_BACKEND == "graphql":
+                    # A batched GraphQL page has no response of its own; time the call instead
+                    data = await _fetch_location_proofs_page(client, params)
+                    response_time_ms = int((time.perf_counter() - started) * 1000)
+                else:
+                    response = await client.get(
+                        ASTRAL_LOCATION_PROOFS_ENDPOINT,
+                        params=params,
+                        timeout=request_timeout(DEFAULT_TIMEOUT),
+                        extensions=http_trace_extensions(),
+                    )
+                    response.raise_for_status()
+
+                    data = _decode_json(response)
+                    response_code = response.status_code
+                    response_time_ms = int(response.elapsed.total_seconds() * 1000) if response.elapsed is not None else None
+        else:
+            logger.info("Serving prefetched location proofs for params: %s", params, extra=SAMPLED)
+            response_time_ms = int((time.perf_counter() - started) * 1000)
+
+        # Extract and flatten location proofs into a list of dicts
+        location_proofs = extract_location_proofs_list(data)
+        pagination = extract_pagination(data)
+
+        count = len(location_proofs)
+        logger.info("Successfully retrieved %s location proofs", count, extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": location_proofs,
+            "query_params": params,
+            "response_code": response_code,
+            "response_time_ms": response_time_ms,
+        }
+        if prefetched:
+            result["prefetched"] = True
+        if pagination is not None:
+            result["pagination"] = pagination
+        if has_more_results(pagination, count, limit, offset):
+            result["cursor"] = _cursor_store.create(
+                params, limit or MAX_QUERY_LIMIT, (offset or 0) + count, total=pagination_total(pagination)
+            )
+            # Agents usually ask for the following offset page next
+            next_params = dict(params)
+            next_params["offset"] = (offset or 0) + (limit or count)
+            _prefetcher.schedule(next_params)
 
-            return result
+        shown = _with_delta(result, location_proofs, ("query_location_proofs", canonical_params_key(params)), since_result)
+        return _with_geojson(result, shown, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
 
     except ValueError as e:
         error_msg = f"Invalid parameter: {e!s}"
@@ -248,7 +949,7 @@ async def query_location_proofs(
 
     except httpx.HTTPStatusError as e:
         error_msg = f"API request failed with status {e.response.status_code}"
-        logger.error(f"{error_msg}: {e.response.text}")
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
         return {
             "success": False,
             "error": "api_error",
@@ -259,6 +960,16 @@ async def query_location_proofs(
             },
         }
 
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
     except Exception as e:  # pragma: no cover
         error_msg = f"Unexpected error querying location proofs: {e!s}"
         logger.error(error_msg)
@@ -271,65 +982,94 @@ async def query_location_proofs(
 
 
 @app.tool()
-async def get_location_proof_by_uid(uid: str, geojson_block: bool = False) -> object:
+@_timed
+@_with_deadline
+async def query_location_proofs_bulk(
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    bbox: Optional[Union[str, list]] = None,
+    max_results: Optional[int] = 1000,
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+    since_result: Optional[str] = None,
+) -> object:
     """
-    Retrieve a specific location proof attestation by its unique identifier.
+    Retrieve all location proofs matching the filters, up to `max_results`, in a single call.
 
-    Enables fetching complete attestation details including raw content, decoded fields, and verification evidence for analysis.
+    When both `from_timestamp` and `to_timestamp` are given, the window is split into time shards
+    that are fetched concurrently and re-split where they are dense; otherwise results are paged
+    with offsets. Results are ordered by timestamp and deduplicated by `uid`.
 
     Args:
-        uid (str): 66-character hex string starting with 0x.
+        chain (Optional[str]): Filter by blockchain network (e.g., "ethereum", "polygon").
+        prover (Optional[str]): Filter by prover address (hexadecimal address).
+        subject (Optional[str]): Filter by subject address (hexadecimal address).
+        from_timestamp (Optional[str]): ISO date string to filter proofs after this timestamp.
+        to_timestamp (Optional[str]): ISO date string to filter proofs before this timestamp.
+        bbox (Optional[str|list]): Bounding box `[minLng,minLat,maxLng,maxLat]` as comma-separated string or list.
+        max_results (Optional[int]): Max results to return (default: 1000, max: 10000).
         geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+        since_result (Optional[str]): `result_token` from an earlier run of the same query. The result then
+            carries `changes` (added, removed and revoked proofs since that run) instead of `data`.
 
     Returns:
         object: The standard result dict, or when geojson_block=True, a list of two JSON content blocks.
 
     Raises:
-        Exception: If the UID format is invalid or API request fails.
+        Exception: If the API request fails or parameters are invalid.
     """
     try:
-        if not isinstance(uid, str) or not re.match(r"^0x[a-fA-F0-9]{64}$", uid):
-            raise ValueError(
-                "uid must be a 66-character hexadecimal string starting with 0x"
-            )
-        endpoint = f"{ASTRAL_LOCATION_PROOFS_ENDPOINT}/{uid}"
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            logger.info(f"Fetching location proof with UID: {uid}")
-            response = await client.get(endpoint)
-            if response.status_code == 404:
-                return {
-                    "success": False,
-                    "error": "not_found",
-                    "message": f"Location proof not found for UID: {uid}",
-                    "details": {"attempted_uid": uid},
-                }
-            response.raise_for_status()
-            data = response.json()
-            result: Dict[str, object] = {
-                "success": True,
-                "data": data,
-                "uid": uid,
-                "response_code": response.status_code,
-                "response_time_ms": (
-                    int(response.elapsed.total_seconds() * 1000)
-                    if response.elapsed is not None
-                    else None
-                ),
-            }
-            logger.info(f"Successfully retrieved location proof for UID: {uid}")
-            return geojson_blocks_for_single(data, result) if geojson_block else result
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp, bbox)
+        validate_encoding_options(geojson_encoding, geojson_precision)
+        if max_results is None:
+            max_results = BULK_MAX_RESULTS
+        if not isinstance(max_results, int) or max_results < 1 or max_results > BULK_MAX_RESULTS:
+            raise ValueError(f"max_results must be an integer between 1 and {BULK_MAX_RESULTS}")
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
+        )
+
+        started = time.perf_counter()
+        async with _new_client() as client:
+            logger.info("Bulk querying location proofs with params: %s", params, extra=SAMPLED)
+            plan = await _collect_location_proofs(client, params, max_results)
+
+        logger.info("Successfully retrieved %s location proofs in %s requests", len(plan.proofs), plan.requests, extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": plan.proofs,
+            "count": len(plan.proofs),
+            "query_params": params,
+            "plan": plan.stats(),
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+        query_key = ("query_location_proofs_bulk", canonical_params_key(params), max_results)
+        shown = _with_delta(result, plan.proofs, query_key, since_result, plan.truncated)
+        return _with_geojson(result, shown, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
+
     except ValueError as e:
-        error_msg = f"Invalid UID format: {e!s}"
+        error_msg = f"Invalid parameter: {e!s}"
         logger.error(error_msg)
         return {
             "success": False,
             "error": "validation_error",
             "message": error_msg,
-            "details": {
-                "attempted_uid": uid,
-                "format_requirement": "66-character hex string starting with 0x",
-            },
+            "details": {"parameter_validation": f"{e!s}"},
         }
+
     except httpx.TimeoutException:
         error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
         logger.error(error_msg)
@@ -337,74 +1077,170 @@ async def get_location_proof_by_uid(uid: str, geojson_block: bool = False) -> ob
             "success": False,
             "error": "timeout_error",
             "message": error_msg,
-            "details": {"attempted_uid": uid, "timeout_seconds": DEFAULT_TIMEOUT},
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
         }
+
     except httpx.HTTPStatusError as e:
         error_msg = f"API request failed with status {e.response.status_code}"
-        logger.error(f"{error_msg}: {e.response.text}")
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
         return {
             "success": False,
             "error": "api_error",
             "message": error_msg,
             "details": {
-                "attempted_uid": uid,
                 "status_code": e.response.status_code,
                 "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
             },
         }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
     except Exception as e:  # pragma: no cover
-        error_msg = f"Unexpected error fetching location proof: {e!s}"
+        error_msg = f"Unexpected error bulk querying location proofs: {e!s}"
         logger.error(error_msg)
         return {
             "success": False,
             "error": "unexpected_error",
             "message": error_msg,
-            "details": {"attempted_uid": uid, "exception_type": type(e).__name__},
+            "details": {"exception_type": type(e).__name__},
         }
 
 
 @app.tool()
-async def get_astral_config() -> Dict[str, object]:
+@_timed
+@_with_deadline
+async def query_location_proofs_within(
+    geometry: Optional[Union[str, dict]] = None,
+    center: Optional[Union[str, list]] = None,
+    radius_km: Optional[float] = None,
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    max_results: Optional[int] = 1000,
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+    since_result: Optional[str] = None,
+) -> object:
     """
-    Get Astral API configuration information including supported chains and schemas.
+    Query location proofs inside a polygon or within a radius of a point.
 
-    Provides configuration data to help users understand which chains, schemas, and capabilities are supported
-        by the Astral API for making informed queries.
+    The shape's envelope is sent upstream as `bbox`, every matching page is fetched, and points are
+    then filtered locally with vectorized point-in-polygon or haversine distance tests. Provide either
+    `geometry` or both `center` and `radius_km`.
+
+    Args:
+        geometry (Optional[str|dict]): GeoJSON Polygon or MultiPolygon (bare geometry, Feature, or JSON string).
+        center (Optional[str|list]): Circle center as `[lng, lat]` list or "lng,lat" string.
+        radius_km (Optional[float]): Circle radius in kilometers (requires `center`).
+        chain (Optional[str]): Filter by blockchain network (e.g., "ethereum", "polygon").
+        prover (Optional[str]): Filter by prover address (hexadecimal address).
+        subject (Optional[str]): Filter by subject address (hexadecimal address).
+        from_timestamp (Optional[str]): ISO date string to filter proofs after this timestamp.
+        to_timestamp (Optional[str]): ISO date string to filter proofs before this timestamp.
+        max_results (Optional[int]): Max results to return (default: 1000, max: 10000).
+        geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+        since_result (Optional[str]): `result_token` from an earlier run of the same query. The result then
+            carries `changes` (added, removed and revoked proofs since that run) instead of `data`.
 
     Returns:
-        Dict[str, Any]: Configuration data including chains, schemas, and API capabilities
+        object: The standard result dict, or when geojson_block=True, a list of two JSON content blocks.
+            Radius results carry a `distance_km` field.
 
     Raises:
-        Exception: If the configuration endpoint is unavailable
+        Exception: If the API request fails or parameters are invalid.
     """
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            logger.info(
-                f"Fetching Astral API configuration from: {ASTRAL_CONFIG_ENDPOINT}"
-            )
-
-            response = await client.get(ASTRAL_CONFIG_ENDPOINT)
-            response.raise_for_status()
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp)
+        validate_encoding_options(geojson_encoding, geojson_precision)
+        if max_results is None:
+            max_results = BULK_MAX_RESULTS
+        if not isinstance(max_results, int) or max_results < 1 or max_results > BULK_MAX_RESULTS:
+            raise ValueError(f"max_results must be an integer between 1 and {BULK_MAX_RESULTS}")
+
+        if geometry is not None and (center is not None or radius_km is not None):
+            raise ValueError("provide either geometry or center with radius_km, not both")
+        if geometry is not None:
+            polygons = parse_polygons(geometry)
+            envelope = polygons_envelope(polygons)
+            shape: Dict[str, object] = {"type": "polygon", "polygons": len(polygons)}
+        elif center is not None and radius_km is not None:
+            if isinstance(radius_km, bool) or not isinstance(radius_km, (int, float)) or radius_km <= 0:
+                raise ValueError("radius_km must be a positive number")
+            lon0, lat0 = parse_center(center)
+            envelope = radius_envelope(lon0, lat0, float(radius_km))
+            shape = {"type": "radius", "center": [lon0, lat0], "radius_km": radius_km}
+        else:
+            raise ValueError("provide either geometry or both center and radius_km")
+
+        bbox = list(parse_bbox(list(envelope)))
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
+        )
 
-            config_data = response.json()
+        started = time.perf_counter()
+        async with _new_client() as client:
+            logger.info("Querying location proofs within %s using envelope params: %s", shape["type"], params, extra=SAMPLED)
+            plan = await _collect_location_proofs(client, params, BULK_MAX_RESULTS)
+
+        if shape["type"] == "polygon":
+            matched = filter_within_polygons(plan.proofs, polygons)
+        else:
+            matched = filter_within_radius(plan.proofs, lon0, lat0, float(radius_km))  # type: ignore[arg-type]
+
+        truncated = plan.truncated or len(matched) > max_results
+        matched = matched[:max_results]
+        logger.info("Matched %s of %s location proofs within %s", len(matched), len(plan.proofs), shape["type"], extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": matched,
+            "count": len(matched),
+            "query_params": params,
+            "filter": dict(shape, envelope=bbox, candidates=len(plan.proofs)),
+            "plan": dict(plan.stats(), truncated=truncated),
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
 
-            result = {
-                "success": True,
-                "data": config_data,
-                "endpoint": ASTRAL_CONFIG_ENDPOINT,
-                "response_code": response.status_code,
-                "response_time_ms": (
-                    int(response.elapsed.total_seconds() * 1000)
-                    if response.elapsed is not None
-                    else None
-                ),
-            }
+        shape_key = json.dumps([shape, geometry], sort_keys=True, default=str)
+        shown = _with_delta(
+            result,
+            matched,
+            ("query_location_proofs_within", canonical_params_key(params), shape_key, max_results),
+            since_result,
+            truncated,
+        )
+        return _with_geojson(result, shown, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
 
-            logger.info("Successfully retrieved Astral API configuration")
-            return result
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
 
     except httpx.TimeoutException:
-        error_msg = f"Configuration request timed out after {DEFAULT_TIMEOUT} seconds"
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
         logger.error(error_msg)
         return {
             "success": False,
@@ -414,8 +1250,8 @@ async def get_astral_config() -> Dict[str, object]:
         }
 
     except httpx.HTTPStatusError as e:
-        error_msg = f"Configuration request failed with status {e.response.status_code}"
-        logger.error(f"{error_msg}: {e.response.text}")
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
         return {
             "success": False,
             "error": "api_error",
@@ -426,87 +1262,1365 @@ async def get_astral_config() -> Dict[str, object]:
             },
         }
 
-    except Exception as e:  # pragma: no cover
-        error_msg = f"Unexpected error fetching configuration: {e!s}"
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
         logger.error(error_msg)
         return {
             "success": False,
-            "error": "unexpected_error",
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error querying location proofs within shape: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def subject_trajectory(
+    subject: Optional[str] = None,
+    prover: Optional[str] = None,
+    chain: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    max_speed_kmh: float = TRAJECTORY_MAX_SPEED_KMH,
+    max_points: Optional[int] = BULK_MAX_RESULTS,
+    geojson_precision: Optional[int] = 6,
+) -> Dict[str, object]:
+    """
+    Analyze the movement of a subject (or prover) from its location proofs.
+
+    Fetches every proof for the subject/prover in the time window, orders them by timestamp and computes
+    per-segment distance, elapsed time and implied speed. Returns the path as a compact LineString with
+    summary statistics instead of the raw proofs, and flags impossible-travel jumps.
+
+    Args:
+        subject (Optional[str]): Subject address to follow. At least one of subject or prover is required.
+        prover (Optional[str]): Prover address to follow.
+        chain (Optional[str]): Filter by blockchain network.
+        from_timestamp (Optional[str]): ISO date string; only proofs after this time.
+        to_timestamp (Optional[str]): ISO date string; only proofs before this time.
+        max_speed_kmh (float): Segments faster than this are flagged as impossible travel (default: 1000).
+            Segments shorter than 1 km are never flagged.
+        max_points (Optional[int]): Maximum proofs to analyze (default and max: 10000).
+        geojson_precision (Optional[int]): Decimal places kept in the LineString coordinates (0-10, default 6;
+            None keeps full precision).
+
+    Returns:
+        Dict[str, Any]: `trajectory` (GeoJSON Feature with a LineString), `stats` (points, distance, duration,
+            speeds, bbox, impossible_jumps), `impossible_travel` (flagged segments) and `plan`.
+    """
+    try:
+        if subject is None and prover is None:
+            raise ValueError("subject or prover is required")
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp, None)
+        validate_encoding_options("geojson", geojson_precision)
+        if max_points is None:
+            max_points = BULK_MAX_RESULTS
+        if not isinstance(max_points, int) or max_points < 2 or max_points > BULK_MAX_RESULTS:
+            raise ValueError(f"max_points must be an integer between 2 and {BULK_MAX_RESULTS}")
+        if isinstance(max_speed_kmh, bool) or not isinstance(max_speed_kmh, (int, float)) or max_speed_kmh <= 0:
+            raise ValueError("max_speed_kmh must be a positive number")
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp
+        )
+
+        started = time.perf_counter()
+        async with _new_client() as client:
+            logger.info("Fetching trajectory proofs with params: %s", params, extra=SAMPLED)
+            plan = await _collect_location_proofs(client, params, max_points)
+
+        analysis = await asyncio.to_thread(
+            analyze_trajectory,
+            plan.proofs,
+            max_speed_kmh=float(max_speed_kmh),
+            min_jump_km=TRAJECTORY_MIN_JUMP_KM,
+            precision=geojson_precision,
+            max_flags=TRAJECTORY_MAX_FLAGS,
+        )
+        stats = cast(Dict[str, object], analysis["stats"])
+        logger.info(
+            "Analyzed trajectory of %s points (%s impossible jumps)",
+            stats["points"],
+            stats["impossible_jumps"],
+            extra=SAMPLED,
+        )
+        properties = {k: v for k, v in (("subject", subject), ("prover", prover), ("chain", chain)) if v is not None}
+        return {
+            "success": True,
+            "trajectory": {"type": "Feature", "geometry": analysis["geometry"], "properties": properties},
+            "stats": stats,
+            "impossible_travel": analysis["impossible_travel"],
+            "query_params": params,
+            "plan": plan.stats(),
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error analyzing trajectory: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def nearest_location_proofs(
+    center: Union[str, list],
+    k: int = 10,
+    radius_km: Optional[float] = None,
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    bbox: Optional[Union[str, list]] = None,
+    refresh: bool = False,
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+) -> object:
+    """
+    Find the location proofs closest to a point.
+
+    The proofs matching the filters are fetched once and indexed in a KD-tree that is reused by later
+    nearest-neighbour and clustering calls in the same session with the same filters.
+
+    Args:
+        center (str|list): `[lng, lat]` as a list or "lng,lat" string.
+        k (int): Number of nearest proofs to return (1-100, default 10).
+        radius_km (Optional[float]): Only return proofs within this great-circle distance.
+        chain (Optional[str]): Filter by blockchain network.
+        prover (Optional[str]): Filter by prover address.
+        subject (Optional[str]): Filter by subject address.
+        from_timestamp (Optional[str]): ISO date string; only proofs after this time.
+        to_timestamp (Optional[str]): ISO date string; only proofs before this time.
+        bbox (Optional[str|list]): Bounding box `[minLng,minLat,maxLng,maxLat]` limiting the indexed set.
+        refresh (bool): Re-fetch the proofs and rebuild the index instead of reusing it.
+        geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+
+    Returns:
+        object: The standard result dict with proofs nearest first, each annotated with `distance_km`, plus
+            an `index` section, or when geojson_block=True, a list of two JSON content blocks.
+    """
+    try:
+        lon0, lat0 = parse_center(center)
+        if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_QUERY_LIMIT:
+            raise ValueError(f"k must be an integer between 1 and {MAX_QUERY_LIMIT}")
+        if radius_km is not None and (
+            isinstance(radius_km, bool) or not isinstance(radius_km, (int, float)) or radius_km <= 0
+        ):
+            raise ValueError("radius_km must be a positive number")
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp, bbox)
+        validate_encoding_options(geojson_encoding, geojson_precision)
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
+        )
+
+        started = time.perf_counter()
+        index, cached = await _spatial_index_for(params, refresh)
+        matches = index.nearest(lon0, lat0, k, None if radius_km is None else float(radius_km))
+        data = [dict(index.atts[i], distance_km=round(km, 6)) for i, km in matches]
+        logger.info("Found %s nearest location proofs (index cached: %s)", len(data), cached, extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": data,
+            "count": len(data),
+            "query_params": params,
+            "index": _spatial_index_info(index, cached),
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+        return _with_geojson(result, data, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error finding nearest location proofs: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def cluster_location_proofs(
+    eps_km: float = 1.0,
+    min_samples: int = 5,
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    bbox: Optional[Union[str, list]] = None,
+    refresh: bool = False,
+) -> Dict[str, object]:
+    """
+    Find dense clusters of location proofs with DBSCAN.
+
+    Uses the same session-scoped KD-tree index as nearest_location_proofs, so clustering a filter set
+    that was already indexed does not fetch it again.
+
+    Args:
+        eps_km (float): Neighbourhood radius in km (default 1.0, max 1000).
+        min_samples (int): Proofs within eps_km (including itself) for a proof to start a cluster (1-1000, default 5).
+        chain (Optional[str]): Filter by blockchain network.
+        prover (Optional[str]): Filter by prover address.
+        subject (Optional[str]): Filter by subject address.
+        from_timestamp (Optional[str]): ISO date string; only proofs after this time.
+        to_timestamp (Optional[str]): ISO date string; only proofs before this time.
+        bbox (Optional[str|list]): Bounding box `[minLng,minLat,maxLng,maxLat]` of the region to cluster.
+        refresh (bool): Re-fetch the proofs and rebuild the index instead of reusing it.
+
+    Returns:
+        Dict[str, Any]: `clusters` (largest first, each with size, centroid, bbox and up to 20 member UIDs),
+            `noise` (proofs in no cluster) and an `index` section.
+    """
+    try:
+        if isinstance(eps_km, bool) or not isinstance(eps_km, (int, float)) or not 0 < eps_km <= 1000:
+            raise ValueError("eps_km must be a number greater than 0 and at most 1000")
+        if isinstance(min_samples, bool) or not isinstance(min_samples, int) or not 1 <= min_samples <= 1000:
+            raise ValueError("min_samples must be an integer between 1 and 1000")
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp, bbox)
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
+        )
+
+        started = time.perf_counter()
+        index, cached = await _spatial_index_for(params, refresh)
+        labels = await asyncio.to_thread(index.dbscan, float(eps_km), min_samples)
+        clusters = index.cluster_summaries(labels, CLUSTER_MAX_UIDS)
+        noise = int((labels < 0).sum())
+        logger.info("Found %s clusters (%s noise proofs, index cached: %s)", len(clusters), noise, cached, extra=SAMPLED)
+
+        return {
+            "success": True,
+            "clusters": clusters,
+            "count": len(clusters),
+            "noise": noise,
+            "parameters": {"eps_km": eps_km, "min_samples": min_samples},
+            "query_params": params,
+            "index": _spatial_index_info(index, cached),
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error clustering location proofs: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def fetch_next(
+    cursor: str,
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+) -> object:
+    """
+    Fetch the next page of a result set using the `cursor` returned by a query tool.
+
+    Continues from server-held state (filters, position and rows already read ahead), so filters are
+    not re-sent and follow-up pages are often served from memory without a new upstream request. The
+    page after a query is taken from the speculative prefetch when it is enabled.
+
+    Args:
+        cursor (str): Opaque cursor from a previous `query_location_proofs` or `fetch_next` result.
+        geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+
+    Returns:
+        object: The standard result dict, or when geojson_block=True, a list of two JSON content blocks.
+            `cursor` is null once the result set is exhausted.
+
+    Raises:
+        Exception: If the cursor is unknown/expired or the API request fails.
+    """
+    try:
+        validate_encoding_options(geojson_encoding, geojson_precision)
+        started = time.perf_counter()
+
+        async def fetch_page(page_params: Dict[str, Union[str, int]]) -> object:
+            async with _new_client() as client:
+                logger.info("Reading ahead for cursor with params: %s", page_params, extra=SAMPLED)
+                return await _fetch_location_proofs_page(client, page_params)
+
+        prefetched = False
+
+        async def take_prefetched(page_params: Dict[str, Union[str, int]]) -> Optional[object]:
+            nonlocal prefetched
+            data = await _prefetcher.take(page_params)
+            prefetched = data is not None
+            return data
+
+        rows, state, from_buffer, has_more = await _cursor_store.next_page(cursor, fetch_page, take_prefetched)
+        logger.info("Served %s location proofs for cursor (from buffer: %s)", len(rows), from_buffer, extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": rows,
+            "query_params": state.params,
+            "pagination": {"total": state.total, "limit": state.limit, "offset": state.position - len(rows)},
+            "cursor": cursor if has_more else None,
+            "served_from_buffer": from_buffer,
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+        if prefetched:
+            result["prefetched"] = True
+
+        return _with_geojson(result, rows, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    except KeyError:
+        error_msg = "Cursor not found or expired; re-run the original query"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "cursor_not_found",
+            "message": error_msg,
+            "details": {"cursor": cursor},
+        }
+
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"cursor": cursor, "timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "cursor": cursor,
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error fetching next page: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"cursor": cursor, "exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def watch_location_proofs(
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    bbox: Optional[Union[str, list]] = None,
+    from_timestamp: Optional[str] = None,
+) -> Dict[str, object]:
+    """
+    Save a filter set as a subscribable resource that reports newly arriving location proofs.
+
+    Subscribe to the returned `resource_uri` to receive resource-updated notifications only when
+    new proofs match, instead of polling `query_location_proofs`. Identical filter sets share one
+    watch and one upstream poller regardless of how many clients subscribe.
+
+    Args:
+        chain (Optional[str]): Filter by blockchain network (e.g., "ethereum", "polygon").
+        prover (Optional[str]): Filter by prover address (hexadecimal address).
+        subject (Optional[str]): Filter by subject address (hexadecimal address).
+        bbox (Optional[str|list]): Bounding box `[minLng,minLat,maxLng,maxLat]` as comma-separated string or list.
+        from_timestamp (Optional[str]): ISO date string to start watching from (default: now). Only
+            applies when the filter set is new; an existing watch for the same filters keeps its own
+            watermark and rejects a different `from_timestamp`.
+
+    Returns:
+        Dict[str, Any]: The watch id, its resource URI and the saved filters.
+    """
+    try:
+        validate_query_args(None, None, prover, subject, from_timestamp, None, bbox)
+        if from_timestamp is not None and parse_timestamp(from_timestamp) is None:
+            raise ValueError("from_timestamp must be an ISO date string")
+        params = build_query_params(chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, bbox=bbox)
+        watch = _watch_registry.register(params)
+        logger.info("Registered watch %s for filters: %s", watch.watch_id, watch.filters)
+        return {
+            "success": True,
+            "watch_id": watch.watch_id,
+            "resource_uri": watch_uri(watch.watch_id),
+            "filters": watch.filters,
+            "watermark": format_timestamp(watch.watermark),
+            "poll_interval_seconds": WATCH_POLL_INTERVAL_SECONDS,
+        }
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+
+@app.resource(WATCH_URI_PREFIX + "{watch_id}", mime_type="application/json")
+async def read_location_proof_watch(watch_id: str) -> str:
+    """Newly arrived location proofs for a saved filter set, with its current watermark."""
+    try:
+        return json.dumps(_watch_registry.snapshot(watch_id))
+    except KeyError:
+        raise ValueError(f"Unknown watch: {watch_id}")
+
+
+@app.resource(GEOJSON_URI_PREFIX + "{resource_id}", mime_type="application/geo+json")
+async def read_geojson_resource(resource_id: str) -> str:
+    """GeoJSON FeatureCollection for the proofs returned by a tool call made with geojson_resource=True."""
+    try:
+        return json.dumps(_geojson_resources.read(resource_id))
+    except KeyError:
+        raise ValueError(f"Unknown or expired GeoJSON resource: {resource_id}")
+
+
+async def _write_export_page(writer: ExportWriter, page: List[Dict[str, object]]) -> None:
+    """Write a page on a worker thread, letting it finish even if the call is cancelled meanwhile.
+
+    The writer is closed right after cancellation, so a page must never still be mid-write.
+    """
+    write = asyncio.ensure_future(asyncio.to_thread(writer.write_page, page))
+    try:
+        await asyncio.shield(write)
+    except asyncio.CancelledError:
+        await write
+        raise
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def export_location_proofs(
+    output_format: str = "ndjson",
+    chain: Optional[str] = None,
+    prover: Optional[str] = None,
+    subject: Optional[str] = None,
+    from_timestamp: Optional[str] = None,
+    to_timestamp: Optional[str] = None,
+    bbox: Optional[Union[str, list]] = None,
+    max_results: Optional[int] = None,
+    filename: Optional[str] = None,
+    overwrite: bool = False,
+) -> Dict[str, object]:
+    """
+    Export location proofs matching the filters to a local file instead of returning them inline.
+
+    Pages are streamed from the API and appended to the file as they arrive, so memory stays flat
+    for any result size. Only a summary is returned: the file path, row count, bbox and timings.
+
+    Args:
+        output_format (str): One of "ndjson", "geojsonseq", "geoparquet" (needs pyarrow) or "flatgeobuf" (needs fiona).
+        chain (Optional[str]): Filter by blockchain network (e.g., "ethereum", "polygon").
+        prover (Optional[str]): Filter by prover address (hexadecimal address).
+        subject (Optional[str]): Filter by subject address (hexadecimal address).
+        from_timestamp (Optional[str]): ISO date string to filter proofs after this timestamp.
+        to_timestamp (Optional[str]): ISO date string to filter proofs before this timestamp.
+        bbox (Optional[str|list]): Bounding box `[minLng,minLat,maxLng,maxLat]` as comma-separated string or list.
+        max_results (Optional[int]): Max rows to export (default and max: 1,000,000).
+        filename (Optional[str]): File name inside the export directory (default: timestamped name).
+        overwrite (bool): Replace an existing file of that name (default: refuse and leave it untouched).
+
+    Returns:
+        Dict[str, Any]: Export summary with path, rows, bbox and timings.
+    """
+    partial_path: Optional[Path] = None
+    try:
+        validate_query_args(None, None, prover, subject, from_timestamp, to_timestamp, bbox)
+        if output_format not in EXPORT_FORMATS:
+            raise ValueError(f"output_format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if max_results is None:
+            max_results = EXPORT_MAX_ROWS
+        if not isinstance(max_results, int) or max_results < 1 or max_results > EXPORT_MAX_ROWS:
+            raise ValueError(f"max_results must be an integer between 1 and {EXPORT_MAX_ROWS}")
+        suffix = EXPORT_FORMATS[output_format]
+        if filename is None:
+            filename = f"location-proofs-{time.strftime('%Y%m%dT%H%M%S')}{suffix}"
+        elif not re.match(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$", filename):
+            raise ValueError("filename may only contain letters, digits, '.', '_' and '-'")
+        elif not filename.endswith(suffix):
+            filename += suffix
+        params = build_query_params(
+            chain, prover, None, None, subject=subject, from_timestamp=from_timestamp, to_timestamp=to_timestamp, bbox=bbox
+        )
+
+        EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        final_path = EXPORT_DIR / filename
+        if final_path.exists() and not overwrite:
+            raise ValueError(f"{filename} already exists in the export directory; pass overwrite=true or choose another filename")
+        partial_path = final_path.with_name(f".{final_path.stem}.partial{suffix}")
+
+        started = time.perf_counter()
+        fetch_seconds = 0.0
+        write_seconds = 0.0
+        requests = 0
+        truncated = False
+        deadline_exceeded = False
+        writer = open_export_writer(output_format, partial_path)
+        try:
+            async with _new_client() as client:
+
+                async def fetch_page(page_params: Dict[str, Union[str, int]]) -> object:
+                    return await _fetch_location_proofs_page(client, page_params)
+
+                logger.info("Exporting location proofs as %s with params: %s", output_format, params, extra=SAMPLED)
+                seen = 0
+                pages = iter_offset_pages(fetch_page, params, page_limit=MAX_QUERY_LIMIT, max_results=max_results)
+                try:
+                    while True:
+                        mark = time.perf_counter()
+                        # At the deadline the rows written so far are kept as a partial export
+                        async with until_deadline() as guard:
+                            page = await anext(pages, None)
+                        fetch_seconds += time.perf_counter() - mark
+                        if guard.expired:
+                            deadline_exceeded = truncated = True
+                            break
+                        if page is None:
+                            break
+                        requests += 1
+                        full_page = len(page) == MAX_QUERY_LIMIT
+                        page = page[: max_results - seen]
+                        seen += len(page)
+                        truncated = seen >= max_results and full_page
+
+                        mark = time.perf_counter()
+                        await _write_export_page(writer, page)
+                        write_seconds += time.perf_counter() - mark
+                finally:
+                    await pages.aclose()
+        finally:
+            await asyncio.to_thread(writer.close)
+
+        # The name may have been taken while the export was streaming
+        if final_path.exists() and not overwrite:
+            raise ValueError(f"{filename} was created while exporting; pass overwrite=true to replace it")
+        partial_path.replace(final_path)
+        partial_path = None
+        logger.info("Exported %s location proofs to %s", writer.rows, final_path, extra=SAMPLED)
+
+        return {
+            "success": True,
+            "path": str(final_path),
+            "format": output_format,
+            "rows": writer.rows,
+            "skipped_without_geometry": writer.skipped,
+            "bbox": writer.bbox,
+            "truncated": truncated,
+            "deadline_exceeded": deadline_exceeded,
+            "query_params": params,
+            "upstream_requests": requests,
+            "timings_ms": {
+                "fetch": int(fetch_seconds * 1000),
+                "write": int(write_seconds * 1000),
+                "total": int((time.perf_counter() - started) * 1000),
+            },
+        }
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    except MissingDependencyError as e:
+        error_msg = f"Export format unavailable: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "dependency_error",
+            "message": error_msg,
+            "details": {"format": output_format},
+        }
+
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error exporting location proofs: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+    finally:
+        # Never leave a half-written export behind
+        if partial_path is not None and partial_path.exists():
+            partial_path.unlink()
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def get_location_proof_by_uid(
+    uid: str,
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+) -> object:
+    """
+    Retrieve a specific location proof attestation by its unique identifier.
+
+    Enables fetching complete attestation details including raw content, decoded fields, and verification evidence for analysis.
+
+    Args:
+        uid (str): 66-character hex string starting with 0x.
+        geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+
+    Returns:
+        object: The standard result dict, or when geojson_block=True, a list of two JSON content blocks.
+
+    Raises:
+        Exception: If the UID format is invalid or API request fails.
+    """
+    try:
+        validate_encoding_options(geojson_encoding, geojson_precision)
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+
+    try:
+        if not isinstance(uid, str) or not re.match(r"^0x[a-fA-F0-9]{64}$", uid):
+            raise ValueError(
+                "uid must be a 66-character hexadecimal string starting with 0x"
+            )
+        async with _new_client() as client:
+            logger.info("Fetching location proof with UID: %s", uid, extra=SAMPLED)
+            not_found = {
+                "success": False,
+                "error": "not_found",
+                "message": f"Location proof not found for UID: {uid}",
+                "details": {"attempted_uid": uid},
+            }
+            data: object
+            response_code: int
+            response_time_ms: Optional[int]
+            if ASTRAL_BACKEND == "graphql":
+                # The batched lookup returns the bare attestation and has no response of its own to report
+                started = time.perf_counter()
+                data = await _fetch_location_proof(client, uid)
+                if data is None:
+                    return not_found
+                response_code = 200
+                response_time_ms = int((time.perf_counter() - started) * 1000)
+            else:
+                endpoint = f"{ASTRAL_LOCATION_PROOFS_ENDPOINT}/{uid}"
+                response = await client.get(
+                    endpoint, timeout=request_timeout(DEFAULT_TIMEOUT), extensions=http_trace_extensions()
+                )
+                if response.status_code == 404:
+                    return not_found
+                response.raise_for_status()
+                data = _decode_json(response)
+                response_code = response.status_code
+                response_time_ms = int(response.elapsed.total_seconds() * 1000) if response.elapsed is not None else None
+            result: Dict[str, object] = {
+                "success": True,
+                "data": data,
+                "uid": uid,
+                "response_code": response_code,
+                "response_time_ms": response_time_ms,
+            }
+            logger.info("Successfully retrieved location proof for UID: %s", uid, extra=SAMPLED)
+            if geojson_resource or geojson_encoding != "geojson" or geojson_precision is not None:
+                single = single_attestation(data)
+                atts = [single] if single is not None else []
+                return _with_geojson(result, atts, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
+            return geojson_blocks_for_single(data, result) if geojson_block else result
+    except ValueError as e:
+        error_msg = f"Invalid UID format: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {
+                "attempted_uid": uid,
+                "format_requirement": "66-character hex string starting with 0x",
+            },
+        }
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"attempted_uid": uid, "timeout_seconds": DEFAULT_TIMEOUT},
+        }
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "attempted_uid": uid,
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"attempted_uid": uid, "graphql_errors": e.errors},
+        }
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error fetching location proof: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"attempted_uid": uid, "exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def get_location_proofs_by_uids(
+    uids: List[str],
+    geojson_block: bool = False,
+    geojson_resource: bool = False,
+    geojson_encoding: str = "geojson",
+    geojson_precision: Optional[int] = None,
+) -> object:
+    """
+    Retrieve several location proofs by UID in one call.
+
+    With the GraphQL backend (ASTRAL_BACKEND=graphql) all lookups are sent as one aliased request;
+    with the REST backend they are fetched concurrently.
+
+    Args:
+        uids (List[str]): Up to 100 UIDs, each a 66-character hex string starting with 0x. Duplicates are ignored.
+        geojson_block (bool): When True, append a separate JSON block containing a GeoJSON FeatureCollection.
+        geojson_resource (bool): When True, return a short-lived `geojson_resource` URI instead; the
+            FeatureCollection is only built if that resource is read. Takes precedence over geojson_block.
+        geojson_encoding (str): "geojson" (default), "quantized" (TopoJSON-style integer coordinates with a
+            `transform`) or "geobuf" (compact binary, base64-encoded).
+        geojson_precision (Optional[int]): Decimal places kept in coordinates (0-10; default: full precision
+            for "geojson", 6 for the integer encodings).
+
+    Returns:
+        object: The standard result dict with the found proofs in `data` (in request order) and the UIDs
+            that do not exist in `missing`, or when geojson_block=True, a list of two JSON content blocks.
+    """
+    try:
+        validate_encoding_options(geojson_encoding, geojson_precision)
+        if not isinstance(uids, list) or not uids:
+            raise ValueError("uids must be a non-empty list")
+        if len(uids) > UID_BATCH_MAX:
+            raise ValueError(f"at most {UID_BATCH_MAX} uids can be requested at once")
+        for uid in uids:
+            if not isinstance(uid, str) or not re.match(r"^0x[a-fA-F0-9]{64}$", uid):
+                raise ValueError(f"uid {uid!r} must be a 66-character hexadecimal string starting with 0x")
+        unique = list(dict.fromkeys(uids))
+
+        started = time.perf_counter()
+        logger.info("Fetching %s location proofs by UID via %s", len(unique), ASTRAL_BACKEND, extra=SAMPLED)
+        found = await _fetch_location_proofs_by_uid(unique)
+
+        data = [att for att in found if att is not None]
+        missing = [uid for uid, att in zip(unique, found) if att is None]
+        logger.info("Retrieved %s of %s location proofs by UID", len(data), len(unique), extra=SAMPLED)
+
+        result: Dict[str, object] = {
+            "success": True,
+            "data": data,
+            "count": len(data),
+            "missing": missing,
+            "backend": ASTRAL_BACKEND,
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+        return _with_geojson(result, data, geojson_block, geojson_resource, geojson_encoding, geojson_precision)
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error fetching location proofs: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
             "message": error_msg,
             "details": {"exception_type": type(e).__name__},
         }
 
 
-# File-backed prompts support
-def _find_prompts_file() -> Path | None:
-    repo_root = Path(__file__).resolve().parents[1]
-    candidates = [
-        repo_root / "prompts" / "prompts.yaml",
-        repo_root / "prompts" / "prompts.yml",
-        repo_root / "prompts" / "prompts.json",
-        repo_root / ".vscode" / "mcp_prompts.yaml",
-        repo_root / ".vscode" / "mcp_prompts.yml",
-        repo_root / ".vscode" / "mcp_prompts.json",
-    ]
-    for p in candidates:
-        if p.exists():
-            return p
-    return None
-
-
-def _load_prompts_from_file() -> list[types.Prompt]:
-    """Load prompts from a JSON or YAML file and return list of mcp.types.Prompt.
-
-    Expected file shape: either a list of prompts or a dict with key "prompts".
-    Each prompt object: { name: str, description?: str, arguments?: [{name,description,required}], meta?: {...} }
-    """
-    pfile = _find_prompts_file()
-    if pfile is None:
-        return []
-
-    text = pfile.read_text(encoding="utf-8")
-    if pfile.suffix.lower() in (".yaml", ".yml"):
-        if yaml is None:
-            raise RuntimeError("pyyaml is required to read YAML prompt files; install pyyaml or use JSON prompt file")
-        parsed = yaml.safe_load(text)
-    else:
-        parsed = json.loads(text)
-
-    if isinstance(parsed, dict) and "prompts" in parsed:
-        items = parsed["prompts"]
-    elif isinstance(parsed, list):
-        items = parsed
-    else:
-        raise ValueError("Unexpected prompts file format; expected list or {prompts: [...]}")
-
-    prompts: list[types.Prompt] = []
-    for item in items:
-        if not isinstance(item, dict) or "name" not in item:
-            continue
-        args_raw = item.get("arguments") or []
-        args: list[types.PromptArgument] = []
-        for a in args_raw:
-            if not isinstance(a, dict) or "name" not in a:
-                continue
-            # Use indexing to ensure `name` is present and not None for typing
-            args.append(
-                types.PromptArgument(name=a["name"], description=a.get("description"), required=a.get("required"))
+@app.tool()
+@_timed
+@_with_deadline
+async def verify_location_proofs(
+    uids: Optional[List[str]] = None,
+    proofs: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, object]:
+    """
+    Check whether location proofs are genuine by verifying their EAS signatures.
+
+    For each proof the EIP-712 signer is recovered from its signed offchain attestation and compared with
+    the proof's attester, the signing domain is checked against the EAS contract on the proof's chain, and
+    the signed UID, location payload, recipient, time and schema are compared with the decoded fields. Large
+    batches run in a process pool; verdicts are cached per UID and content, so re-checking an unchanged proof
+    is free.
+
+    Args:
+        uids (Optional[List[str]]): Up to 500 UIDs to fetch and verify.
+        proofs (Optional[List[Dict]]): Proof objects to verify as given, e.g. the `data` of an earlier
+            query result. Up to 500.
+
+    Returns:
+        Dict[str, Any]: `verdicts` (per proof: uid, verdict "valid"/"invalid"/"unverified"/"unverifiable",
+            recovered signer, checks and reasons), `summary` counts, `missing` UIDs and `verification` (cached/computed counts).
+    """
+    try:
+        if (uids is None) == (proofs is None):
+            raise ValueError("exactly one of uids or proofs is required")
+        items = uids if uids is not None else proofs
+        if not isinstance(items, list) or not items:
+            raise ValueError("uids/proofs must be a non-empty list")
+        if len(items) > VERIFY_MAX_PROOFS:
+            raise ValueError(f"at most {VERIFY_MAX_PROOFS} proofs can be verified at once")
+        if proofs is not None and not all(isinstance(p, dict) for p in proofs):
+            raise ValueError("proofs must be a list of proof objects")
+        for uid in uids or []:
+            if not isinstance(uid, str) or not re.match(r"^0x[a-fA-F0-9]{64}$", uid):
+                raise ValueError(f"uid {uid!r} must be a 66-character hexadecimal string starting with 0x")
+
+        started = time.perf_counter()
+        missing: List[str] = []
+        if uids is not None:
+            unique = list(dict.fromkeys(uids))
+            logger.info("Fetching %s location proofs to verify", len(unique), extra=SAMPLED)
+            # GraphQL selects only the decoded fields; the signed attestation and schema come over REST
+            found = await _fetch_location_proofs_by_uid(unique, backend="rest")
+            atts = [att for att in found if att is not None]
+            missing = [uid for uid, att in zip(unique, found) if att is None]
+        else:
+            atts = proofs  # type: ignore[assignment]
+
+        verdicts, verification = await _verifier.verify(atts)
+        summary = {verdict: 0 for verdict in ("valid", "invalid", "unverified", "unverifiable")}
+        for v in verdicts:
+            summary[v["verdict"]] += 1  # type: ignore[index]
+        logger.info("Verified %s location proofs: %s", len(verdicts), summary, extra=SAMPLED)
+
+        return {
+            "success": True,
+            "verdicts": verdicts,
+            "count": len(verdicts),
+            "summary": summary,
+            "missing": missing,
+            "verification": verification,
+            "response_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    except ValueError as e:
+        error_msg = f"Invalid parameter: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "validation_error",
+            "message": error_msg,
+            "details": {"parameter_validation": f"{e!s}"},
+        }
+    except RuntimeError as e:
+        error_msg = f"Verification unavailable: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "dependency_error",
+            "message": error_msg,
+            "details": {"package": "eth-account"},
+        }
+    except httpx.TimeoutException:
+        error_msg = f"Request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+    except httpx.HTTPStatusError as e:
+        error_msg = f"API request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+    except GraphQLError as e:
+        error_msg = f"GraphQL request failed: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {"graphql_errors": e.errors},
+        }
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error verifying location proofs: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+@app.tool()
+@_timed
+@_with_deadline
+async def get_astral_config() -> Dict[str, object]:
+    """
+    Get Astral API configuration information including supported chains and schemas.
+
+    Provides configuration data to help users understand which chains, schemas, and capabilities are supported
+        by the Astral API for making informed queries.
+
+    Returns:
+        Dict[str, Any]: Configuration data including chains, schemas, and API capabilities
+
+    Raises:
+        Exception: If the configuration endpoint is unavailable
+    """
+    try:
+        async with _new_client() as client:
+            logger.info("Fetching Astral API configuration from: %s", ASTRAL_CONFIG_ENDPOINT, extra=SAMPLED)
+
+            response = await client.get(
+                ASTRAL_CONFIG_ENDPOINT,
+                timeout=request_timeout(DEFAULT_TIMEOUT),
+                extensions=http_trace_extensions(),
             )
-        prompt = types.Prompt(
-            name=item["name"],
-            description=item.get("description"),
-            arguments=args or None,
-            _meta=item.get("meta"),
-        )
-        prompts.append(prompt)
+            response.raise_for_status()
+
+            config_data = _decode_json(response)
+
+            result = {
+                "success": True,
+                "data": config_data,
+                "endpoint": ASTRAL_CONFIG_ENDPOINT,
+                "response_code": response.status_code,
+                "response_time_ms": (
+                    int(response.elapsed.total_seconds() * 1000)
+                    if response.elapsed is not None
+                    else None
+                ),
+            }
+
+            logger.info("Successfully retrieved Astral API configuration", extra=SAMPLED)
+            return result
+
+    except httpx.TimeoutException:
+        error_msg = f"Configuration request timed out after {DEFAULT_TIMEOUT} seconds"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "timeout_error",
+            "message": error_msg,
+            "details": {"timeout_seconds": DEFAULT_TIMEOUT},
+        }
+
+    except httpx.HTTPStatusError as e:
+        error_msg = f"Configuration request failed with status {e.response.status_code}"
+        logger.error("%s: %s", error_msg, e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH])
+        return {
+            "success": False,
+            "error": "api_error",
+            "message": error_msg,
+            "details": {
+                "status_code": e.response.status_code,
+                "response_text": e.response.text[:ERROR_TEXT_TRUNCATE_LENGTH],
+            },
+        }
+
+    except Exception as e:  # pragma: no cover
+        error_msg = f"Unexpected error fetching configuration: {e!s}"
+        logger.error(error_msg)
+        return {
+            "success": False,
+            "error": "unexpected_error",
+            "message": error_msg,
+            "details": {"exception_type": type(e).__name__},
+        }
+
+
+# File-backed prompts, parsed on the first list/get and reloaded when the file changes
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+_prompt_registry = PromptRegistry(
+    [
+        _REPO_ROOT / "prompts" / "prompts.yaml",
+        _REPO_ROOT / "prompts" / "prompts.yml",
+        _REPO_ROOT / "prompts" / "prompts.json",
+        _REPO_ROOT / ".vscode" / "mcp_prompts.yaml",
+        _REPO_ROOT / ".vscode" / "mcp_prompts.yml",
+        _REPO_ROOT / ".vscode" / "mcp_prompts.json",
+    ]
+)
+
+
+def _watch_id_from_uri(uri: str) -> str:
+    if not uri.startswith(WATCH_URI_PREFIX):
+        raise ValueError(f"Subscriptions are only supported for {WATCH_URI_PREFIX}{{watch_id}} resources")
+    watch_id = uri[len(WATCH_URI_PREFIX) :]
+    if _watch_registry.get(watch_id) is None:
+        raise ValueError(f"Unknown watch: {watch_id}")
+    return watch_id
+
+
+_subscription_handlers_registered = False
+
+
+def _register_subscription_handlers() -> None:
+    """Register resources/subscribe and resources/unsubscribe handlers for location proof watches."""
+    global _subscription_handlers_registered
+    if _subscription_handlers_registered:
+        return
+    server = app._mcp_server
+
+    @server.subscribe_resource()
+    async def _subscribe(uri: AnyUrl) -> None:
+        watch_id = _watch_id_from_uri(str(uri))
+        _watch_registry.subscribe(watch_id, server.request_context.session)
+        logger.info("Client subscribed to %s", uri)
 
-    return prompts
+    @server.unsubscribe_resource()
+    async def _unsubscribe(uri: AnyUrl) -> None:
+        watch_id = _watch_id_from_uri(str(uri))
+        _watch_registry.unsubscribe(watch_id, server.request_context.session)
+        logger.info("Client unsubscribed from %s", uri)
+
+    # The low-level server always reports subscribe=False; advertise support now that handlers exist
+    base_get_capabilities = server.get_capabilities
+
+    def get_capabilities(notification_options, experimental_capabilities):  # type: ignore[no-untyped-def]
+        capabilities = base_get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities  # type: ignore[method-assign]
+    _subscription_handlers_registered = True
+
+
+_prompt_handlers_registered = False
 
 
-# Simple implementation - disable prompt registration entirely for now
 def _register_prompt_handlers() -> None:
-    """Prompt handlers registration is disabled to avoid FastMCP compatibility issues."""
-    logger.info("Prompt handlers registration skipped - prompts functionality disabled")
+    """Serve prompts/list and prompts/get from the file-backed prompt registry."""
+    global _prompt_handlers_registered
+    if _prompt_handlers_registered:
+        return
+    server = app._mcp_server
+
+    # These replace FastMCP's handlers, which only know prompts declared with @app.prompt()
+    @server.list_prompts()
+    async def _list_prompts() -> list[types.Prompt]:
+        return _prompt_registry.list()
+
+    @server.get_prompt()
+    async def _get_prompt(name: str, arguments: dict[str, str] | None) -> types.GetPromptResult:
+        return _prompt_registry.render(name, arguments)
+
+    _prompt_handlers_registered = True
 
 
 def main() -> None:
@@ -515,17 +2629,18 @@ def main() -> None:
 
     This function starts the FastMCP server and handles the event loop.
     """
-    logger.info(f"Starting {SERVER_NAME} v{SERVER_VERSION}")
+    logger.info("Starting %s v%s", SERVER_NAME, SERVER_VERSION)
 
     try:
         # Register handlers that require decorator factories before running
         _register_prompt_handlers()
+        _register_subscription_handlers()
 
         app.run()
     except KeyboardInterrupt:
         logger.info("Server shutdown requested")
     except Exception as e:  # pragma: no cover
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         raise
 
 
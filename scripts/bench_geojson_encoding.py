@@ -0,0 +1,75 @@
+"""Benchmark FeatureCollection encodings: payload bytes and encode time.
+
+Compares the current full-precision GeoJSON output against rounded GeoJSON, TopoJSON-style
+quantized coordinates and the Geobuf-like binary blob, over synthetic attestations with
+full-precision random coordinates.
+
+Usage:
+    poetry run python scripts/bench_geojson_encoding.py [--sizes 1000 10000 50000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from astral_mcp_server.helpers import encode_feature_collection, feature_collection_from_attestations
+
+CASES: Dict[str, Callable[[Dict[str, object]], object]] = {
+    "geojson (current)": lambda fc: fc,
+    "geojson precision=6": lambda fc: encode_feature_collection(fc, "geojson", 6),
+    "quantized precision=6": lambda fc: encode_feature_collection(fc, "quantized", 6),
+    "geobuf precision=6": lambda fc: encode_feature_collection(fc, "geobuf", 6),
+}
+
+
+def synthetic_attestations(count: int, seed: int = 7) -> List[Dict[str, object]]:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    provers = ["0x" + f"{rng.getrandbits(160):040x}" for _ in range(max(1, count // 100))]
+    return [
+        {
+            "uid": "0x" + f"{rng.getrandbits(256):064x}",
+            "chain": rng.choice(["sepolia", "base", "celo", "arbitrum"]),
+            "prover": rng.choice(provers),
+            "subject": rng.choice(provers),
+            "timestamp": (start + timedelta(seconds=i * 37)).isoformat(),
+            "longitude": rng.uniform(-180.0, 180.0),
+            "latitude": rng.uniform(-85.0, 85.0),
+            "revoked": rng.random() < 0.01,
+        }
+        for i in range(count)
+    ]
+
+
+def bench(size: int, repeat: int) -> None:
+    fc = feature_collection_from_attestations(synthetic_attestations(size))
+    baseline_bytes = None
+    print(f"\n{size} features")
+    print(f"{'encoding':<24}{'bytes':>12}{'ratio':>8}{'encode ms':>12}")
+    for name, encode in CASES.items():
+        best = float("inf")
+        payload = b""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payload = json.dumps(encode(fc), separators=(",", ":")).encode("utf-8")
+            best = min(best, time.perf_counter() - started)
+        baseline_bytes = baseline_bytes or len(payload)
+        print(f"{name:<24}{len(payload):>12}{len(payload) / baseline_bytes:>8.2f}{best * 1000:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark location proof verification: inline vs thread vs process pool, and cache reuse.
+
+Signs synthetic EAS offchain attestations with throwaway keys, then verifies batches of
+each size inline, on one worker thread and in the process pool, and reruns the pool batch
+to measure cache hits. Requires the `verify` extra.
+
+Usage:
+    poetry run python scripts/bench_verify.py [--sizes 100 250 500] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from eth_account import Account
+
+from astral_mcp_server.helpers import ProofVerifier
+from astral_mcp_server.helpers.verification import offchain_uid, verify_batch
+
+DOMAIN = {
+    "name": "EAS Attestation",
+    "version": "1.0.1",
+    "chainId": 11155111,
+    "verifyingContract": "0xC2679fBD37d54388Ce493F1DB75320D236e1815e",
+}
+TYPES = {
+    "Attest": [
+        {"name": "version", "type": "uint16"},
+        {"name": "schema", "type": "bytes32"},
+        {"name": "recipient", "type": "address"},
+        {"name": "time", "type": "uint64"},
+        {"name": "expirationTime", "type": "uint64"},
+        {"name": "revocable", "type": "bool"},
+        {"name": "refUID", "type": "bytes32"},
+        {"name": "data", "type": "bytes"},
+    ]
+}
+
+
+def signed_proofs(count: int) -> List[Dict[str, object]]:
+    accounts = [Account.create() for _ in range(max(1, count // 50))]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    proofs = []
+    for i in range(count):
+        account = accounts[i % len(accounts)]
+        ts = start + timedelta(seconds=i * 37)
+        message = {
+            "version": 1,
+            "schema": "0x" + "11" * 32,
+            "recipient": "0x" + f"{i:040x}",
+            "time": int(ts.timestamp()),
+            "expirationTime": 0,
+            "revocable": True,
+            "refUID": "0x" + "00" * 32,
+            "data": "0x" + os.urandom(96).hex(),
+        }
+        signature = Account.sign_typed_data(account.key, domain_data=DOMAIN, message_types=TYPES, message_data=message)
+        uid = offchain_uid(message)
+        proofs.append(
+            {
+                "uid": uid,
+                "chain": "sepolia",
+                "prover": account.address,
+                "subject": message["recipient"],
+                "schema": message["schema"],
+                "timestamp": ts.isoformat(),
+                "sig": {
+                    "domain": DOMAIN,
+                    "primaryType": "Attest",
+                    "types": TYPES,
+                    "message": message,
+                    "signature": {"v": signature.v, "r": hex(signature.r), "s": hex(signature.s)},
+                    "uid": uid,
+                },
+            }
+        )
+    return proofs
+
+
+async def bench(size: int, workers: int) -> None:
+    proofs = signed_proofs(size)
+    print(f"\n{size} proofs")
+    print(f"{'mode':<20}{'seconds':>10}{'proofs/s':>12}")
+
+    started = time.perf_counter()
+    verify_batch(proofs)
+    elapsed = time.perf_counter() - started
+    print(f"{'inline':<20}{elapsed:>10.3f}{size / elapsed:>12.0f}")
+
+    for label, min_batch in (("thread", size + 1), (f"process x{workers}", 1)):
+        verifier = ProofVerifier(max_workers=workers, pool_min_batch=min_batch, cache_size=size, cache_ttl=600.0)
+        if min_batch == 1:
+            # Start the workers outside the measurement; the server keeps its pool warm
+            await verifier.verify(signed_proofs(workers))
+        started = time.perf_counter()
+        verdicts, _ = await verifier.verify(proofs)
+        elapsed = time.perf_counter() - started
+        assert all(v["verdict"] == "valid" for v in verdicts)
+        print(f"{label:<20}{elapsed:>10.3f}{size / elapsed:>12.0f}")
+        if min_batch == 1:
+            started = time.perf_counter()
+            _, stats = await verifier.verify(proofs)
+            elapsed = time.perf_counter() - started
+            assert stats["cached"] == size
+            print(f"{'cached rerun':<20}{elapsed:>10.3f}{size / elapsed:>12.0f}")
+        verifier.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 500])
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+    for size in args.sizes:
+        asyncio.run(bench(size, args.workers))
+
+
+if __name__ == "__main__":
+    main()
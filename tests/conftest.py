@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the Astral MCP Server tests
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import format_timestamp, parse_timestamp
+
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def json_response(status_code: int, payload: object) -> httpx.Response:
+    """Build a streamed JSON response so httpx records `elapsed` as it would for a real server."""
+    return httpx.Response(
+        status_code,
+        headers={"content-type": "application/json"},
+        stream=httpx.ByteStream(json.dumps(payload).encode("utf-8")),
+    )
+
+
+def make_proofs(count: int, *, step_seconds: float = 60.0, chain: str = "sepolia") -> List[Dict[str, object]]:
+    """Build `count` synthetic attestations spread over time and a small lon/lat grid."""
+    proofs: List[Dict[str, object]] = []
+    for i in range(count):
+        proofs.append(
+            {
+                "uid": "0x" + f"{i:064x}",
+                "chain": chain,
+                "prover": "0x" + "ab" * 20,
+                "subject": "0x" + "cd" * 20,
+                "timestamp": format_timestamp(BASE_TIME + timedelta(seconds=i * step_seconds)),
+                "longitude": -122.5 + (i % 50) * 0.01,
+                "latitude": 37.7 + (i // 50 % 50) * 0.01,
+                "revoked": False,
+            }
+        )
+    return proofs
+
+
+class FakeAstralAPI:
+    """In-memory stand-in for the Astral REST API, mounted through an httpx MockTransport."""
+
+    def __init__(self, proofs: List[Dict[str, object]]) -> None:
+        self.proofs = proofs
+        self.requests: List[httpx.Request] = []
+
+    def _matches(self, att: Dict[str, object], q: httpx.QueryParams) -> bool:
+        for key in ("chain", "prover", "subject"):
+            if key in q and att.get(key) != q[key]:
+                return False
+        ts = parse_timestamp(att.get("timestamp"))
+        if "fromTimestamp" in q and ts < parse_timestamp(q["fromTimestamp"]):
+            return False
+        if "toTimestamp" in q and ts > parse_timestamp(q["toTimestamp"]):
+            return False
+        if "bbox" in q:
+            min_lng, min_lat, max_lng, max_lat = (float(v) for v in q["bbox"].split(","))
+            lon, lat = float(att["longitude"]), float(att["latitude"])
+            if not (min_lng <= lon <= max_lng and min_lat <= lat <= max_lat):
+                return False
+        return True
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path.endswith("/location-proofs"):
+            q = request.url.params
+            rows = [a for a in self.proofs if self._matches(a, q)]
+            limit = int(q.get("limit", 10))
+            offset = int(q.get("offset", 0))
+            page = rows[offset : offset + limit]
+            return json_response(200, {"data": page, "pagination": {"total": len(rows), "limit": limit, "offset": offset}})
+        if "/location-proofs/" in path:
+            uid = path.rsplit("/", 1)[-1]
+            for att in self.proofs:
+                if att["uid"] == uid:
+                    return json_response(200, att)
+            return json_response(404, {"error": "not found"})
+        return httpx.Response(404)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch) -> Callable[[Optional[List[Dict[str, object]]]], FakeAstralAPI]:
+    """Route server upstream requests to a FakeAstralAPI holding the given proofs."""
+
+    def install(proofs: Optional[List[Dict[str, object]]] = None) -> FakeAstralAPI:
+        api = FakeAstralAPI(proofs if proofs is not None else make_proofs(250))
+        monkeypatch.setattr(server, "_new_client", api.client)
+        return api
+
+    return install
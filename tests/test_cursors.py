@@ -0,0 +1,41 @@
+"""
+Tests for cursor-based resumable result sets
+"""
+
+import pytest
+
+from .conftest import make_proofs
+
+
+@pytest.mark.asyncio
+async def test_fetch_next_walks_result_set_from_buffer(fake_api) -> None:
+    from astral_mcp_server.server import fetch_next, query_location_proofs
+
+    api = fake_api(make_proofs(125))
+    first = await query_location_proofs(limit=50)
+    assert first["success"] is True
+    assert first["cursor"]
+
+    seen = [p["uid"] for p in first["data"]]
+    cursor = first["cursor"]
+    buffered_pages = 0
+    while cursor:
+        page = await fetch_next(cursor)
+        assert page["success"] is True
+        seen.extend(p["uid"] for p in page["data"])
+        buffered_pages += page["served_from_buffer"]
+        cursor = page["cursor"]
+
+    assert seen == [p["uid"] for p in make_proofs(125)]
+    # One query plus a single read-ahead request covered the remaining pages
+    assert len(api.requests) == 2
+    assert buffered_pages == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_next_unknown_cursor() -> None:
+    from astral_mcp_server.server import fetch_next
+
+    result = await fetch_next("not-a-cursor")
+    assert result["success"] is False
+    assert result["error"] == "cursor_not_found"
@@ -0,0 +1,84 @@
+"""
+Tests for per-call deadline propagation and cancellation
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import deadline_from_meta, deadline_scope, remaining, request_timeout
+
+from .conftest import FakeAstralAPI, make_proofs
+
+
+class SlowAstralAPI(FakeAstralAPI):
+    """FakeAstralAPI whose requests after the first `fast_requests` hang until cancelled."""
+
+    def __init__(self, proofs, fast_requests: int) -> None:
+        super().__init__(proofs)
+        self.fast_requests = fast_requests
+        self.started = asyncio.Event()
+        self.cancelled = 0
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        if len(self.requests) >= self.fast_requests:
+            self.started.set()
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return self.handler(request)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.async_handler))
+
+
+def test_deadline_from_meta() -> None:
+    assert deadline_from_meta(None) is None
+    assert deadline_from_meta({"progressToken": 1}) is None
+    assert deadline_from_meta({"timeoutMs": 2500}) == 2.5
+    now = 1_760_000_000.0
+    assert deadline_from_meta({"deadline": now + 10}, now=now) == 10.0
+    assert deadline_from_meta({"deadline": (now + 10) * 1000}, now=now) == 10.0
+
+
+def test_nested_scopes_only_shorten() -> None:
+    assert remaining() is None
+    with deadline_scope(5.0):
+        with deadline_scope(60.0):
+            assert remaining() <= 5.0
+            assert request_timeout(30.0) <= 5.0
+        with deadline_scope(60.0, inherit=False):
+            assert remaining() > 5.0
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_returns_partial_results_at_deadline(monkeypatch) -> None:
+    api = SlowAstralAPI(make_proofs(250), fast_requests=1)
+    monkeypatch.setattr(server, "_new_client", api.client)
+    monkeypatch.setitem(server.TOOL_DEADLINE_SECONDS, "query_location_proofs_bulk", 0.2)
+
+    result = await server.query_location_proofs_bulk(max_results=250)
+
+    assert result["success"] is True
+    assert result["count"] == 100
+    assert result["plan"]["deadline_exceeded"] is True
+    assert result["plan"]["truncated"] is True
+    assert api.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_call_cancels_upstream_request(monkeypatch) -> None:
+    api = SlowAstralAPI(make_proofs(10), fast_requests=0)
+    monkeypatch.setattr(server, "_new_client", api.client)
+
+    task = asyncio.create_task(server.query_location_proofs(limit=5))
+    await asyncio.wait_for(api.started.wait(), 1.0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert api.cancelled == 1
@@ -0,0 +1,74 @@
+"""
+Tests for since_result diffs of repeated queries
+"""
+
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import ResultFingerprintStore
+
+from .conftest import make_proofs
+
+
+def test_diff_reports_added_removed_and_revoked() -> None:
+    store = ResultFingerprintStore(8, 600.0)
+    before = make_proofs(5)
+    token = store.register("q", before)
+
+    after = [dict(p) for p in before[1:]] + make_proofs(7)[5:]
+    after[0]["revoked"] = True
+    changes = store.diff(token, "q", after)
+
+    assert [p["uid"] for p in changes["added"]] == [make_proofs(7)[i]["uid"] for i in (5, 6)]
+    assert changes["removed"] == [before[0]["uid"]]
+    assert [p["uid"] for p in changes["revoked"]] == [before[1]["uid"]]
+    assert changes["unchanged"] == 3
+
+    # The same set under the same query maps to the same token
+    assert store.register("q", before) == token
+    assert store.register("other", before) != token
+    assert store.diff("unknown", "q", after) is None
+    with pytest.raises(ValueError):
+        store.diff(token, "other", after)
+
+
+@pytest.mark.asyncio
+async def test_query_tools_return_changes_since_result(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_result_fingerprints", ResultFingerprintStore(8, 600.0))
+    api = fake_api(make_proofs(120))
+
+    first = await server.query_location_proofs_bulk(chain="sepolia")
+    token = first["result_token"]
+    unchanged = await server.query_location_proofs_bulk(chain="sepolia", since_result=token)
+
+    assert "data" not in unchanged and unchanged["result_token"] == token
+    assert unchanged["delta"] == {"since_result": token, "added": 0, "removed": 0, "revoked": 0, "unchanged": 120}
+
+    api.proofs = api.proofs[1:] + make_proofs(121)[120:]
+    api.proofs[0]["revoked"] = True
+    changed = await server.query_location_proofs_bulk(chain="sepolia", since_result=token, geojson_block=True)
+
+    result, fc = changed[0]["data"], changed[1]["data"]
+    assert result["delta"]["added"] == 1 and result["delta"]["revoked"] == 1
+    assert result["changes"]["removed"] == [first["data"][0]["uid"]]
+    assert result["count"] == 120 and result["result_token"] != token
+    assert len(fc["features"]) == 2
+
+    page = await server.query_location_proofs(chain="sepolia", limit=5, since_result=token)
+    assert page["error"] == "validation_error"
+
+    expired = await server.query_location_proofs(chain="sepolia", limit=5, since_result="gone")
+    assert expired["delta"] == {"since_result": "gone", "expired": True}
+    assert len(expired["data"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_delta_of_truncated_result_is_marked(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_result_fingerprints", ResultFingerprintStore(8, 600.0))
+    fake_api(make_proofs(150))
+
+    first = await server.query_location_proofs_bulk(chain="sepolia", max_results=100)
+    again = await server.query_location_proofs_bulk(chain="sepolia", max_results=100, since_result=first["result_token"])
+
+    assert first["plan"]["truncated"] is True
+    assert again["delta"]["truncated"] is True and again["delta"]["unchanged"] == 100
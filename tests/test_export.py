@@ -0,0 +1,101 @@
+"""
+Tests for streaming exports of location proofs
+"""
+
+import json
+
+import pytest
+
+from .conftest import make_proofs
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    from astral_mcp_server import server
+
+    monkeypatch.setattr(server, "EXPORT_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_geojsonseq(fake_api, export_dir) -> None:
+    from astral_mcp_server.server import export_location_proofs
+
+    fake_api(make_proofs(230))
+    result = await export_location_proofs(output_format="ndjson", filename="all")
+    assert result["success"] is True
+    assert result["rows"] == 230
+    assert result["upstream_requests"] == 3
+    assert result["path"].endswith("all.ndjson")
+    lines = (export_dir / "all.ndjson").read_text().splitlines()
+    assert json.loads(lines[0])["uid"] == make_proofs(1)[0]["uid"]
+    assert result["bbox"] == [-122.5, 37.7, pytest.approx(-122.01), pytest.approx(37.74)]
+
+    result = await export_location_proofs(output_format="geojsonseq", max_results=150)
+    assert result["rows"] == 150
+    assert result["truncated"] is True
+    records = open(result["path"], encoding="utf-8").read().split("\x1e")[1:]
+    assert json.loads(records[0])["type"] == "Feature"
+    assert not list(export_dir.glob(".*partial*"))
+
+
+@pytest.mark.asyncio
+async def test_export_geoparquet(fake_api, export_dir) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    from astral_mcp_server.server import export_location_proofs
+
+    fake_api(make_proofs(120))
+    result = await export_location_proofs(output_format="geoparquet")
+    assert result["success"] is True
+    table = pq.read_table(result["path"])
+    assert table.num_rows == 120
+    assert b"geo" in table.schema.metadata
+
+
+@pytest.mark.asyncio
+async def test_export_validation(export_dir) -> None:
+    from astral_mcp_server.server import export_location_proofs
+
+    result = await export_location_proofs(output_format="shapefile")
+    assert result["error"] == "validation_error"
+    result = await export_location_proofs(filename="../escape")
+    assert result["error"] == "validation_error"
+
+
+def test_writer_without_close_cannot_be_created(tmp_path) -> None:
+    from astral_mcp_server.helpers import ExportWriter
+
+    class RowsOnly(ExportWriter):
+        def _write_rows(self, rows) -> None:
+            pass
+
+    with pytest.raises(TypeError):
+        RowsOnly(tmp_path / "out.ndjson")
+
+
+@pytest.mark.asyncio
+async def test_export_refuses_to_overwrite_unless_asked(fake_api, export_dir) -> None:
+    from astral_mcp_server.server import export_location_proofs
+
+    fake_api(make_proofs(20))
+    (export_dir / "kept.ndjson").write_text("earlier export\n")
+
+    result = await export_location_proofs(filename="kept")
+    assert result["error"] == "validation_error"
+    assert (export_dir / "kept.ndjson").read_text() == "earlier export\n"
+
+    result = await export_location_proofs(filename="kept", overwrite=True)
+    assert result["rows"] == 20
+    assert len((export_dir / "kept.ndjson").read_text().splitlines()) == 20
+
+
+@pytest.mark.asyncio
+async def test_missing_dependency_is_reported(fake_api, export_dir, monkeypatch) -> None:
+    from astral_mcp_server.helpers import export
+    from astral_mcp_server.server import export_location_proofs
+
+    monkeypatch.setattr(export, "fiona", None)
+    fake_api(make_proofs(5))
+    result = await export_location_proofs(output_format="flatgeobuf")
+    assert result["error"] == "dependency_error"
+    assert not list(export_dir.iterdir())
@@ -0,0 +1,55 @@
+"""
+Tests for compact FeatureCollection encodings
+"""
+
+import base64
+
+import pytest
+
+from astral_mcp_server.helpers import (
+    decode_geobuf,
+    dequantize_feature_collection,
+    encode_feature_collection,
+    feature_collection_from_attestations,
+)
+
+from .conftest import make_proofs
+
+
+def _coords(fc):
+    return [f["geometry"]["coordinates"] for f in fc["features"]]
+
+
+def test_precision_and_quantized_round_trip() -> None:
+    fc = feature_collection_from_attestations(make_proofs(120))
+    fc["features"][0]["geometry"]["coordinates"] = [-122.123456789, 37.987654321]
+
+    rounded = encode_feature_collection(fc, precision=3)
+    assert rounded["features"][0]["geometry"]["coordinates"] == [-122.123, 37.988]
+    assert rounded["features"][0]["properties"] == fc["features"][0]["properties"]
+
+    quantized = encode_feature_collection(fc, "quantized", precision=5)
+    assert all(isinstance(v, int) and v >= 0 for xy in _coords(quantized) for v in xy)
+    restored = dequantize_feature_collection(quantized)
+    for (x, y), (x0, y0) in zip(_coords(restored), _coords(fc)):
+        assert x == pytest.approx(x0, abs=1e-5) and y == pytest.approx(y0, abs=1e-5)
+
+
+def test_geobuf_round_trip_and_size() -> None:
+    fc = feature_collection_from_attestations(make_proofs(500))
+    encoded = encode_feature_collection(fc, "geobuf")
+    assert encoded["type"] == "Geobuf" and encoded["features"] == 500
+
+    decoded = decode_geobuf(base64.b64decode(encoded["data"]))
+    assert [f["properties"] for f in decoded["features"]] == [f["properties"] for f in fc["features"]]
+    for (x, y), (x0, y0) in zip(_coords(decoded), _coords(fc)):
+        assert x == pytest.approx(x0, abs=1e-6) and y == pytest.approx(y0, abs=1e-6)
+    assert len(encoded["data"]) < len(str(fc)) / 2
+
+
+def test_invalid_encoding_options() -> None:
+    fc = feature_collection_from_attestations(make_proofs(1))
+    with pytest.raises(ValueError):
+        encode_feature_collection(fc, "topojson")
+    with pytest.raises(ValueError):
+        encode_feature_collection(fc, precision=12)
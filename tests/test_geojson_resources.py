@@ -0,0 +1,43 @@
+"""
+Tests for lazily built GeoJSON resources
+"""
+
+import json
+
+import pytest
+
+from astral_mcp_server.helpers import GEOJSON_URI_PREFIX
+
+from .conftest import make_proofs
+
+
+@pytest.mark.asyncio
+async def test_geojson_resource_built_on_first_read(fake_api) -> None:
+    from astral_mcp_server import server
+
+    fake_api(make_proofs(30))
+    builds = server._geojson_resources.builds
+    result = await server.query_location_proofs(limit=10, geojson_block=True, geojson_resource=True)
+
+    # Only the result dict is returned; nothing is built until the URI is read
+    assert isinstance(result, dict)
+    uri = result["geojson_resource"]
+    assert uri.startswith(GEOJSON_URI_PREFIX)
+    assert server._geojson_resources.builds == builds
+
+    contents = list(await server.app.read_resource(uri))
+    collection = json.loads(contents[0].content)
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) == 10
+    assert server._geojson_resources.builds == builds + 1
+
+    await server.app.read_resource(uri)
+    assert server._geojson_resources.builds == builds + 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_geojson_resource() -> None:
+    from astral_mcp_server import server
+
+    with pytest.raises(Exception):
+        await server.app.read_resource(GEOJSON_URI_PREFIX + "missing")
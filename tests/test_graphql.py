@@ -0,0 +1,188 @@
+"""
+Tests for the batched GraphQL backend, served by a local http.server stub
+"""
+
+import asyncio
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import GraphQLBatcher, TileCache, build_batch_query, deadline_scope, remaining
+
+from .conftest import FakeAstralAPI, json_response, make_proofs
+
+FAILING_UID = "0x" + "ee" * 32
+ALIAS_RE = re.compile(r"(\w+): (locationProofs|locationProof)\(")
+
+
+class GraphQLStub(FakeAstralAPI):
+    """Answers aliased `locationProofs` / `locationProof` queries from in-memory proofs."""
+
+    def __init__(self, proofs: List[Dict[str, object]]) -> None:
+        super().__init__(proofs)
+        self.payloads: List[Dict[str, object]] = []
+
+    def _page(self, filter_vars: Dict[str, object]) -> Dict[str, object]:
+        q = httpx.QueryParams({k: ",".join(str(c) for c in v) if isinstance(v, list) else v for k, v in filter_vars.items()})
+        rows = [a for a in self.proofs if self._matches(a, q)]
+        limit = int(q.get("limit", 10))
+        offset = int(q.get("offset", 0))
+        return {"data": rows[offset : offset + limit], "pagination": {"total": len(rows), "limit": limit, "offset": offset}}
+
+    def execute(self, payload: Dict[str, object]) -> Dict[str, object]:
+        self.payloads.append(payload)
+        variables = payload["variables"]
+        data: Dict[str, object] = {}
+        errors: List[object] = []
+        for alias, field in ALIAS_RE.findall(payload["query"]):
+            if field == "locationProofs":
+                data[alias] = self._page(variables[alias])
+            elif variables[alias] == FAILING_UID:
+                data[alias] = None
+                errors.append({"message": "lookup failed", "path": [alias]})
+            else:
+                data[alias] = next((a for a in self.proofs if a["uid"] == variables[alias]), None)
+        body: Dict[str, object] = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+
+@pytest.fixture
+def graphql_stub(monkeypatch: pytest.MonkeyPatch):
+    stub = GraphQLStub(make_proofs(80))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            body = json.dumps(stub.execute(payload)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(server, "ASTRAL_BACKEND", "graphql")
+    monkeypatch.setattr(server, "ASTRAL_GRAPHQL_ENDPOINT", f"http://127.0.0.1:{httpd.server_port}/graphql")
+    try:
+        yield stub
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_build_batch_query_aliases_filter_sets_and_uids() -> None:
+    payload = build_batch_query([{"chain": "sepolia", "bbox": "1,2,3,4", "limit": "10"}], ["0xabc", "0xdef"])
+
+    assert "q0: locationProofs(filter: $q0)" in payload["query"]
+    assert "u1: locationProof(uid: $u1)" in payload["query"]
+    assert "fragment ProofFields on LocationProof" in payload["query"]
+    assert payload["variables"] == {
+        "q0": {"chain": "sepolia", "bbox": [1.0, 2.0, 3.0, 4.0], "limit": 10},
+        "u0": "0xabc",
+        "u1": "0xdef",
+    }
+
+
+@pytest.mark.asyncio
+async def test_uid_lookups_share_one_request(graphql_stub) -> None:
+    wanted = [p["uid"] for p in graphql_stub.proofs[:5]]
+    absent = "0x" + "ff" * 32
+
+    result = await server.get_location_proofs_by_uids(uids=wanted + [absent, wanted[0]], geojson_block=True)
+
+    assert len(graphql_stub.payloads) == 1
+    assert isinstance(result, list)
+    body, fc = result[0]["data"], result[1]["data"]
+    assert [p["uid"] for p in body["data"]] == wanted
+    assert body["missing"] == [absent]
+    assert len(fc["features"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_tile_fan_out_is_batched(graphql_stub, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_tile_cache", TileCache(10, 64, 300.0))
+
+    result = await server.query_location_proofs(bbox="-122.6,37.6,-121.9,38.3", limit=100, use_tile_cache=True)
+
+    assert result["success"] is True
+    assert result["tile_cache"]["tiles"] > 1
+    assert result["pagination"]["total"] == 80
+    assert len(graphql_stub.payloads) == 1
+
+
+@pytest.mark.asyncio
+async def test_alias_error_is_reported(graphql_stub) -> None:
+    result = await server.get_location_proofs_by_uids(uids=[graphql_stub.proofs[0]["uid"], FAILING_UID])
+
+    assert result["success"] is False
+    assert result["error"] == "api_error"
+    assert result["details"]["graphql_errors"][0]["path"] == ["u1"]
+
+
+@pytest.mark.asyncio
+async def test_page_and_uid_tools_use_the_graphql_backend(graphql_stub) -> None:
+    uid = graphql_stub.proofs[3]["uid"]
+
+    page = await server.query_location_proofs(chain="sepolia", limit=100)
+    single = await server.get_location_proof_by_uid(uid)
+    missing = await server.get_location_proof_by_uid("0x" + "ff" * 32)
+
+    assert page["success"] is True and len(page["data"]) == 80
+    assert single["success"] is True and single["data"]["uid"] == uid
+    assert missing["error"] == "not_found"
+    assert len(graphql_stub.payloads) == 3
+
+
+@pytest.mark.asyncio
+async def test_batched_callers_keep_their_own_deadlines() -> None:
+    release = asyncio.Event()
+    seen_deadlines: List[object] = []
+
+    async def post(payload):
+        seen_deadlines.append(remaining())
+        await release.wait()
+        return {"data": {alias: {"uid": uid} for alias, uid in payload["variables"].items()}}
+
+    batcher = GraphQLBatcher(post, max_batch=10)
+
+    async def lookup(uid: str, seconds: float):
+        with deadline_scope(seconds):
+            return await batcher.proof(uid)
+
+    hasty = asyncio.create_task(lookup("0xaaa", 0.05))
+    patient = asyncio.create_task(lookup("0xbbb", 5.0))
+    with pytest.raises(TimeoutError):
+        await hasty
+    release.set()
+
+    assert await patient == {"uid": "0xbbb"}
+    assert batcher.requests == 1
+    assert seen_deadlines == [None]
+
+
+@pytest.mark.asyncio
+async def test_rest_uid_lookup_keeps_the_raw_response(monkeypatch) -> None:
+    att = make_proofs(1)[0]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return json_response(201, {"location_proof": att})
+
+    monkeypatch.setattr(server, "_new_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    result = await server.get_location_proof_by_uid(att["uid"])
+
+    assert result["data"] == {"location_proof": att}
+    assert result["response_code"] == 201
+    assert isinstance(result["response_time_ms"], int)
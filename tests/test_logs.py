@@ -0,0 +1,87 @@
+"""
+Tests for queued, sampled logging
+"""
+
+import logging
+
+import httpx
+import pytest
+
+from astral_mcp_server.helpers import SAMPLED, SamplingFilter, configure_logging
+from astral_mcp_server.helpers.logs import LazyQueueHandler
+
+from .conftest import json_response
+
+
+def _record(level: int, sampled: bool) -> logging.LogRecord:
+    record = logging.LogRecord("astral", level, __file__, 1, "message %s", ("arg",), None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_sampling_filter_drops_only_sampled_info() -> None:
+    rolls = iter([0.05, 0.5, 0.95])
+    sampler = SamplingFilter(0.1, rand=lambda: next(rolls))
+
+    assert sampler.filter(_record(logging.INFO, sampled=True)) is True
+    assert sampler.filter(_record(logging.INFO, sampled=True)) is False
+    assert sampler.filter(_record(logging.ERROR, sampled=True)) is True
+    assert sampler.filter(_record(logging.INFO, sampled=False)) is True
+    assert sampler.dropped == 1
+
+
+def test_queue_listener_formats_lazily(monkeypatch) -> None:
+    class Probe:
+        def __init__(self) -> None:
+            self.formatted = False
+
+        def __str__(self) -> str:
+            self.formatted = True
+            return "probe"
+
+    dropped = Probe()
+
+    captured = []
+
+    class Collect(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            captured.append(self.format(record))
+
+    listener = configure_logging(logging.INFO, sample_rate=0.0)
+    root = logging.getLogger()
+    # Only the queue handler should see records (pytest's capture handlers format eagerly)
+    monkeypatch.setattr(root, "handlers", [h for h in root.handlers if isinstance(h, LazyQueueHandler)])
+    collect = Collect()
+    listener.handlers = listener.handlers + (collect,)
+    try:
+        log = logging.getLogger("astral.test")
+        log.info("dropped %s", dropped, extra=SAMPLED)
+        log.info("kept %s", Probe())
+    finally:
+        listener.stop()
+        monkeypatch.undo()
+        configure_logging()
+
+    assert captured == ["kept probe"]
+    # The sampled-out record was never formatted
+    assert dropped.formatted is False
+
+
+@pytest.mark.asyncio
+async def test_error_body_truncated_in_logs(monkeypatch, caplog) -> None:
+    from astral_mcp_server import server
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return json_response(500, {"detail": "x" * 5000})
+
+    monkeypatch.setattr(server, "_new_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    with caplog.at_level(logging.ERROR, logger="astral_mcp_server.server"):
+        result = await server.get_location_proof_by_uid("0x" + "a" * 64)
+        with pytest.raises(Exception) as health_error:
+            await server.check_astral_api_health()
+
+    assert result["error"] == "api_error"
+    assert len(str(health_error.value)) < 1000
+    logged = [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR]
+    assert len(logged) == 2 and all(len(m) < 1000 for m in logged)
@@ -0,0 +1,95 @@
+"""
+Tests for the time-sharded query planner
+"""
+
+from typing import Dict, List, Union
+
+import pytest
+
+from astral_mcp_server.helpers import TimeShardedPlanner, merge_attestations, offset_walk, parse_timestamp
+
+from .conftest import FakeAstralAPI, make_proofs
+
+
+def _fetcher(api: FakeAstralAPI):
+    async def fetch_page(params: Dict[str, Union[str, int]]) -> object:
+        async with api.client() as client:
+            response = await client.get("https://fake/api/v0/location-proofs", params=params)
+            return response.json()
+
+    return fetch_page
+
+
+def test_merge_attestations_dedupes_and_orders() -> None:
+    proofs = make_proofs(5)
+    merged = merge_attestations([proofs[3:], proofs[:4], [proofs[0]]])
+    assert [p["uid"] for p in merged] == [p["uid"] for p in proofs]
+
+
+@pytest.mark.asyncio
+async def test_planner_matches_offset_walk() -> None:
+    # Uneven density: a burst of proofs one second apart followed by a sparse tail
+    proofs = make_proofs(600, step_seconds=1.0) + [
+        dict(p, uid="0x" + f"{i + 10_000:064x}") for i, p in enumerate(make_proofs(40, step_seconds=86_400.0))
+    ]
+    api = FakeAstralAPI(proofs)
+    fetch_page = _fetcher(api)
+    window = {"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00Z", "toTimestamp": "2025-03-01T00:00:00Z"}
+
+    naive = await offset_walk(fetch_page, window)
+    planner = TimeShardedPlanner(fetch_page, window, max_concurrency=4)
+    planned = await planner.run(parse_timestamp(window["fromTimestamp"]), parse_timestamp(window["toTimestamp"]))
+
+    assert [p["uid"] for p in planned.proofs] == [p["uid"] for p in naive.proofs]
+    assert len(planned.proofs) == len(proofs)
+    assert planned.shards > 1
+    assert not planned.truncated
+
+
+@pytest.mark.asyncio
+async def test_planner_respects_max_results() -> None:
+    api = FakeAstralAPI(make_proofs(500, step_seconds=10.0))
+    planner = TimeShardedPlanner(_fetcher(api), {}, max_results=150)
+    planned = await planner.run(parse_timestamp("2025-01-01T00:00:00Z"), parse_timestamp("2025-01-02T00:00:00Z"))
+    assert len(planned.proofs) == 150
+    assert planned.truncated
+
+
+@pytest.mark.parametrize("count, max_results", [(400, 150), (2000, 450), (2000, 1500)])
+@pytest.mark.asyncio
+async def test_truncated_plan_is_the_offset_walk_prefix(count: int, max_results: int) -> None:
+    # A dense burst one second apart, then a sparse daily tail, in time order
+    proofs = make_proofs(count - 100, step_seconds=1.0) + [
+        dict(p, uid="0x" + f"{i + 10_000:064x}") for i, p in enumerate(make_proofs(101, step_seconds=86_400.0)[1:])
+    ]
+    api = FakeAstralAPI(proofs)
+    fetch_page = _fetcher(api)
+    window = {"fromTimestamp": "2025-01-01T00:00:00Z", "toTimestamp": "2025-12-01T00:00:00Z"}
+
+    naive = await offset_walk(fetch_page, window, max_results=max_results)
+    naive_requests = len(api.requests)
+    planner = TimeShardedPlanner(fetch_page, window, max_results=max_results)
+    planned = await planner.run(parse_timestamp(window["fromTimestamp"]), parse_timestamp(window["toTimestamp"]))
+
+    assert [p["uid"] for p in planned.proofs] == [p["uid"] for p in naive.proofs]
+    assert planned.truncated and naive.truncated
+    if max_results <= 900:
+        # A budget a few pages deep is fetched as those offset pages, all at once
+        assert planned.requests == naive_requests
+
+
+@pytest.mark.asyncio
+async def test_bulk_tool_uses_planner(fake_api) -> None:
+    from astral_mcp_server.server import query_location_proofs_bulk
+
+    proofs: List[Dict[str, object]] = make_proofs(320, step_seconds=30.0)
+    fake_api(proofs)
+    result = await query_location_proofs_bulk(
+        from_timestamp="2025-01-01T00:00:00Z", to_timestamp="2025-01-02T00:00:00Z", max_results=1000
+    )
+    assert result["success"] is True
+    assert result["count"] == 320
+    assert result["plan"]["strategy"] == "time_sharded"
+
+    result = await query_location_proofs_bulk(max_results=0)
+    assert result["error"] == "validation_error"
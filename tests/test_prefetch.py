@@ -0,0 +1,96 @@
+"""
+Tests for speculative next-page prefetch
+"""
+
+import asyncio
+
+import pytest
+
+from astral_mcp_server.helpers import Prefetcher
+
+
+@pytest.mark.asyncio
+async def test_next_page_served_from_prefetch(fake_api, monkeypatch) -> None:
+    from astral_mcp_server import server
+    from astral_mcp_server.server import get_server_metrics, query_location_proofs
+
+    prefetcher = Prefetcher(server._prefetch_page, enabled=True, budget=4, max_concurrency=2, unused_ttl=30.0)
+    monkeypatch.setattr(server, "_prefetcher", prefetcher)
+    api = fake_api()
+
+    first = await query_location_proofs(limit=10, offset=0)
+    assert "prefetched" not in first
+    await asyncio.sleep(0.05)
+
+    second = await query_location_proofs(limit=10, offset=10)
+    assert second["prefetched"] is True
+    assert [p["uid"] for p in second["data"]] == [p["uid"] for p in api.proofs[10:20]]
+    # Query 1, prefetch of page 2, and the prefetch of page 3 scheduled after page 2 was served
+    await asyncio.sleep(0.05)
+    assert len(api.requests) == 3
+
+    metrics = await get_server_metrics()
+    assert metrics["prefetch"]["hits"] == 1
+    assert metrics["prefetch"]["hit_ratio"] == 0.5
+    prefetcher.cancel_all()
+
+
+@pytest.mark.asyncio
+async def test_fetch_next_takes_the_prefetched_page(fake_api, monkeypatch) -> None:
+    from astral_mcp_server import server
+    from astral_mcp_server.server import fetch_next, query_location_proofs
+
+    prefetcher = Prefetcher(server._prefetch_page, enabled=True, budget=4, max_concurrency=2, unused_ttl=30.0)
+    monkeypatch.setattr(server, "_prefetcher", prefetcher)
+    api = fake_api()
+
+    first = await query_location_proofs(limit=10)
+    await asyncio.sleep(0.05)
+    second = await fetch_next(first["cursor"])
+
+    assert second["prefetched"] is True
+    assert [p["uid"] for p in second["data"]] == [p["uid"] for p in api.proofs[10:20]]
+    # The query and its prefetch; the cursor did not read ahead upstream
+    assert len(api.requests) == 2
+    assert prefetcher.stats()["hits"] == 1
+
+    third = await fetch_next(second["cursor"])
+    assert [p["uid"] for p in third["data"]] == [p["uid"] for p in api.proofs[20:30]]
+    prefetcher.cancel_all()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_budget_and_opt_in() -> None:
+    calls = []
+
+    async def fetch_page(params):
+        calls.append(params)
+        return {"data": []}
+
+    disabled = Prefetcher(fetch_page, enabled=False, budget=1, max_concurrency=1, unused_ttl=30.0)
+    assert disabled.schedule({"offset": 10}) is False
+
+    prefetcher = Prefetcher(fetch_page, enabled=True, budget=1, max_concurrency=1, unused_ttl=30.0)
+    assert prefetcher.schedule({"offset": 10}) is True
+    assert prefetcher.schedule({"offset": 20}) is False
+    assert prefetcher.stats()["skipped_budget"] == 1
+    assert await prefetcher.take({"offset": 10}) == {"data": []}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_runs_outside_the_scheduling_timer() -> None:
+    from astral_mcp_server.helpers import RequestTimer, activate_timer, current_timer
+
+    seen = []
+
+    async def fetch_page(params):
+        seen.append(current_timer())
+        return {"data": []}
+
+    prefetcher = Prefetcher(fetch_page, enabled=True, budget=4, max_concurrency=2, unused_ttl=30.0)
+    with activate_timer(RequestTimer("query_location_proofs")):
+        prefetcher.schedule({"limit": 10, "offset": 10})
+    await asyncio.sleep(0.01)
+
+    assert seen == [None]
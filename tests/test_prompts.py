@@ -0,0 +1,84 @@
+"""
+Tests for the file-backed prompt registry
+"""
+
+import json
+
+import mcp.types as types
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import PromptRegistry
+
+PROMPTS = {
+    "prompts": [
+        {
+            "name": "get_location_proof_by_uid",
+            "description": "Fetch a single location proof by UID.",
+            "arguments": [{"name": "uid", "required": True}, {"name": "geojson_block", "required": False}],
+        },
+        {
+            "name": "recent_on_chain",
+            "arguments": [{"name": "chain", "required": True}, {"name": "limit"}],
+            "template": "Show the latest {limit} location proofs on {chain}.",
+        },
+    ]
+}
+
+
+def test_registry_loads_lazily_and_reloads_on_change(tmp_path) -> None:
+    path = tmp_path / "prompts.json"
+    path.write_text(json.dumps(PROMPTS))
+    registry = PromptRegistry([tmp_path / "missing.yaml", path])
+    assert registry.loads == 0
+
+    assert [p.name for p in registry.list()] == ["get_location_proof_by_uid", "recent_on_chain"]
+    assert registry.get("recent_on_chain").arguments[0].name == "chain"
+    registry.list()
+    assert registry.loads == 1
+
+    path.write_text(json.dumps({"prompts": PROMPTS["prompts"][:1] + [{"name": "check_astral_api_health"}]}))
+    assert registry.get("recent_on_chain") is None
+    assert registry.get("check_astral_api_health") is not None
+    assert registry.loads == 2
+
+    # A broken edit keeps the last good prompts
+    path.write_text("{not json")
+    assert [p.name for p in registry.list()] == ["get_location_proof_by_uid", "check_astral_api_health"]
+    assert registry.stats()["error"].startswith("JSONDecodeError")
+
+    path.unlink()
+    assert registry.list() == []
+
+
+def test_render_fills_templates_and_checks_arguments(tmp_path) -> None:
+    path = tmp_path / "prompts.yaml"
+    path.write_text(json.dumps(PROMPTS))  # JSON is valid YAML
+    registry = PromptRegistry([path])
+
+    templated = registry.render("recent_on_chain", {"chain": "sepolia", "limit": "5"})
+    default = registry.render("get_location_proof_by_uid", {"uid": "0x" + "ab" * 32})
+
+    assert templated.messages[0].content.text == "Show the latest 5 location proofs on sepolia."
+    assert default.messages[0].content.text == f"Use the `get_location_proof_by_uid` tool with uid=0x{'ab' * 32}."
+    assert default.description == "Fetch a single location proof by UID."
+    with pytest.raises(ValueError, match="chain"):
+        registry.render("recent_on_chain", {})
+    with pytest.raises(ValueError, match="Unknown prompt"):
+        registry.render("nope")
+
+
+@pytest.mark.asyncio
+async def test_prompt_handlers_serve_the_registry(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "prompts.json"
+    path.write_text(json.dumps(PROMPTS))
+    monkeypatch.setattr(server, "_prompt_registry", PromptRegistry([path]))
+    server._register_prompt_handlers()
+    handlers = server.app._mcp_server.request_handlers
+
+    listed = await handlers[types.ListPromptsRequest](types.ListPromptsRequest(method="prompts/list"))
+    params = types.GetPromptRequestParams(name="recent_on_chain", arguments={"chain": "base", "limit": "3"})
+    got = await handlers[types.GetPromptRequest](types.GetPromptRequest(method="prompts/get", params=params))
+
+    assert [p.name for p in listed.root.prompts] == ["get_location_proof_by_uid", "recent_on_chain"]
+    assert got.root.messages[0].content.text == "Show the latest 3 location proofs on base."
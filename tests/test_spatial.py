@@ -0,0 +1,60 @@
+"""
+Tests for vectorized polygon and radius filtering
+"""
+
+import numpy as np
+import pytest
+
+from astral_mcp_server.helpers import haversine_km, parse_polygons, points_in_polygons
+
+SQUARE_WITH_HOLE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+    ],
+}
+
+
+def test_points_in_polygon_respects_holes() -> None:
+    lon = np.array([1.0, 5.0, 11.0, 9.5])
+    lat = np.array([1.0, 5.0, 5.0, 9.5])
+    mask = points_in_polygons(lon, lat, parse_polygons(SQUARE_WITH_HOLE))
+    assert mask.tolist() == [True, False, False, True]
+
+
+def test_haversine_matches_known_distance() -> None:
+    # San Francisco to Los Angeles is roughly 559 km
+    d = haversine_km(np.array([-118.2437]), np.array([34.0522]), -122.4194, 37.7749)
+    assert abs(float(d[0]) - 559.0) < 2.0
+
+
+def test_parse_polygons_rejects_open_ring() -> None:
+    with pytest.raises(ValueError):
+        parse_polygons({"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1]]]})
+
+
+@pytest.mark.asyncio
+async def test_query_within_polygon_and_radius(fake_api) -> None:
+    from astral_mcp_server.server import query_location_proofs_within
+
+    api = fake_api()
+    triangle = {
+        "type": "Polygon",
+        "coordinates": [[[-122.5, 37.7], [-122.3, 37.7], [-122.5, 37.9], [-122.5, 37.7]]],
+    }
+    result = await query_location_proofs_within(geometry=triangle)
+    assert result["success"] is True
+    assert result["count"] > 0
+    for p in result["data"]:
+        # Inside the triangle: lon + lat stays under the hypotenuse
+        assert (p["longitude"] + 122.5) + (p["latitude"] - 37.7) <= 0.2 + 1e-9
+
+    result = await query_location_proofs_within(center=[-122.45, 37.75], radius_km=3)
+    assert result["success"] is True
+    assert result["filter"]["candidates"] >= result["count"] > 0
+    assert all(p["distance_km"] <= 3 for p in result["data"])
+    assert len(api.requests) >= 2
+
+    result = await query_location_proofs_within(center=[-122.45, 37.75])
+    assert result["error"] == "validation_error"
@@ -0,0 +1,81 @@
+"""
+Tests for the spatial index and the nearest-neighbour / clustering tools
+"""
+
+import numpy as np
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import SpatialIndex, SpatialIndexStore, haversine_km
+
+from .conftest import make_proofs
+
+
+def _points(lon: np.ndarray, lat: np.ndarray) -> list:
+    return [{"uid": f"0x{i:064x}", "longitude": float(x), "latitude": float(y)} for i, (x, y) in enumerate(zip(lon, lat))]
+
+
+def test_nearest_and_within_match_brute_force() -> None:
+    rng = np.random.default_rng(7)
+    lon, lat = rng.uniform(-123.0, -121.0, 3000), rng.uniform(37.0, 38.5, 3000)
+    index = SpatialIndex(_points(lon, lat) + [{"uid": "0xnogeom"}], leaf_size=16)
+    dist = haversine_km(lon, lat, -122.0, 37.7)
+
+    nearest = index.nearest(-122.0, 37.7, 10)
+    assert [i for i, _ in nearest] == np.argsort(dist)[:10].tolist()
+    assert [km for _, km in nearest] == pytest.approx(np.sort(dist)[:10].tolist())
+    assert index.skipped == 1
+
+    within = index.within(-122.0, 37.7, 5.0)
+    assert sorted(i for i, _ in within) == np.flatnonzero(dist <= 5.0).tolist()
+    assert [km for _, km in within] == sorted(km for _, km in within)
+
+    capped = index.nearest(-122.0, 37.7, 50, radius_km=2.0)
+    assert all(km <= 2.0 for _, km in capped)
+
+
+def test_dbscan_separates_dense_groups_from_noise() -> None:
+    rng = np.random.default_rng(3)
+    groups = [(-122.4, 37.8), (-121.9, 37.3), (-122.1, 38.2)]
+    lon = np.concatenate([rng.normal(x, 0.002, 200) for x, _ in groups] + [rng.uniform(-123, -121, 20)])
+    lat = np.concatenate([rng.normal(y, 0.002, 200) for _, y in groups] + [rng.uniform(37, 38.5, 20)])
+    index = SpatialIndex(_points(lon, lat))
+
+    labels = index.dbscan(eps_km=0.5, min_samples=10)
+
+    for g in range(3):
+        members = labels[g * 200 : (g + 1) * 200]
+        assert len(set(members.tolist())) == 1 and members[0] >= 0
+    assert len(set(labels[:600].tolist())) == 3
+    assert (labels[600:] == -1).sum() >= 18
+
+    summaries = index.cluster_summaries(labels, max_uids=5)
+    assert [c["size"] for c in summaries][:3] == [200, 200, 200]
+    assert len(summaries[0]["uids"]) == 5
+    centroid = min(summaries[:3], key=lambda c: abs(c["centroid"][0] + 122.4))["centroid"]
+    assert centroid == pytest.approx([-122.4, 37.8], abs=0.001)
+
+
+@pytest.mark.asyncio
+async def test_index_is_reused_for_the_same_filters(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_spatial_indexes", SpatialIndexStore(8, 600.0))
+    api = fake_api(make_proofs(250))
+
+    first = await server.nearest_location_proofs(center=[-122.3, 37.8], k=5, chain="sepolia")
+    requests = len(api.requests)
+    second = await server.nearest_location_proofs(center="-122.0,37.9", k=3, radius_km=50, chain="sepolia")
+    clusters = await server.cluster_location_proofs(eps_km=1.5, min_samples=3, chain="sepolia")
+
+    assert first["success"] is True and first["index"]["cached"] is False
+    assert first["data"][0]["distance_km"] <= first["data"][-1]["distance_km"]
+    assert second["index"]["cached"] is True and clusters["index"]["cached"] is True
+    assert len(api.requests) == requests
+    assert clusters["success"] is True
+    assert sum(c["size"] for c in clusters["clusters"]) + clusters["noise"] == 250
+
+    refreshed = await server.nearest_location_proofs(center=[-122.3, 37.8], k=5, chain="sepolia", refresh=True)
+    assert refreshed["index"]["cached"] is False
+    assert len(api.requests) > requests
+
+    other = await server.nearest_location_proofs(center=[-122.3, 37.8], k=5, chain="base")
+    assert other["index"]["cached"] is False and other["count"] == 0
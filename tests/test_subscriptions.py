@@ -0,0 +1,139 @@
+"""
+Tests for location proof watches exposed as subscribable resources
+"""
+
+import json
+from typing import List, Tuple
+
+import pytest
+
+from astral_mcp_server.helpers import WatchRegistry
+
+from .conftest import FakeAstralAPI, make_proofs
+
+
+@pytest.mark.asyncio
+async def test_single_poll_notifies_all_subscribers_only_on_new_proofs() -> None:
+    proofs = make_proofs(5)
+    api = FakeAstralAPI(proofs[:3])
+    notified: List[Tuple[str, str]] = []
+
+    async def fetch_page(params):
+        async with api.client() as client:
+            return (await client.get("https://fake/api/v0/location-proofs", params=params)).json()
+
+    async def notify(subscriber, uri):
+        notified.append((subscriber, uri))
+
+    registry = WatchRegistry(fetch_page, notify, interval=3600, max_watches=4)
+    watch = registry.register({"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00Z"})
+    assert registry.register({"chain": "sepolia"}) is watch
+
+    registry.subscribe(watch.watch_id, "client-a")
+    registry.subscribe(watch.watch_id, "client-b")
+
+    assert len(await registry.poll_once(watch.watch_id)) == 3
+    assert sorted(s for s, _ in notified) == ["client-a", "client-b"]
+    assert len(api.requests) == 1
+
+    notified.clear()
+    assert await registry.poll_once(watch.watch_id) == []
+    assert notified == []
+
+    api.proofs = proofs
+    new = await registry.poll_once(watch.watch_id)
+    assert [p["uid"] for p in new] == [p["uid"] for p in proofs[3:]]
+    assert len(notified) == 2
+
+    registry.unsubscribe_all("client-a")
+    registry.unsubscribe_all("client-b")
+    assert watch.task is None
+
+
+@pytest.mark.asyncio
+async def test_watch_tool_and_resource(fake_api) -> None:
+    from astral_mcp_server.server import read_location_proof_watch, watch_location_proofs
+
+    fake_api()
+    result = await watch_location_proofs(chain="sepolia", from_timestamp="2025-01-01T00:00:00Z")
+    assert result["success"] is True
+    assert result["resource_uri"] == f"astral://watch/{result['watch_id']}"
+
+    snapshot = json.loads(await read_location_proof_watch(result["watch_id"]))
+    assert snapshot["filters"] == {"chain": "sepolia"}
+    assert snapshot["new_proofs"] == []
+
+    result = await watch_location_proofs(from_timestamp="not-a-date")
+    assert result["error"] == "validation_error"
+
+
+@pytest.mark.asyncio
+async def test_poll_reads_every_proof_past_the_per_poll_cap() -> None:
+    api = FakeAstralAPI(make_proofs(450))
+
+    async def fetch_page(params):
+        async with api.client() as client:
+            return (await client.get("https://fake/api/v0/location-proofs", params=params)).json()
+
+    async def notify(subscriber, uri):
+        pass
+
+    registry = WatchRegistry(fetch_page, notify, interval=3600, max_watches=4, max_results_per_poll=200)
+    watch = registry.register({"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00Z"})
+
+    assert len(await registry.poll_once(watch.watch_id)) == 450
+    assert registry.snapshot(watch.watch_id)["watermark"] == api.proofs[-1]["timestamp"]
+
+
+def test_full_registry_keeps_freshly_created_watches() -> None:
+    async def fetch_page(params):
+        return {"data": []}
+
+    async def notify(subscriber, uri):
+        pass
+
+    registry = WatchRegistry(fetch_page, notify, interval=3600, max_watches=1)
+    registry.register({"chain": "sepolia"})
+    with pytest.raises(ValueError):
+        registry.register({"chain": "base"})
+
+    stale = WatchRegistry(fetch_page, notify, interval=0, max_watches=1)
+    stale.register({"chain": "sepolia"})
+    assert stale.register({"chain": "base"}).filters == {"chain": "base"}
+
+
+@pytest.mark.asyncio
+async def test_catch_up_is_capped_and_resumes_from_the_watermark() -> None:
+    api = FakeAstralAPI(make_proofs(450))
+
+    async def fetch_page(params):
+        async with api.client() as client:
+            return (await client.get("https://fake/api/v0/location-proofs", params=params)).json()
+
+    async def notify(subscriber, uri):
+        pass
+
+    registry = WatchRegistry(fetch_page, notify, interval=3600, max_watches=4, max_results_per_poll=100, max_catch_up=250)
+    watch = registry.register({"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00Z"})
+
+    first = await registry.poll_once(watch.watch_id)
+    assert [p["uid"] for p in first] == [p["uid"] for p in api.proofs[: len(first)]]
+    assert len(api.requests) == 3
+    assert registry.snapshot(watch.watch_id)["watermark"] == first[-1]["timestamp"]
+
+    second = await registry.poll_once(watch.watch_id)
+    assert [p["uid"] for p in first + second] == [p["uid"] for p in api.proofs]
+
+
+def test_existing_watch_rejects_a_different_start() -> None:
+    async def fetch_page(params):
+        return {"data": []}
+
+    async def notify(subscriber, uri):
+        pass
+
+    registry = WatchRegistry(fetch_page, notify, interval=3600, max_watches=4)
+    watch = registry.register({"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00Z"})
+    assert registry.register({"chain": "sepolia", "fromTimestamp": "2025-01-01T00:00:00.000Z"}) is watch
+    with pytest.raises(ValueError):
+        registry.register({"chain": "sepolia", "fromTimestamp": "2024-06-01T00:00:00Z"})
@@ -0,0 +1,165 @@
+"""
+Tests for the tile-aligned bbox result cache
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from astral_mcp_server.helpers import tile_bounds, tiles_for_bbox
+
+from .conftest import FakeAstralAPI, make_proofs
+
+
+def test_tiles_cover_bbox() -> None:
+    bbox = (-122.5, 37.7, -122.3, 37.8)
+    tiles = tiles_for_bbox(bbox, 10)
+    assert tiles
+    min_lng = min(tile_bounds(x, y, 10)[0] for x, y in tiles)
+    min_lat = min(tile_bounds(x, y, 10)[1] for x, y in tiles)
+    max_lng = max(tile_bounds(x, y, 10)[2] for x, y in tiles)
+    max_lat = max(tile_bounds(x, y, 10)[3] for x, y in tiles)
+    assert min_lng <= bbox[0] and min_lat <= bbox[1] and max_lng >= bbox[2] and max_lat >= bbox[3]
+
+
+@pytest.mark.asyncio
+async def test_tile_cache_serves_overlapping_viewports(fake_api) -> None:
+    from astral_mcp_server import server
+    from astral_mcp_server.server import query_location_proofs
+
+    server._tile_cache._entries.clear()
+    api = fake_api()
+
+    direct = await query_location_proofs(bbox="-122.45,37.72,-122.3,37.8", limit=100)
+    first = await query_location_proofs(bbox="-122.45,37.72,-122.3,37.8", limit=100, use_tile_cache=True)
+    assert first["success"] is True
+    assert {p["uid"] for p in first["data"]} == {p["uid"] for p in direct["data"]}
+    assert first["pagination"]["total"] == direct["pagination"]["total"]
+    assert first["tile_cache"]["tile_misses"] > 0
+
+    upstream_calls = len(api.requests)
+    panned = await query_location_proofs(bbox="-122.44,37.73,-122.31,37.79", limit=100, use_tile_cache=True)
+    assert panned["tile_cache"]["tile_misses"] == 0
+    assert len(api.requests) == upstream_calls
+    for p in panned["data"]:
+        assert -122.44 <= p["longitude"] <= -122.31 and 37.73 <= p["latitude"] <= 37.79
+
+
+@pytest.mark.asyncio
+async def test_small_pages_bound_cold_tile_fetches(fake_api) -> None:
+    from astral_mcp_server import server
+    from astral_mcp_server.server import query_location_proofs
+
+    from .conftest import make_proofs
+
+    server._tile_cache._entries.clear()
+    proofs = make_proofs(500)
+    for p in proofs:
+        p["longitude"], p["latitude"] = -122.4, 37.75
+    api = fake_api(proofs)
+    bbox = "-122.41,37.74,-122.39,37.76"
+
+    result = await query_location_proofs(bbox=bbox, limit=10, use_tile_cache=True)
+    assert len(result["data"]) == 10
+    assert result["tile_cache"]["complete"] is False and result["truncated"] is True
+    assert len(api.requests) == 1
+
+    # The partial tile holds a whole upstream page, enough for the next pages too
+    second = await query_location_proofs(bbox=bbox, limit=10, offset=10, use_tile_cache=True)
+    assert second["tile_cache"]["tile_hits"] == 1 and len(api.requests) == 1
+
+    deeper = await query_location_proofs(bbox=bbox, limit=10, offset=150, use_tile_cache=True)
+    assert deeper["tile_cache"]["tile_misses"] == 1
+    assert [p["uid"] for p in deeper["data"]] == [p["uid"] for p in proofs[150:160]]
+    assert len(api.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_tile_cut_short_by_deadline_is_refetched(monkeypatch) -> None:
+    from astral_mcp_server import server
+    from astral_mcp_server.server import query_location_proofs
+
+    from .conftest import make_proofs
+    from .test_deadline import SlowAstralAPI
+
+    server._tile_cache._entries.clear()
+    proofs = make_proofs(250)
+    for p in proofs:
+        p["longitude"], p["latitude"] = -122.4, 37.75
+    api = SlowAstralAPI(proofs, fast_requests=1)
+    monkeypatch.setattr(server, "_new_client", api.client)
+    monkeypatch.setitem(server.TOOL_DEADLINE_SECONDS, "query_location_proofs", 0.2)
+    bbox = "-122.41,37.74,-122.39,37.76"
+
+    partial = await query_location_proofs(bbox=bbox, limit=100, offset=100, use_tile_cache=True)
+    assert partial["deadline_exceeded"] is True and partial["truncated"] is True
+    assert partial["pagination"]["total"] == 100 and partial["data"] == []
+
+    api.fast_requests = len(api.requests) + 10
+    again = await query_location_proofs(bbox=bbox, limit=100, offset=100, use_tile_cache=True)
+    assert again["tile_cache"]["tile_misses"] == 1
+    assert again["deadline_exceeded"] is False
+    assert [p["uid"] for p in again["data"]] == [p["uid"] for p in proofs[100:200]]
+
+
+class GatedAstralAPI(FakeAstralAPI):
+    """FakeAstralAPI whose requests wait for `gate` and yield, recording peak concurrency."""
+
+    def __init__(self, proofs) -> None:
+        super().__init__(proofs)
+        self.gate = asyncio.Event()
+        self.active = 0
+        self.peak = 0
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.gate.wait()
+            await asyncio.sleep(0.001)
+            return self.handler(request)
+        finally:
+            self.active -= 1
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.async_handler))
+
+
+@pytest.mark.asyncio
+async def test_shared_tile_fetch_survives_the_first_caller_cancelling(monkeypatch) -> None:
+    from astral_mcp_server import server
+
+    server._tile_cache._entries.clear()
+    api = GatedAstralAPI(make_proofs(50))
+    monkeypatch.setattr(server, "_new_client", api.client)
+    bbox = "-122.41,37.74,-122.39,37.76"
+
+    first = asyncio.create_task(server.query_location_proofs(bbox=bbox, limit=10, use_tile_cache=True))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(server.query_location_proofs(bbox=bbox, limit=10, use_tile_cache=True))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    api.gate.set()
+    result = await second
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert result["success"] is True and result["tile_cache"]["tile_hits"] == 1
+    assert len(api.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_cold_tiles_share_one_request_budget(monkeypatch) -> None:
+    from astral_mcp_server import server
+
+    server._tile_cache._entries.clear()
+    monkeypatch.setattr(server, "BULK_MAX_CONCURRENCY", 2)
+    api = GatedAstralAPI(make_proofs(2500))
+    api.gate.set()
+    monkeypatch.setattr(server, "_new_client", api.client)
+
+    result = await server.query_location_proofs(bbox="-122.5,37.7,-122.0,38.2", limit=100, offset=100, use_tile_cache=True)
+
+    assert result["success"] is True and result["tile_cache"]["tiles"] > 2
+    assert api.peak <= 2
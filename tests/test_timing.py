@@ -0,0 +1,85 @@
+"""
+Tests for per-call phase timings and trace export
+"""
+
+import json
+
+import pytest
+
+from astral_mcp_server.helpers import RequestTimer, TraceWriter, activate_timer, timed_span
+
+from .conftest import make_proofs
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_http_trace_events_become_phases() -> None:
+    clock = FakeClock()
+    timer = RequestTimer("tool", clock=clock)
+    trace = timer.http_trace()
+    for at, event in [
+        (0.010, "connection.connect_tcp.started"),
+        (0.030, "connection.connect_tcp.complete"),
+        (0.030, "connection.start_tls.started"),
+        (0.070, "connection.start_tls.complete"),
+        (0.070, "http11.send_request_headers.started"),
+        (0.170, "http11.receive_response_headers.complete"),
+        (0.170, "http11.receive_response_body.started"),
+        (0.200, "http11.receive_response_body.complete"),
+    ]:
+        clock.now = at
+        await trace(event, {})
+    with activate_timer(timer):
+        with timed_span("decode"):
+            clock.now = 0.205
+    clock.now = 0.250
+
+    summary = timer.summary()
+    assert summary["queue_wait_ms"] == 10.0
+    assert summary["connect_ms"] == 20.0
+    assert summary["tls_ms"] == 40.0
+    assert summary["ttfb_ms"] == 100.0
+    assert summary["download_ms"] == 30.0
+    assert summary["decode_ms"] == pytest.approx(5.0)
+    assert summary["total_ms"] == 250.0
+    assert summary["http_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_timings_opt_in(fake_api) -> None:
+    from astral_mcp_server.server import query_location_proofs, query_location_proofs_bulk
+
+    fake_api(make_proofs(250))
+    plain = await query_location_proofs(limit=5)
+    assert "timings" not in plain
+
+    blocks = await query_location_proofs(limit=5, geojson_block=True, timings=True)
+    timings = blocks[0]["data"]["timings"]
+    assert timings["http_requests"] == 1
+    assert {"decode_ms", "extract_ms", "feature_collection_ms", "total_ms"} <= set(timings)
+
+    bulk = await query_location_proofs_bulk(max_results=250, timings=True)
+    assert bulk["timings"]["http_requests"] == bulk["plan"]["upstream_requests"]
+
+
+@pytest.mark.asyncio
+async def test_trace_file_receives_spans(tmp_path) -> None:
+    path = tmp_path / "trace.jsonl"
+    writer = TraceWriter(path)
+    timer = RequestTimer("query_location_proofs")
+    with activate_timer(timer):
+        with timed_span("extract"):
+            pass
+    writer.write(timer)
+    writer.close()
+
+    record = json.loads(path.read_text().strip())
+    assert record["tool"] == "query_location_proofs"
+    assert [s["name"] for s in record["spans"]] == ["extract"]
@@ -0,0 +1,92 @@
+"""
+Tests for subject trajectory analysis
+"""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from astral_mcp_server.helpers import analyze_trajectory, format_timestamp, segment_distances_km
+
+from .conftest import BASE_TIME, make_proofs
+
+
+def _proof(i: int, lon: float, lat: float, seconds: float) -> dict:
+    return {
+        "uid": f"0x{i:064x}",
+        "subject": "0x" + "cd" * 20,
+        "timestamp": format_timestamp(BASE_TIME + timedelta(seconds=seconds)),
+        "longitude": lon,
+        "latitude": lat,
+    }
+
+
+def test_segment_distances_match_known_values() -> None:
+    # One degree of latitude is ~111.2 km; London -> Paris is ~344 km
+    dist = segment_distances_km(np.array([0.0, 0.0, -0.1276, 2.3522]), np.array([0.0, 1.0, 51.5072, 48.8566]))
+    assert dist[0] == pytest.approx(111.195, abs=0.01)
+    assert dist[2] == pytest.approx(343.5, abs=1.0)
+
+
+def test_trajectory_orders_points_and_flags_impossible_travel() -> None:
+    atts = [
+        _proof(2, 0.0, 0.02, 7200),  # out of order on input
+        _proof(0, 0.0, 0.0, 0),
+        _proof(1, 0.0, 0.01, 3600),  # ~1.1 km/h walk
+        _proof(3, 2.3522, 48.8566, 7260),  # thousands of km in one minute
+        _proof(4, 2.3522, 48.8566, 7260),  # same place, same time: not movement
+        {"uid": "0xnogeom", "timestamp": format_timestamp(BASE_TIME)},
+    ]
+
+    result = analyze_trajectory(atts, max_speed_kmh=1000.0, min_jump_km=1.0)
+
+    stats = result["stats"]
+    assert stats["points"] == 5
+    assert stats["skipped"] == 1
+    assert stats["segments"] == 4
+    assert stats["impossible_jumps"] == 1
+    assert stats["duration_s"] == 7260.0
+    assert stats["start"] == "2025-01-01T00:00:00Z"
+    flag = result["impossible_travel"][0]
+    assert (flag["from_uid"], flag["to_uid"]) == (atts[0]["uid"], atts[3]["uid"])
+    assert flag["elapsed_s"] == 60.0
+    assert flag["speed_kmh"] > 100_000
+    # The repeated final position is collapsed
+    assert result["geometry"]["type"] == "LineString"
+    assert result["geometry"]["coordinates"] == [[0.0, 0.0], [0.0, 0.01], [0.0, 0.02], [2.3522, 48.8566]]
+
+
+def test_trajectory_handles_few_points() -> None:
+    assert analyze_trajectory([], max_speed_kmh=1000.0)["geometry"] is None
+    single = analyze_trajectory([_proof(0, 1.0, 2.0, 0)], max_speed_kmh=1000.0)
+    assert single["geometry"] == {"type": "Point", "coordinates": [1.0, 2.0]}
+    assert single["stats"]["max_segment_speed_kmh"] is None
+
+
+def test_trajectory_scales_to_many_points() -> None:
+    result = analyze_trajectory(make_proofs(20_000), max_speed_kmh=1000.0, precision=5)
+    assert result["stats"]["points"] == 20_000
+    assert result["stats"]["segments"] == 19_999
+
+
+@pytest.mark.asyncio
+async def test_subject_trajectory_tool(fake_api) -> None:
+    from astral_mcp_server.server import subject_trajectory
+
+    proofs = make_proofs(150)
+    for p in proofs[:40]:
+        p["subject"] = "0x" + "ef" * 20
+    api = fake_api(proofs)
+
+    result = await subject_trajectory(subject="0x" + "cd" * 20)
+
+    assert result["success"] is True
+    assert result["stats"]["points"] == 110
+    assert result["trajectory"]["geometry"]["type"] == "LineString"
+    assert result["trajectory"]["properties"] == {"subject": "0x" + "cd" * 20}
+    assert "data" not in result
+    assert all(r.url.params["subject"] == "0x" + "cd" * 20 for r in api.requests)
+
+    missing = await subject_trajectory()
+    assert missing["error"] == "validation_error"
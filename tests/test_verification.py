@@ -0,0 +1,211 @@
+"""
+Tests for EAS signature verification of location proofs
+"""
+
+import pytest
+
+from astral_mcp_server import server
+from astral_mcp_server.helpers import ProofVerifier, content_hash, verify_attestation
+from astral_mcp_server.helpers.verification import LOCATION_SCHEMA
+
+from .conftest import make_proofs
+
+eth_account = pytest.importorskip("eth_account")
+eth_abi = pytest.importorskip("eth_abi")
+
+DOMAIN = {
+    "name": "EAS Attestation",
+    "version": "1.0.1",
+    "chainId": 11155111,
+    "verifyingContract": "0xC2679fBD37d54388Ce493F1DB75320D236e1815e",
+}
+PAYLOAD = [
+    1735689600,
+    "EPSG:4326",
+    "coordinates-decimal+lon-lat",
+    "-122.4194,37.7749",
+    [],
+    [],
+    [],
+    [],
+    "",
+]
+TYPES = {
+    "Attest": [
+        {"name": "version", "type": "uint16"},
+        {"name": "schema", "type": "bytes32"},
+        {"name": "recipient", "type": "address"},
+        {"name": "time", "type": "uint64"},
+        {"name": "expirationTime", "type": "uint64"},
+        {"name": "revocable", "type": "bool"},
+        {"name": "refUID", "type": "bytes32"},
+        {"name": "data", "type": "bytes"},
+    ]
+}
+
+
+def _signed_proof(i: int = 0, account=None, domain: dict = DOMAIN) -> dict:
+    from astral_mcp_server.helpers.verification import offchain_uid
+
+    account = account or eth_account.Account.create()
+    message = {
+        "version": 1,
+        "schema": "0x" + "11" * 32,
+        "recipient": "0x" + "cd" * 20,
+        "time": 1735689600 + i,
+        "expirationTime": 0,
+        "revocable": True,
+        "refUID": "0x" + "00" * 32,
+        "data": "0x" + eth_abi.encode([t for t, _ in LOCATION_SCHEMA], PAYLOAD).hex(),
+    }
+    signature = eth_account.Account.sign_typed_data(account.key, domain_data=domain, message_types=TYPES, message_data=message)
+    uid = offchain_uid(message)
+    return {
+        "uid": uid,
+        "chain": "sepolia",
+        "prover": account.address,
+        "subject": message["recipient"],
+        "schema": message["schema"],
+        "timestamp": f"2025-01-01T00:00:{i:02d}Z",
+        "srs": "EPSG:4326",
+        "longitude": -122.4194,
+        "latitude": 37.7749,
+        # Share packages carry uint64 fields as decimal strings
+        "sig": {
+            "domain": domain,
+            "primaryType": "Attest",
+            "types": TYPES,
+            "message": dict(message, time=str(message["time"])),
+            "signature": {"v": signature.v, "r": hex(signature.r), "s": hex(signature.s)},
+            "uid": uid,
+        },
+    }
+
+
+def test_valid_signature_passes_every_check() -> None:
+    proof = _signed_proof()
+
+    verdict = verify_attestation(proof)
+
+    assert verdict["verdict"] == "valid"
+    assert verdict["signer"] == proof["prover"]
+    assert verdict["checks"] == {
+        "domain_matches": True,
+        "signer_matches": True,
+        "uid_matches": True,
+        "recipient_matches": True,
+        "time_matches": True,
+        "schema_matches": True,
+        "location_matches": True,
+    }
+
+
+def test_tampered_fields_are_invalid() -> None:
+    proof = _signed_proof()
+
+    wrong_prover = verify_attestation(dict(proof, prover="0x" + "ab" * 20))
+    wrong_time = verify_attestation(dict(proof, timestamp="2025-01-02T00:00:00Z"))
+    wrong_uid = verify_attestation(dict(proof, uid="0x" + "ee" * 32))
+
+    assert wrong_prover["verdict"] == "invalid"
+    assert wrong_prover["reasons"] == ["signer_matches check failed"]
+    assert wrong_time["checks"]["time_matches"] is False
+    assert wrong_uid["checks"]["uid_matches"] is False
+    assert verify_attestation(make_proofs(1)[0])["verdict"] == "unverifiable"
+
+
+def test_tampered_coordinates_are_invalid_and_unchecked_payloads_unverified() -> None:
+    proof = _signed_proof()
+
+    moved = verify_attestation(dict(proof, longitude=-73.9857, latitude=40.7484))
+    relabelled = verify_attestation(dict(proof, srs="EPSG:3857"))
+    opaque = dict(proof, sig=dict(proof["sig"], message=dict(proof["sig"]["message"], data="0x1234")))
+
+    assert moved["verdict"] == "invalid" and moved["checks"]["location_matches"] is False
+    assert relabelled["verdict"] == "invalid"
+    # The signature itself no longer matches, but an undecodable payload is reported as such
+    assert "signed data does not decode as a location proof" in verify_attestation(opaque)["reasons"]
+    without_uid = verify_attestation({k: v for k, v in proof.items() if k != "uid"} | {"sig": dict(proof["sig"], uid=None)})
+    assert without_uid["verdict"] == "unverified"
+    assert without_uid["reasons"] == ["uid_matches check could not run"]
+
+
+def test_signatures_for_another_domain_or_without_an_attester_are_not_valid() -> None:
+    # A real signature, but made for a contract on another chain
+    foreign = _signed_proof(domain=dict(DOMAIN, chainId=1, verifyingContract="0xA1207F3BBa224E2c9c3c6D5aF63D0eb1582Ce587"))
+    # Attacker-signed package naming itself as signer, on a proof with no attester of its own
+    account = eth_account.Account.create()
+    unattributed = {k: v for k, v in _signed_proof(account=account).items() if k != "prover"}
+    unattributed["sig"] = {"sig": unattributed["sig"], "signer": account.address}
+
+    assert verify_attestation(foreign)["checks"]["domain_matches"] is False
+    assert verify_attestation(foreign)["verdict"] == "invalid"
+    assert verify_attestation(dict(foreign, chain="base"))["verdict"] == "invalid"
+    assert verify_attestation(dict(_signed_proof(), chain="unknown-chain"))["verdict"] == "unverifiable"
+    assert verify_attestation(unattributed)["verdict"] == "unverifiable"
+    assert verify_attestation(unattributed)["reasons"] == ["proof names no attester to check the signer against"]
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_cached_by_uid_and_content() -> None:
+    verifier = ProofVerifier(max_workers=1, pool_min_batch=2, cache_size=100, cache_ttl=600.0)
+    proofs = [_signed_proof(i) for i in range(3)]
+    try:
+        first, stats = await verifier.verify(proofs)
+        again, cached = await verifier.verify(proofs)
+        changed = dict(proofs[0], prover="0x" + "ab" * 20)
+        rechecked, partial = await verifier.verify([changed, proofs[1]])
+    finally:
+        verifier.close()
+
+    assert [v["verdict"] for v in first] == ["valid"] * 3
+    assert stats == {"cached": 0, "computed": 3, "mode": "process"}
+    assert again == first and cached == {"cached": 3, "computed": 0, "mode": "cache"}
+    assert content_hash(changed) != content_hash(proofs[0])
+    assert [v["verdict"] for v in rechecked] == ["invalid", "valid"]
+    assert partial == {"cached": 1, "computed": 1, "mode": "thread"}
+
+
+@pytest.mark.asyncio
+async def test_verify_location_proofs_tool(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_verifier", ProofVerifier(max_workers=1, pool_min_batch=100, cache_size=100, cache_ttl=600.0))
+    signed = [_signed_proof(i) for i in range(2)]
+    api = fake_api(signed + make_proofs(1))
+
+    by_proofs = await server.verify_location_proofs(proofs=signed)
+    by_uids = await server.verify_location_proofs(uids=[api.proofs[0]["uid"], api.proofs[2]["uid"], "0x" + "99" * 32])
+
+    assert by_proofs["success"] is True
+    assert by_proofs["summary"] == {"valid": 2, "invalid": 0, "unverified": 0, "unverifiable": 0}
+    assert by_uids["summary"] == {"valid": 1, "invalid": 0, "unverified": 0, "unverifiable": 1}
+    assert by_uids["missing"] == ["0x" + "99" * 32]
+    assert by_uids["verification"]["cached"] == 1
+
+    both = await server.verify_location_proofs(uids=[signed[0]["uid"]], proofs=signed)
+    bad_uid = await server.verify_location_proofs(uids=["0x123"])
+    assert both["error"] == "validation_error" and bad_uid["error"] == "validation_error"
+
+
+@pytest.mark.asyncio
+async def test_verify_by_uid_fetches_signed_proofs_over_rest_with_graphql_backend(fake_api, monkeypatch) -> None:
+    monkeypatch.setattr(server, "_verifier", ProofVerifier(max_workers=1, pool_min_batch=100, cache_size=100, cache_ttl=600.0))
+    monkeypatch.setattr(server, "ASTRAL_BACKEND", "graphql")
+    api = fake_api([_signed_proof(i) for i in range(2)])
+
+    result = await server.verify_location_proofs(uids=[p["uid"] for p in api.proofs])
+
+    assert result["summary"] == {"valid": 2, "invalid": 0, "unverified": 0, "unverifiable": 0}
+    assert [r.method for r in api.requests] == ["GET", "GET"]
+
+
+def test_pool_workers_do_not_import_the_server() -> None:
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # What a spawned worker imports to unpickle `verify_batch`
+    code = "import sys, astral_mcp_server.helpers.verification; print('astral_mcp_server.server' in sys.modules)"
+    root = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+
+    assert out.stdout.strip() == "False"